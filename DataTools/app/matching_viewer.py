@@ -38,6 +38,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import matplotlib
+import numpy as np
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
@@ -70,7 +71,10 @@ class MatchingRepository:
     Read-only helper for the external matcher SQLite database.
 
     The repository reads all view data from the path configured in the
-    DataTools settings store.
+    DataTools settings store. Levels are float32 BLOBs and frequency vectors
+    float64 BLOBs in table ``frequency_vectors`` (schema version 1); databases
+    not yet migrated by the Matching App still use JSON TEXT and a single
+    ``frequency_vector`` row, and are read as they are.
     """
 
     def __init__(self, db_path: str):
@@ -193,31 +197,74 @@ class MatchingRepository:
             for row in rows
         ]
 
-    def get_frequency_vector(self) -> Optional[List[float]]:
-        """Return the stored frequency axis or None."""
+    @staticmethod
+    def _decode_levels(value) -> List[float]:
+        """Stored levels as floats; BLOB (float32) or legacy JSON TEXT."""
+        if isinstance(value, bytes):
+            return np.frombuffer(value, dtype="<f4").tolist()
+        return json.loads(value) if value else []
+
+    @staticmethod
+    def _decode_frequencies(value) -> List[float]:
+        """Stored frequencies as floats; BLOB (float64) or legacy JSON TEXT."""
+        if isinstance(value, bytes):
+            return np.frombuffer(value, dtype="<f8").tolist()
+        return json.loads(value) if value else []
+
+    @staticmethod
+    def _has_blob_schema(cursor: sqlite3.Cursor) -> bool:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'frequency_vectors'")
+        return cursor.fetchone() is not None
+
+    def get_frequency_vector(self, n_points: Optional[int] = None) -> Optional[List[float]]:
+        """Return the first stored frequency axis (with n_points points, if given) or None."""
         with self._connect() as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT frequencies FROM frequency_vector WHERE id = 1")
+            if not self._has_blob_schema(cursor):
+                cursor.execute("SELECT frequencies FROM frequency_vector WHERE id = 1")
+            elif n_points is None:
+                cursor.execute("SELECT frequencies FROM frequency_vectors ORDER BY id LIMIT 1")
+            else:
+                cursor.execute(
+                    "SELECT frequencies FROM frequency_vectors WHERE n_points = ? ORDER BY id LIMIT 1",
+                    (n_points,),
+                )
             row = cursor.fetchone()
 
         if not row:
             return None
-        return json.loads(row[0])
+        return self._decode_frequencies(row[0])
+
+    def _frequency_vectors_by_id(self, cursor: sqlite3.Cursor) -> Dict[int, List[float]]:
+        cursor.execute("SELECT id, frequencies FROM frequency_vectors")
+        return {row[0]: self._decode_frequencies(row[1]) for row in cursor.fetchall()}
 
     def get_driver_levels(self, serial: str) -> Tuple[Optional[List[float]], Optional[List[float]]]:
         """Return frequency vector and curve levels for one serial."""
-        frequency_vector = self.get_frequency_vector()
-        if frequency_vector is None:
-            return None, None
-
         with self._connect() as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT levels FROM drivers WHERE serial = ?", (serial,))
+            if self._has_blob_schema(cursor):
+                cursor.execute(
+                    """
+                    SELECT d.levels, f.frequencies
+                    FROM drivers d LEFT JOIN frequency_vectors f ON f.id = d.freq_id
+                    WHERE d.serial = ?
+                    """,
+                    (serial,),
+                )
+            else:
+                cursor.execute("SELECT levels, NULL FROM drivers WHERE serial = ?", (serial,))
             row = cursor.fetchone()
 
         if not row:
             return None, None
-        return frequency_vector, json.loads(row[0])
+        levels = self._decode_levels(row[0])
+        frequency_vector = (
+            self._decode_frequencies(row[1]) if row[1] is not None else self.get_frequency_vector(len(levels))
+        )
+        if frequency_vector is None:
+            return None, None
+        return frequency_vector, levels
 
     def get_all_drivers(self) -> List[Dict[str, str]]:
         """Return all driver rows for CSV export."""
@@ -284,7 +331,7 @@ class MatchingRepository:
 
         Returns:
             Tuple of (frequency_vector, curve_rows). Each curve row includes
-            serial, side, loaded_at, and levels.
+            serial, side, loaded_at, levels, and the frequencies of its levels.
         """
         frequency_vector = self.get_frequency_vector() or []
         if not frequency_vector:
@@ -292,9 +339,10 @@ class MatchingRepository:
 
         with self._connect() as connection:
             cursor = connection.cursor()
+            vectors = self._frequency_vectors_by_id(cursor) if self._has_blob_schema(cursor) else {}
             cursor.execute(
-                """
-                SELECT serial, side, loaded_at, levels
+                f"""
+                SELECT serial, side, loaded_at, levels, {'freq_id' if vectors else 'NULL'}
                 FROM drivers
                 WHERE loaded_at >= ? AND loaded_at < ?
                 ORDER BY loaded_at, serial
@@ -308,7 +356,9 @@ class MatchingRepository:
                 "serial": row[0],
                 "side": row[1],
                 "loaded_at": row[2] or "",
-                "levels": json.loads(row[3]) if row[3] else [],
+                "levels": self._decode_levels(row[3]),
+                # Curves on another grid (e.g. a resampled product) carry their own axis
+                "frequencies": vectors.get(row[4], frequency_vector),
             }
             for row in rows
         ]
@@ -1064,7 +1114,7 @@ class TimeframeOverlayPopup(Popup):
                 right_count += 1
 
             plot = LinePlot(color=color, line_width=0.9)
-            plot.points = list(zip(freqs, levels))
+            plot.points = list(zip(row["frequencies"], levels))
             self.graph.add_plot(plot)
             self._plots.append(plot)
             y_values.extend(levels)
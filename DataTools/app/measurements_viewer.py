@@ -14,9 +14,9 @@ Architecture
 
 from __future__ import annotations
 
-import csv
 import math
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Set, Tuple
@@ -44,6 +44,14 @@ except ImportError:
 
 from app.settings_store import DataToolsSettingsStore
 
+# AP CSV reader and octave smoothing are shared with the workstation tooling
+_WORKSPACE_ROOT = Path(__file__).parent.parent.parent
+if str(_WORKSPACE_ROOT) not in sys.path:
+    sys.path.insert(0, str(_WORKSPACE_ROOT))
+
+from analysis.csv_processing import read_ap_csv  # noqa: E402
+from analysis.smoothing import octave_smooth_matrix  # noqa: E402
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -127,31 +135,36 @@ def _load_limit_file(
 ) -> Optional[Tuple[np.ndarray, np.ndarray, str]]:
     """Load a 4-header single-column CSV; returns (freqs, values, y_unit) or None."""
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = [ln.strip() for ln in f if ln.strip()]
-        if len(lines) < 5:
+        table = read_ap_csv(str(path))
+        if table.num_columns < 2:
             return None
         # Unit is in row 3 (index 3), second comma-separated token
-        unit_parts = [u.strip() for u in lines[3].split(",")]
+        unit_parts = [u.strip() for u in table.header_rows[3]]
         y_unit = unit_parts[1] if len(unit_parts) > 1 else ""
-        pairs: List[Tuple[float, float]] = []
-        for row in csv.reader(lines[4:]):
-            stripped = [c.strip() for c in row]
-            if len(stripped) >= 2:
-                try:
-                    pairs.append((float(stripped[0]), float(stripped[1])))
-                except ValueError:
-                    pass
-        if not pairs:
+        freqs, levels = _sorted_pairs(*table.pair(0), unique=False)
+        if not len(freqs):
             return None
-        pairs.sort(key=lambda p: p[0])
-        freqs  = np.array([p[0] for p in pairs])
-        levels = np.array([p[1] for p in pairs])
         return freqs, levels, y_unit
     except Exception:
         return None
 
 
+def _sorted_pairs(
+    x: np.ndarray, y: np.ndarray, unique: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop incomplete points and sort by frequency. With *unique*, keep only the
+    first point per frequency (bidirectional AP sweeps: 20→20k→20 Hz).
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    order = np.argsort(x[valid], kind="stable")
+    x, y = x[valid][order], y[valid][order]
+    if unique and len(x):
+        keep = np.concatenate(([True], x[1:] != x[:-1]))
+        x, y = x[keep], y[keep]
+    return x, y
+
+
 # ---------------------------------------------------------------------------
 # Category reference curves and limits
 # ---------------------------------------------------------------------------
@@ -172,43 +185,14 @@ class CategoryRefs:
 def _parse_ap_csv(path: Path) -> Optional[List[Tuple[np.ndarray, np.ndarray]]]:
     """Parse an AP 4-header CSV; returns list of (freqs, levels) per column pair."""
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = [ln.strip() for ln in f if ln.strip()]
-        if len(lines) < 5:
-            return None
-        data_rows: List[List[str]] = []
-        for row in csv.reader(lines[4:]):
-            stripped = [c.strip() for c in row]
-            if any(stripped):
-                data_rows.append(stripped)
-        if not data_rows:
-            return None
-        col_count = len(data_rows[0])
-        if col_count == 0 or col_count % 2 != 0:
+        table = read_ap_csv(str(path))
+        if table.num_columns % 2 != 0:
             return None
         result: List[Tuple[np.ndarray, np.ndarray]] = []
-        for i in range(col_count // 2):
-            xi, yi = i * 2, i * 2 + 1
-            pairs: List[Tuple[float, float]] = []
-            for r in data_rows:
-                if len(r) > yi:
-                    try:
-                        pairs.append((float(r[xi]), float(r[yi])))
-                    except ValueError:
-                        pass
-            if not pairs:
-                continue
-            pairs.sort(key=lambda p: p[0])
-            seen: set = set()
-            unique: List[Tuple[float, float]] = []
-            for f, lv in pairs:
-                if f not in seen:
-                    seen.add(f)
-                    unique.append((f, lv))
-            result.append((
-                np.array([p[0] for p in unique]),
-                np.array([p[1] for p in unique]),
-            ))
+        for i in range(table.num_columns // 2):
+            freqs, levels = _sorted_pairs(*table.pair(i))
+            if len(freqs):
+                result.append((freqs, levels))
         return result or None
     except Exception:
         return None
@@ -349,60 +333,26 @@ class MeasurementLoader:
         serial, timestamp, meas_type, channel = parsed
 
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = [ln.strip() for ln in f if ln.strip()]
-
-            if len(lines) < 5:
-                return None
+            table = read_ap_csv(str(path))
 
             # Row index 1: sub-column names ("Left-Left,,Right-Left,")
-            col_name_tokens = [t.strip() for t in lines[1].split(",") if t.strip()]
-
-            # Row index 4+: numeric data
-            data_rows: List[List[str]] = []
-            for row in csv.reader(lines[4:]):
-                stripped = [c.strip() for c in row]
-                if any(stripped):
-                    data_rows.append(stripped)
+            col_name_tokens = table.curve_names
 
-            if not data_rows:
+            if table.num_columns % 2 != 0:
                 return None
 
-            col_count = len(data_rows[0])
-            if col_count == 0 or col_count % 2 != 0:
-                return None
-
-            num_pairs = col_count // 2
+            num_pairs = table.num_columns // 2
             frequencies: List[np.ndarray] = []
             levels: List[np.ndarray] = []
 
             for i in range(num_pairs):
-                try:
-                    xi, yi = i * 2, i * 2 + 1
-                    raw_pairs: List[Tuple[float, float]] = []
-                    for r in data_rows:
-                        if len(r) > yi:
-                            try:
-                                raw_pairs.append((float(r[xi]), float(r[yi])))
-                            except ValueError:
-                                pass
-                    if not raw_pairs:
-                        continue
-                    # Sort by frequency and remove duplicate frequencies
-                    # (handles bidirectional AP sweeps: 20→20k→20 Hz)
-                    raw_pairs.sort(key=lambda p: p[0])
-                    seen: set = set()
-                    unique_pairs = []
-                    for f, lv in raw_pairs:
-                        if f not in seen:
-                            seen.add(f)
-                            unique_pairs.append((f, lv))
-                    freqs = np.array([p[0] for p in unique_pairs])
-                    lvls  = np.array([p[1] for p in unique_pairs])
-                    frequencies.append(freqs)
-                    levels.append(lvls)
-                except (ValueError, IndexError):
+                # Sort by frequency and remove duplicate frequencies
+                # (handles bidirectional AP sweeps: 20→20k→20 Hz)
+                freqs, lvls = _sorted_pairs(*table.pair(i))
+                if not len(freqs):
                     continue
+                frequencies.append(freqs)
+                levels.append(lvls)
 
             if not frequencies:
                 return None
@@ -1677,12 +1627,7 @@ def _smooth_octave(freqs: np.ndarray, values: np.ndarray, n: float) -> np.ndarra
     """Apply 1/N octave smoothing on a log-frequency axis."""
     if n <= 0 or len(freqs) < 2:
         return values.copy()
-    half_width = 2.0 ** (1.0 / (2.0 * n))
-    result = np.empty_like(values, dtype=float)
-    for i, f in enumerate(freqs):
-        mask = (freqs >= f / half_width) & (freqs <= f * half_width)
-        result[i] = float(np.mean(values[mask])) if mask.any() else float(values[i])
-    return result
+    return octave_smooth_matrix(freqs, values, n)
 
 
 def _compute_col_stats(
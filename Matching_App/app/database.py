@@ -1,8 +1,20 @@
 import json
+import logging
 import os
 import sqlite3
+import sys
 from datetime import datetime
 
+# The storage format (schema, BLOB encoding, JSON TEXT migration) is shared with
+# the workstation's upload path; both sides import it from analysis/matcher_db.py.
+_WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, _WORKSPACE_ROOT)
+
+from analysis import matcher_db  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
 _DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data")
 _DB_DIR = os.path.join(_DATA_DIR, "db")
 DB_PATH = os.path.join(_DB_DIR, "matcher.db")
@@ -14,6 +26,10 @@ _DEFAULT_SETTINGS = {
     "freq_max": 8000,
     "pin": "1234",
     "max_module_age_days": 14,
+    # Ingest (upload_measurement): resample Ch1 levels to this many log-spaced
+    # points (0 = store full resolution); keep the original in driver_levels_raw.
+    "resample_points": 0,
+    "keep_raw_levels": False,
 }
 
 
@@ -28,10 +44,12 @@ def load_settings():
 
 
 def save_settings(settings):
-    """Persist settings dict to JSON file."""
+    """Persist settings dict to JSON file; keys not in *settings* keep their stored value."""
     os.makedirs(_DB_DIR, exist_ok=True)
+    merged = load_settings()
+    merged.update(settings)
     with open(_SETTINGS_PATH, "w") as f:
-        json.dump(settings, f, indent=2)
+        json.dump(merged, f, indent=2)
 
 
 def _get_connection():
@@ -42,27 +60,25 @@ def _get_connection():
     return con
 
 
+def _decode_levels(value):
+    """Stored levels as a list of floats; accepts a BLOB or legacy JSON TEXT."""
+    return matcher_db.decode_levels(value).tolist()
+
+
+def _decode_frequencies(value):
+    """Stored frequencies as a list of floats; accepts a BLOB or legacy JSON TEXT."""
+    return matcher_db.decode_frequencies(value).tolist()
+
+
 def init_db():
-    """Create tables if they don't exist."""
+    """Create tables if they don't exist; migrate a JSON TEXT database to BLOB levels."""
     con = _get_connection()
+    try:
+        matcher_db.ensure_schema(con)
+    except Exception:
+        con.close()
+        raise
     cur = con.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS frequency_vector (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            frequencies TEXT NOT NULL
-        )
-    """)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS drivers (
-            serial      TEXT PRIMARY KEY,
-            side        TEXT NOT NULL,
-            levels      TEXT NOT NULL,
-            status      TEXT NOT NULL DEFAULT 'unmatched',
-            partner     TEXT,
-            loaded_at   TEXT NOT NULL,
-            matched_at  TEXT
-        )
-    """)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS system_builds (
             system_serial TEXT PRIMARY KEY,
@@ -87,14 +103,8 @@ def load_json_into_db(json_path):
     con = _get_connection()
     cur = con.cursor()
 
-    # Store frequency vector (only once, first time)
-    if data.get("frequency_vector"):
-        cur.execute("SELECT id FROM frequency_vector WHERE id = 1")
-        if cur.fetchone() is None:
-            cur.execute(
-                "INSERT INTO frequency_vector (id, frequencies) VALUES (1, ?)",
-                (json.dumps(data["frequency_vector"]),),
-            )
+    freqs = data.get("frequency_vector") or []
+    freq_id = matcher_db.frequency_vector_id(cur, freqs) if freqs else None
 
     now = datetime.now().isoformat()
     inserted = 0
@@ -119,8 +129,10 @@ def load_json_into_db(json_path):
 
         levels = m["channels"]["Ch1"]["levels"]
         cur.execute(
-            "INSERT INTO drivers (serial, side, levels, status, loaded_at) VALUES (?, ?, ?, 'unmatched', ?)",
-            (serial, side, json.dumps(levels), now),
+            "INSERT INTO drivers (serial, side, levels, freq_id, status, loaded_at) "
+            "VALUES (?, ?, ?, ?, 'unmatched', ?)",
+            (serial, side, matcher_db.encode_levels(levels),
+             freq_id if len(levels) == len(freqs) else None, now),
         )
         inserted += 1
 
@@ -164,31 +176,44 @@ def get_data_signature():
 
 
 def get_unmatched_drivers():
-    """Return (left_drivers, right_drivers) as lists of (serial, levels_json) tuples."""
+    """Return (left_drivers, right_drivers) as lists of (serial, levels, freq_id) tuples.
+
+    levels is a float64 NumPy array decoded from the stored BLOB; freq_id is the
+    driver's frequency_vectors id, or None for rows without a known axis.
+    """
     con = _get_connection()
     cur = con.cursor()
     cur.execute(
-        "SELECT serial, levels FROM drivers WHERE status = 'unmatched' AND side = 'left'"
+        "SELECT serial, levels, freq_id FROM drivers WHERE status = 'unmatched' AND side = 'left'"
     )
     left = cur.fetchall()
     cur.execute(
-        "SELECT serial, levels FROM drivers WHERE status = 'unmatched' AND side = 'right'"
+        "SELECT serial, levels, freq_id FROM drivers WHERE status = 'unmatched' AND side = 'right'"
     )
     right = cur.fetchall()
     con.close()
-    return left, right
+    return (
+        [(serial, matcher_db.decode_levels(levels), freq_id) for serial, levels, freq_id in left],
+        [(serial, matcher_db.decode_levels(levels), freq_id) for serial, levels, freq_id in right],
+    )
 
 
-def get_frequency_vector():
-    """Return the stored frequency vector as a list of floats, or None."""
+def get_frequency_vector(n_points=None):
+    """Return the first stored frequency vector (with n_points points, if given) as a list, or None."""
+    con = _get_connection()
+    freqs = matcher_db.first_frequency_vector(con.cursor(), n_points)
+    con.close()
+    return None if freqs is None else freqs.tolist()
+
+
+def get_frequency_vector_by_id(freq_id):
+    """Return the frequency vector stored under *freq_id* as a list, or None."""
     con = _get_connection()
     cur = con.cursor()
-    cur.execute("SELECT frequencies FROM frequency_vector WHERE id = 1")
+    cur.execute("SELECT frequencies FROM frequency_vectors WHERE id = ?", (freq_id,))
     row = cur.fetchone()
     con.close()
-    if row is None:
-        return None
-    return json.loads(row[0])
+    return None if row is None else _decode_frequencies(row[0])
 
 
 def get_pool_serials():
@@ -301,7 +326,7 @@ def get_all_drivers(include_levels=False):
                 "partner": r[3],
                 "loaded_at": r[4],
                 "matched_at": r[5],
-                "levels": json.loads(r[6]) if r[6] else [],
+                "levels": _decode_levels(r[6]),
             }
             for r in rows
         ]
@@ -669,13 +694,21 @@ def get_driver_levels(serial):
     """Return (frequency_vector, levels) for a driver, or (None, None)."""
     con = _get_connection()
     cur = con.cursor()
-    cur.execute("SELECT frequencies FROM frequency_vector WHERE id = 1")
-    fv_row = cur.fetchone()
-    cur.execute("SELECT levels FROM drivers WHERE serial = ?", (serial,))
-    lv_row = cur.fetchone()
+    cur.execute(
+        """
+        SELECT d.levels, f.frequencies
+        FROM drivers d LEFT JOIN frequency_vectors f ON f.id = d.freq_id
+        WHERE d.serial = ?
+        """,
+        (serial,),
+    )
+    row = cur.fetchone()
     con.close()
-    if fv_row is None or lv_row is None:
+    if row is None:
+        return None, None
+    levels = _decode_levels(row[0])
+    # Rows written without a vector id (older workstation builds) use the first matching vector
+    freqs = _decode_frequencies(row[1]) if row[1] is not None else get_frequency_vector(len(levels))
+    if freqs is None:
         return None, None
-    freqs = json.loads(fv_row[0])
-    levels = json.loads(lv_row[0])
     return freqs, levels
@@ -1,7 +1,8 @@
-import json
 import numpy as np
 from scipy.optimize import linear_sum_assignment
-from app.database import get_unmatched_drivers, store_pairs, get_frequency_vector
+from app.database import (
+    get_unmatched_drivers, store_pairs, get_frequency_vector, get_frequency_vector_by_id,
+)
 
 
 def _calculate_rmse_matrix(left_levels, right_levels):
@@ -31,7 +32,7 @@ def _filter_by_freq_range(levels_list, freq_vector, freq_min, freq_max):
     """Filter levels to only include indices within [freq_min, freq_max].
 
     Args:
-        levels_list: list of (serial, [float, ...]) tuples.
+        levels_list: list of (serial, levels_array) tuples.
         freq_vector: list of frequency values matching the levels length.
         freq_min: lower frequency bound (Hz).
         freq_max: upper frequency bound (Hz).
@@ -39,17 +40,20 @@ def _filter_by_freq_range(levels_list, freq_vector, freq_min, freq_max):
     Returns:
         list of (serial, filtered_levels_list) tuples.
     """
-    indices = [i for i, f in enumerate(freq_vector) if freq_min <= f <= freq_max]
-    if not indices:
+    freq_vector = np.asarray(freq_vector)
+    indices = np.flatnonzero((freq_vector >= freq_min) & (freq_vector <= freq_max))
+    if not len(indices):
         return levels_list
-    return [(s, [lvl[i] for i in indices]) for s, lvl in levels_list]
+    return [(s, np.asarray(lvl)[indices]) for s, lvl in levels_list]
 
 
 def compute_pairs(rmse_threshold=1.0, freq_min=None, freq_max=None):
     """Run the Hungarian algorithm on all unmatched left/right drivers.
 
-    Drivers are grouped by their number of frequency points so that only
-    drivers with the same resolution are compared.
+    Drivers are grouped by their frequency vector (freq_id) so that only
+    drivers measured on the same frequency axis are compared. Rows without a
+    freq_id (migrated from drivers that never matched the old single vector)
+    are grouped by their number of points instead.
 
     Args:
         rmse_threshold: Maximum allowed RMSE (in dB) for a valid pair.
@@ -59,38 +63,35 @@ def compute_pairs(rmse_threshold=1.0, freq_min=None, freq_max=None):
     Returns:
         Number of new pairs found.
     """
+    # Driver lists: [(serial, levels_array, freq_id), ...], decoded from the float32 BLOBs
     left_drivers, right_drivers = get_unmatched_drivers()
 
     if not left_drivers or not right_drivers:
         return 0
 
-    # Build levels lists: [(serial, [float, ...]), ...]
-    left_levels = [(s, json.loads(lvl)) for s, lvl in left_drivers]
-    right_levels = [(s, json.loads(lvl)) for s, lvl in right_drivers]
+    filter_range = freq_min is not None or freq_max is not None
 
-    # Get frequency vector for range filtering
-    freq_vector = None
-    if freq_min is not None or freq_max is not None:
-        freq_vector = get_frequency_vector()
-
-    # Group by number of data points
+    # Group by frequency vector; (None, n_points) for rows without one
     from collections import defaultdict
-    left_by_len = defaultdict(list)
-    right_by_len = defaultdict(list)
-    for item in left_levels:
-        left_by_len[len(item[1])].append(item)
-    for item in right_levels:
-        right_by_len[len(item[1])].append(item)
+    left_by_vector = defaultdict(list)
+    right_by_vector = defaultdict(list)
+    for by_vector, drivers in ((left_by_vector, left_drivers), (right_by_vector, right_drivers)):
+        for serial, levels, freq_id in drivers:
+            key = (freq_id, None) if freq_id is not None else (None, len(levels))
+            by_vector[key].append((serial, levels))
 
     all_pairs = []
-    for n_points in left_by_len:
-        left_group = left_by_len[n_points]
-        right_group = right_by_len.get(n_points, [])
+    for key, left_group in left_by_vector.items():
+        right_group = right_by_vector.get(key, [])
         if not right_group:
             continue
+        freq_id, n_points = key
 
         # Apply frequency range filter if configured
-        if freq_vector and len(freq_vector) == n_points:
+        freq_vector = None
+        if filter_range:
+            freq_vector = get_frequency_vector_by_id(freq_id) if freq_id is not None else get_frequency_vector(n_points)
+        if freq_vector and len(freq_vector) == len(left_group[0][1]):
             fmin = freq_min if freq_min is not None else 0
             fmax = freq_max if freq_max is not None else float('inf')
             left_filtered = _filter_by_freq_range(left_group, freq_vector, fmin, fmax)
@@ -5,6 +5,7 @@ Manual smoke-test for all OCADevice methods.
 
 Usage:
     python Sandboxes/test_oca_device.py --target <IP or device name>
+    python Sandboxes/test_oca_device.py --simulate      # local OCA simulator, no hardware
 
 The script runs every get/set command in sequence and prints PASS / FAIL for each one.
 Set commands restore the original value where possible.
@@ -19,6 +20,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from oca.oca_device import OCADevice
+from oca.oca_simulator import OCADeviceSimulator
 
 logging.basicConfig(level=logging.WARNING)  # suppress verbose library output
 
@@ -87,7 +89,7 @@ def main():
     parser = argparse.ArgumentParser(description="OCADevice smoke test")
     parser.add_argument(
         "--target",
-        required=True,
+        default=None,
         help="IP address or device name of the OCA device under test",
     )
     parser.add_argument(
@@ -96,9 +98,20 @@ def main():
         default=50001,
         help="OCA port (default: 50001)",
     )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Run against a local OCA device simulator instead of real hardware",
+    )
     args = parser.parse_args()
 
-    device = OCADevice(target=args.target, port=args.port)
+    if args.simulate:
+        simulator = OCADeviceSimulator().start()
+        device = OCADevice(target=simulator.name, wrapper_factory=simulator.wrapper_factory)
+    elif args.target:
+        device = OCADevice(target=args.target, port=args.port)
+    else:
+        parser.error("--target is required unless --simulate is given")
 
     results = {}
 
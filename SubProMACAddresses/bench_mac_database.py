@@ -0,0 +1,179 @@
+"""
+Benchmark mac_database lookups against a large provisioning history.
+
+Seeds a temporary database with --rows provisioning_log rows, then times the
+per-unit lookups twice:
+
+  legacy   new connection per call, no indexes, COUNT(*) status scans
+           (the data access used before persistent connections / counters)
+  current  mac_database functions (persistent connection, indexes,
+           pool_counters)
+
+Usage:
+    python SubProMACAddresses/bench_mac_database.py --rows 300000 --repeat 200
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import SubProMACAddresses.mac_database as mac_db
+
+RANGE_START = "02:BE:00:00:00:00"
+RANGE_END   = "02:BE:FF:FF:FF:FF"
+
+
+def _seed(db_path: str, rows: int) -> None:
+    """Create a pre-migration database with *rows* log entries."""
+    con = sqlite3.connect(db_path)
+    con.executescript("""
+        CREATE TABLE mac_range (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            start_mac TEXT NOT NULL, end_mac TEXT NOT NULL,
+            next_mac TEXT NOT NULL, warn_threshold INTEGER NOT NULL DEFAULT 20
+        );
+        CREATE TABLE provisioning_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            serial TEXT NOT NULL, mac TEXT NOT NULL, workstation_id TEXT,
+            reserved_at TEXT, written_at TEXT, verified_at TEXT, status TEXT NOT NULL
+        );
+        CREATE TABLE golden_samples (serial TEXT PRIMARY KEY, added_at TEXT NOT NULL, note TEXT);
+    """)
+    start = mac_db._mac_to_int(RANGE_START)
+    ts = mac_db._now()
+
+    def _rows():
+        for i in range(rows):
+            # ~2 % rolled back, the rest verified — typical production history.
+            status = "rolled_back" if i % 50 == 0 else "verified"
+            yield (f"SN{i:08d}", mac_db._int_to_mac(start + i), "WS1", ts, ts, ts, status)
+
+    con.executemany(
+        "INSERT INTO provisioning_log (serial, mac, workstation_id, reserved_at, written_at, verified_at, status)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        _rows(),
+    )
+    con.execute(
+        "INSERT INTO mac_range VALUES (1, ?, ?, ?, 20)",
+        (RANGE_START, RANGE_END, mac_db._int_to_mac(start + rows)),
+    )
+    con.commit()
+    con.close()
+
+
+# ---------------------------------------------------------------------------
+# Legacy data access (one connection per call, full scans)
+# ---------------------------------------------------------------------------
+
+def _legacy_connect(db_path):
+    con = sqlite3.connect(db_path)
+    con.execute("PRAGMA journal_mode=DELETE")
+    con.execute("PRAGMA busy_timeout=5000")
+    con.row_factory = sqlite3.Row
+    return con
+
+
+def _legacy_get_assigned_mac(db_path, serial):
+    con = _legacy_connect(db_path)
+    row = con.execute(
+        "SELECT mac FROM provisioning_log WHERE serial = ? AND status = 'verified'"
+        " ORDER BY id DESC LIMIT 1",
+        (serial,),
+    ).fetchone()
+    con.close()
+    return row["mac"] if row else None
+
+
+def _legacy_get_pool_status(db_path):
+    con = _legacy_connect(db_path)
+    con.execute("SELECT * FROM mac_range WHERE id = 1").fetchone()
+    assigned = con.execute("SELECT COUNT(*) FROM provisioning_log WHERE status = 'verified'").fetchone()[0]
+    reserved = con.execute(
+        "SELECT COUNT(*) FROM provisioning_log WHERE status IN ('reserved', 'written')"
+    ).fetchone()[0]
+    con.close()
+    return assigned, reserved
+
+
+def _legacy_get_log(db_path, serial):
+    con = _legacy_connect(db_path)
+    rows = con.execute("SELECT * FROM provisioning_log WHERE serial = ? ORDER BY id", (serial,)).fetchall()
+    con.close()
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def _time(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), max(samples)
+
+
+def run(rows: int, repeat: int) -> list:
+    tmp_dir = tempfile.mkdtemp(prefix="mac_bench_")
+    try:
+        legacy_path = os.path.join(tmp_dir, "legacy.db")
+        current_path = os.path.join(tmp_dir, "current.db")
+        print(f"Seeding {rows} provisioning_log rows …")
+        _seed(legacy_path, rows)
+        shutil.copy2(legacy_path, current_path)
+
+        mac_db.DB_PATH = current_path
+        mac_db._DB_DIR = tmp_dir
+        t0 = time.perf_counter()
+        mac_db.get_pool_status()   # first connection migrates: indexes + counter backfill
+        migrate_ms = (time.perf_counter() - t0) * 1000.0
+
+        def serial(i):
+            return f"SN{(i * 7919) % rows:08d}"
+
+        results = []
+        for name, legacy_fn, current_fn in [
+            ("get_assigned_mac",
+             lambda i: _legacy_get_assigned_mac(legacy_path, serial(i)),
+             lambda i: mac_db.get_assigned_mac(serial(i))),
+            ("get_pool_status",
+             lambda i: _legacy_get_pool_status(legacy_path),
+             lambda i: mac_db.get_pool_status()),
+            ("get_provisioning_log(serial)",
+             lambda i: _legacy_get_log(legacy_path, serial(i)),
+             lambda i: mac_db.get_provisioning_log(serial(i))),
+        ]:
+            legacy = _time(legacy_fn, repeat)
+            current = _time(current_fn, repeat)
+            results.append((name, legacy, current))
+
+        print(f"\nOne-time migration of existing DB: {migrate_ms:.0f} ms\n")
+        print(f"{'operation':<30} {'legacy p50':>12} {'current p50':>12} {'speed-up':>9}")
+        for name, legacy, current in results:
+            print(f"{name:<30} {legacy[0]:>10.3f}ms {current[0]:>10.3f}ms {legacy[0] / current[0]:>8.0f}x")
+        return results
+    finally:
+        mac_db.close_database()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mac_database lookups on a large history")
+    parser.add_argument("--rows", type=int, default=300_000, help="provisioning_log rows to seed (default: 300000)")
+    parser.add_argument("--repeat", type=int, default=200, help="calls per operation (default: 200)")
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Hardware-free throughput benchmark for mac_provisioner.provision_mac.
+
+Drives the full first-test provisioning flow against a localhost
+OCADeviceSimulator and a temporary MAC database, and reports units per
+minute with a per-phase breakdown:
+
+  read     initial get_mac_address
+  reserve  duplicate-SN check + reserve_mac
+  write    set_mac_address + confirm_mac_written
+  flush    ARP cache flush
+  verify   polled read-back (incl. rediscovery) + confirm_mac_verified
+  backup   journal / snapshot to MAC_DB_BACKUP_DIR
+  other    pool status and everything not covered above
+
+Phases are measured by wrapping the functions mac_provisioner calls, so the
+benchmark measures mac_provisioner.py / mac_database.py as they are on disk.
+
+Usage:
+    python SubProMACAddresses/bench_provisioning.py --units 200 --latency 0.02 --downtime 0.3
+    python SubProMACAddresses/bench_provisioning.py --units 50 --json logs/bench_provisioning.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import SubProMACAddresses.mac_database as mac_db
+import SubProMACAddresses.mac_provisioner as mac_prov
+from oca.oca_device import OCADevice
+from oca.oca_simulator import OCADeviceSimulator
+
+DEFAULT_MAC = "02:00:00:00:00:00"
+RANGE_START = "02:BF:00:00:00:00"
+RANGE_END   = "02:BF:00:FF:FF:FF"
+DEVICE_NAME = "SubPro-EF0000"
+WS_ID       = "bench_workstation"
+
+PHASES = ["read", "reserve", "write", "flush", "verify", "backup", "other"]
+
+# (module, attribute, phase, inherit). inherit=True: when called inside another
+# timed function, the time belongs to the caller's phase (e.g. _read_mac inside
+# the read-back poll counts as verify).
+_INSTRUMENTED = [
+    (mac_prov, "_read_mac", "read", True),
+    (mac_prov, "get_assigned_mac", "reserve", False),
+    (mac_prov, "reserve_mac", "reserve", False),
+    (mac_prov, "_write_mac", "write", False),
+    (mac_prov, "confirm_mac_written", "write", False),
+    (mac_prov, "_flush_arp_cache", "flush", False),
+    (mac_prov, "_poll_readback", "verify", False),
+    (mac_prov, "_retarget_device_after_mac_change", "verify", True),
+    (mac_prov, "confirm_mac_verified", "verify", False),
+    (mac_db, "_maybe_backup_db", "backup", False),
+]
+
+
+class PhaseTimer:
+    """Accumulates exclusive time per phase for instrumented functions."""
+
+    def __init__(self):
+        self.current = defaultdict(float)
+        self._stack = []   # [phase, child_seconds] frames
+
+    def wrap(self, fn, phase, inherit):
+        def _timed(*args, **kwargs):
+            if inherit and self._stack:
+                return fn(*args, **kwargs)
+            frame = [phase, 0.0]
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                self.current[phase] += elapsed - frame[1]
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+        return _timed
+
+    def take(self):
+        phases, self.current = self.current, defaultdict(float)
+        return phases
+
+
+def _install(timer):
+    originals = []
+    for module, attr, phase, inherit in _INSTRUMENTED:
+        original = getattr(module, attr)
+        originals.append((module, attr, original))
+        setattr(module, attr, timer.wrap(original, phase, inherit))
+    return originals
+
+
+def _restore(originals):
+    for module, attr, original in originals:
+        setattr(module, attr, original)
+
+
+def run(units, latency=0.0, downtime=0.0, arp_delay=None, backup=True, block_size=None):
+    """Provision *units* simulated devices and return a result dict."""
+    tmp_dir = tempfile.mkdtemp(prefix="mac_prov_bench_")
+    saved_env = {k: os.environ.get(k) for k in (mac_db.BACKUP_DIR_ENV_VAR, "ADAM_OCA_TIMING")}
+    saved_db = (mac_db.DB_PATH, mac_db._DB_DIR)
+    timer = PhaseTimer()
+    originals = _install(timer)
+    sim = OCADeviceSimulator(name=DEVICE_NAME, mac=DEFAULT_MAC, latency=latency,
+                             mac_change_downtime=downtime, seed=1)
+    try:
+        mac_db.DB_PATH = os.path.join(tmp_dir, "db", "mac_addresses.db")
+        mac_db._DB_DIR = os.path.dirname(mac_db.DB_PATH)
+        mac_db.init_db()
+        mac_db.set_mac_range(RANGE_START, RANGE_END, 0)
+        if backup:
+            os.environ[mac_db.BACKUP_DIR_ENV_VAR] = os.path.join(tmp_dir, "usb")
+        else:
+            os.environ.pop(mac_db.BACKUP_DIR_ENV_VAR, None)
+        os.environ["ADAM_OCA_TIMING"] = "off"
+        if block_size is not None:
+            os.environ[mac_db.LEASE_BLOCK_SIZE_ENV_VAR] = str(block_size)
+
+        sim.start()
+        device = OCADevice(target=DEVICE_NAME, wrapper_factory=sim.wrapper_factory)
+
+        per_unit = []
+        failures = []
+        bench_start = time.perf_counter()
+        for i in range(units):
+            # Fresh unit on the fixture: default MAC, default name, factory settings unlocked.
+            sim.state.update(mac=DEFAULT_MAC, name=DEVICE_NAME, locked=False)
+            device.target = DEVICE_NAME
+            timer.take()
+
+            t0 = time.perf_counter()
+            result = mac_prov.provision_mac(device, f"SN-BENCH-{i:06d}", WS_ID, DEFAULT_MAC, arp_delay=arp_delay)
+            total = time.perf_counter() - t0
+
+            phases = timer.take()
+            phases["other"] = max(0.0, total - sum(phases.values()))
+            if result.get("status") != "success":
+                failures.append(result)
+            per_unit.append({"total": total, **phases})
+        elapsed = time.perf_counter() - bench_start
+        mac_db.wait_for_backup()
+    finally:
+        sim.stop()
+        _restore(originals)
+        mac_db.close_database()
+        mac_db.DB_PATH, mac_db._DB_DIR = saved_db
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if block_size is not None:
+            os.environ.pop(mac_db.LEASE_BLOCK_SIZE_ENV_VAR, None)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    totals = [u["total"] for u in per_unit]
+    return {
+        "units": units,
+        "failures": len(failures),
+        "elapsed_s": round(elapsed, 3),
+        "units_per_minute": round(units / elapsed * 60.0, 1) if elapsed else None,
+        "unit_p50_ms": round(statistics.median(totals) * 1000.0, 2),
+        "unit_max_ms": round(max(totals) * 1000.0, 2),
+        "phases_mean_ms": {
+            p: round(statistics.fmean(u.get(p, 0.0) for u in per_unit) * 1000.0, 3) for p in PHASES
+        },
+        "settings": {"latency_s": latency, "downtime_s": downtime, "arp_delay_s": arp_delay,
+                     "backup": backup, "block_size": block_size},
+    }
+
+
+def _print_report(result):
+    print(f"\nUnits: {result['units']}  failures: {result['failures']}  elapsed: {result['elapsed_s']} s")
+    print(f"Throughput: {result['units_per_minute']} units/min   "
+          f"(per unit p50 {result['unit_p50_ms']} ms, max {result['unit_max_ms']} ms)\n")
+    total = sum(result["phases_mean_ms"].values()) or 1.0
+    print(f"{'phase':<10} {'mean ms':>10} {'share':>7}")
+    for phase, ms in result["phases_mean_ms"].items():
+        print(f"{phase:<10} {ms:>10.3f} {ms / total:>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="provision_mac throughput against a simulated device")
+    parser.add_argument("--units", type=int, default=100, help="Units to provision (default: 100)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated per-command OCA latency in s")
+    parser.add_argument("--downtime", type=float, default=0.0,
+                        help="Seconds the device is unreachable after a MAC write")
+    parser.add_argument("--arp-delay", dest="arp_delay", type=float, default=None,
+                        help="Read-back ceiling in s (default: ARP_FLUSH_DELAY)")
+    parser.add_argument("--no-backup", dest="backup", action="store_false",
+                        help="Do not back up to a temporary MAC_DB_BACKUP_DIR")
+    parser.add_argument("--block-size", dest="block_size", type=int, default=None,
+                        help="MAC lease block size (default: no leasing)")
+    parser.add_argument("--json", default=None, help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    result = run(args.units, latency=args.latency, downtime=args.downtime, arp_delay=args.arp_delay,
+                 backup=args.backup, block_size=args.block_size)
+    _print_report(result)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
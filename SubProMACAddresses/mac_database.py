@@ -24,8 +24,43 @@ golden_samples:
     serial TEXT PRIMARY KEY     -- SNs that must never receive a MAC
     added_at TEXT NOT NULL
     note TEXT
+
+pool_counters:                  -- row count per provisioning_log status
+    status TEXT PRIMARY KEY     -- maintained by triggers on provisioning_log
+    count INTEGER NOT NULL
+
+Indexes: provisioning_log (serial, status), (status), (verified_at).
+Existing databases are migrated on first connection (PRAGMA user_version).
+
+mac_leases:                     -- optional per-workstation MAC blocks
+    workstation_id TEXT PRIMARY KEY
+    next_mac TEXT NOT NULL      -- next MAC to hand out from this block
+    end_mac TEXT NOT NULL       -- last MAC of the block (inclusive)
+    leased_at TEXT NOT NULL     -- last lease activity (block leased or MAC reserved)
+
+mac_free_blocks:                -- unissued MACs returned from released/expired leases
+    start_mac TEXT PRIMARY KEY  -- first free MAC of the block
+    end_mac TEXT NOT NULL       -- last free MAC of the block (inclusive)
+    freed_at TEXT NOT NULL
+
+Connections
+-----------
+All functions share one persistent connection per thread (MacDatabase),
+reopened automatically when DB_PATH changes.
+
+Concurrency
+-----------
+reserve_mac runs inside BEGIN IMMEDIATE, so the pointer read, pointer update
+and log insert are one write transaction and concurrent workstations can never
+be handed the same MAC. With MAC_LEASE_BLOCK_SIZE > 1 each workstation leases a
+contiguous block from mac_range and reserves from its own mac_leases row,
+touching the shared pointer only once per block. A lease idle for longer than
+MAC_LEASE_MAX_AGE_HOURS is reclaimed inside the next reservation, and
+release_mac_lease returns one explicitly; their unissued MACs go to
+mac_free_blocks and are handed out before the shared pointer moves on.
 """
 
+import csv
 import logging
 import os
 import shutil
@@ -33,17 +68,65 @@ import sqlite3
 import string
 import subprocess
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 
 _DB_DIR = os.path.join(os.path.dirname(__file__), "db")
 DB_PATH = os.path.join(_DB_DIR, "mac_addresses.db")
 
 DEFAULT_WARN_THRESHOLD = 20
+SCHEMA_VERSION = 1
 BACKUP_DIR_ENV_VAR = "MAC_DB_BACKUP_DIR"
+LEASE_BLOCK_SIZE_ENV_VAR = "MAC_LEASE_BLOCK_SIZE"
+LEASE_MAX_AGE_ENV_VAR = "MAC_LEASE_MAX_AGE_HOURS"
+# A lease without activity for this long is returned to the pool (<= 0 disables expiry).
+DEFAULT_LEASE_MAX_AGE_HOURS = 24.0
 AUTO_BACKUP_SUBDIR = "ADAM_MAC_DB_Backups"
+BACKUP_SNAPSHOT_NAME = "mac_addresses_latest.db"
+BACKUP_JOURNAL_NAME = "mac_provisioning_journal.csv"
+JOURNAL_FIELDS = ["verified_at", "serial", "mac", "workstation_id"]
+# A snapshot younger than this is not retaken; the journal covers the gap.
+BACKUP_COALESCE_SECONDS = 60.0
+
+_backup_lock = threading.Lock()
+_backup_thread = None
 
 logger = logging.getLogger(__name__)
 
+# Schema version 1: indexes for the per-serial / per-status lookups, and
+# pool_counters kept in step with provisioning_log by triggers, so
+# get_pool_status does not count the whole history on every call.
+_MIGRATION_STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS idx_provisioning_log_serial_status "
+    "ON provisioning_log (serial, status)",
+    "CREATE INDEX IF NOT EXISTS idx_provisioning_log_status ON provisioning_log (status)",
+    "CREATE INDEX IF NOT EXISTS idx_provisioning_log_verified_at ON provisioning_log (verified_at)",
+    """CREATE TABLE IF NOT EXISTS pool_counters (
+           status TEXT PRIMARY KEY,
+           count  INTEGER NOT NULL
+       )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_provisioning_log_insert
+       AFTER INSERT ON provisioning_log
+       BEGIN
+           INSERT INTO pool_counters (status, count) VALUES (NEW.status, 1)
+           ON CONFLICT(status) DO UPDATE SET count = count + 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_provisioning_log_status
+       AFTER UPDATE OF status ON provisioning_log
+       WHEN OLD.status IS NOT NEW.status
+       BEGIN
+           UPDATE pool_counters SET count = count - 1 WHERE status = OLD.status;
+           INSERT INTO pool_counters (status, count) VALUES (NEW.status, 1)
+           ON CONFLICT(status) DO UPDATE SET count = count + 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_provisioning_log_delete
+       AFTER DELETE ON provisioning_log
+       BEGIN
+           UPDATE pool_counters SET count = count - 1 WHERE status = OLD.status;
+       END""",
+]
+
 
 # ---------------------------------------------------------------------------
 # MAC arithmetic helpers
@@ -83,18 +166,214 @@ def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+class MacDatabase:
+    """Persistent SQLite connections to one MAC database file.
+
+    Each thread gets one connection, opened on first use and reused for every
+    call. sqlite3 caches compiled statements per connection, so the queries
+    below are prepared once per process instead of once per call.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._connect()
+            self._local.con = con
+            with self._lock:
+                self._connections.append(con)
+        elif con.in_transaction:
+            # Left open by a call that raised before commit/rollback.
+            con.rollback()
+        return con
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = sqlite3.connect(self.path, cached_statements=256, check_same_thread=False)
+        # DELETE mode: each transaction writes a rollback-journal file, then deletes it on
+        # commit. Avoids the -wal / -shm sidecar files that WAL mode leaves on disk,
+        # which can confuse network drives and backup tools.
+        con.execute("PRAGMA journal_mode=DELETE")
+        # If a concurrent connection holds a write lock, SQLite retries internally for up
+        # to 5 000 ms before raising OperationalError("database is locked").
+        con.execute("PRAGMA busy_timeout=5000")
+        con.row_factory = sqlite3.Row
+        _migrate(con)
+        return con
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for con in connections:
+            con.close()
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> MacDatabase:
+    """Return the MacDatabase for the current DB_PATH, reopening if DB_PATH changed."""
+    global _database
+    with _database_lock:
+        if _database is None or _database.path != DB_PATH:
+            if _database is not None:
+                _database.close()
+            _database = MacDatabase(DB_PATH)
+        return _database
+
+
+def close_database() -> None:
+    """Close all persistent connections (e.g. before replacing the DB file)."""
+    global _database
+    with _database_lock:
+        if _database is not None:
+            _database.close()
+            _database = None
+
+
 def _get_connection() -> sqlite3.Connection:
-    os.makedirs(_DB_DIR, exist_ok=True)
-    con = sqlite3.connect(DB_PATH)
-    # DELETE mode: each transaction writes a rollback-journal file, then deletes it on
-    # commit. Avoids the -wal / -shm sidecar files that WAL mode leaves on disk,
-    # which can confuse network drives and backup tools.
-    con.execute("PRAGMA journal_mode=DELETE")
-    # If a concurrent connection holds a write lock, SQLite retries internally for up
-    # to 5 000 ms before raising OperationalError("database is locked").
-    con.execute("PRAGMA busy_timeout=5000")
-    con.row_factory = sqlite3.Row
-    return con
+    return get_database().connection
+
+
+def _migrate(con: sqlite3.Connection) -> None:
+    """Add indexes, status counters and their triggers to existing databases.
+
+    Runs once per connection; PRAGMA user_version makes it a single cheap read
+    once the DB is up to date. Databases without provisioning_log yet are
+    migrated by init_db after the tables are created.
+    """
+    if con.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    if con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'provisioning_log'"
+    ).fetchone() is None:
+        return
+
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        # Another workstation may have migrated while we waited for the lock.
+        if con.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            con.rollback()
+            return
+        for statement in _MIGRATION_STATEMENTS:
+            con.execute(statement)
+        # Backfill counters from existing history.
+        con.execute("DELETE FROM pool_counters")
+        con.execute(
+            "INSERT INTO pool_counters (status, count) "
+            "SELECT status, COUNT(*) FROM provisioning_log GROUP BY status"
+        )
+        con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.commit()
+        logger.info("MAC DB migrated to schema version %d.", SCHEMA_VERSION)
+    except Exception:
+        con.rollback()
+        raise
+
+
+def _ensure_lease_table(cur: sqlite3.Cursor) -> None:
+    # Created on demand so databases initialised before leasing existed keep working.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS mac_leases (
+            workstation_id TEXT PRIMARY KEY,
+            next_mac       TEXT NOT NULL,
+            end_mac        TEXT NOT NULL,
+            leased_at      TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS mac_free_blocks (
+            start_mac TEXT PRIMARY KEY,
+            end_mac   TEXT NOT NULL,
+            freed_at  TEXT NOT NULL
+        )
+    """)
+
+
+def _block_count(first_mac: str, end_mac: str) -> int:
+    return max(0, _mac_to_int(end_mac) - _mac_to_int(first_mac) + 1)
+
+
+def _lease_cutoff(max_age_hours) -> str:
+    """leased_at timestamps before this are expired; None if expiry is disabled."""
+    if max_age_hours is None:
+        try:
+            max_age_hours = float(os.getenv(LEASE_MAX_AGE_ENV_VAR, DEFAULT_LEASE_MAX_AGE_HOURS))
+        except ValueError:
+            logger.warning("Ignoring invalid %s value.", LEASE_MAX_AGE_ENV_VAR)
+            max_age_hours = DEFAULT_LEASE_MAX_AGE_HOURS
+    if max_age_hours <= 0:
+        return None
+    return (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).isoformat()
+
+
+def _unissued_counts(cur: sqlite3.Cursor, row, cutoff: str = None) -> tuple:
+    """(remaining, leased): MACs any station can still get, and MACs held by active leases.
+
+    remaining covers the unleased range, mac_free_blocks and expired leases
+    (reclaimed by the next reservation); leased only counts active leases.
+    """
+    remaining = _block_count(row["next_mac"], row["end_mac"])
+    cur.execute("SELECT start_mac, end_mac FROM mac_free_blocks")
+    remaining += sum(_block_count(r["start_mac"], r["end_mac"]) for r in cur.fetchall())
+    leased = 0
+    cur.execute("SELECT next_mac, end_mac, leased_at FROM mac_leases")
+    for r in cur.fetchall():
+        if cutoff is not None and r["leased_at"] < cutoff:
+            remaining += _block_count(r["next_mac"], r["end_mac"])
+        else:
+            leased += _block_count(r["next_mac"], r["end_mac"])
+    return remaining, leased
+
+
+def _free_lease(cur: sqlite3.Cursor, workstation_id: str) -> int:
+    """Move the unissued part of a lease to mac_free_blocks; returns the MAC count."""
+    cur.execute(
+        "SELECT next_mac, end_mac FROM mac_leases WHERE workstation_id = ?",
+        (workstation_id,)
+    )
+    lease = cur.fetchone()
+    if lease is None:
+        return 0
+    cur.execute("DELETE FROM mac_leases WHERE workstation_id = ?", (workstation_id,))
+    count = _block_count(lease["next_mac"], lease["end_mac"])
+    if count:
+        cur.execute(
+            "INSERT INTO mac_free_blocks (start_mac, end_mac, freed_at) VALUES (?, ?, ?)",
+            (lease["next_mac"], lease["end_mac"], _now())
+        )
+    return count
+
+
+def _reclaim_expired_leases(cur: sqlite3.Cursor, workstation_id: str, cutoff: str) -> None:
+    """Return other workstations' expired leases to the pool (inside the reservation)."""
+    if cutoff is None:
+        return
+    cur.execute(
+        "SELECT workstation_id FROM mac_leases WHERE leased_at < ? AND workstation_id IS NOT ?",
+        (cutoff, workstation_id)
+    )
+    for expired in [r["workstation_id"] for r in cur.fetchall()]:
+        count = _free_lease(cur, expired)
+        logger.warning("Reclaimed expired MAC lease of workstation %s (%d unissued MACs).", expired, count)
+
+
+def _lease_block_size(block_size) -> int:
+    if block_size is None:
+        try:
+            block_size = int(os.getenv(LEASE_BLOCK_SIZE_ENV_VAR, "1"))
+        except ValueError:
+            logger.warning("Ignoring invalid %s value.", LEASE_BLOCK_SIZE_ENV_VAR)
+            block_size = 1
+    return max(1, int(block_size))
 
 
 def _safe_filename_part(value: str) -> str:
@@ -187,8 +466,104 @@ def _discover_backup_dirs() -> list:
     return [os.path.join(root, AUTO_BACKUP_SUBDIR) for root in sorted(drive_roots)]
 
 
-def _maybe_backup_db(serial: str, mac: str, verified_at: str) -> bool:
-    """Copy the SQLite DB to configured or auto-detected external backup targets.
+def _append_backup_journal(backup_dir: str, serial: str, mac: str,
+                           workstation_id: str, verified_at: str) -> None:
+    """Append one verified assignment to the journal on the backup target and fsync it."""
+    journal_path = os.path.join(backup_dir, BACKUP_JOURNAL_NAME)
+    write_header = not os.path.exists(journal_path)
+    with open(journal_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(JOURNAL_FIELDS)
+        writer.writerow([verified_at, serial, mac, workstation_id or ""])
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _snapshot_db(backup_dir: str, db_path: str, archive_name: str = None) -> bool:
+    """Write a consistent copy of the live DB with SQLite's online backup API.
+
+    Every snapshot taken is also kept as *archive_name*. Skipped while the
+    existing snapshot is younger than BACKUP_COALESCE_SECONDS; the journal
+    covers any assignment made in between.
+    """
+    latest_path = os.path.join(backup_dir, BACKUP_SNAPSHOT_NAME)
+    try:
+        if time.time() - os.path.getmtime(latest_path) < BACKUP_COALESCE_SECONDS:
+            return False
+    except OSError:
+        pass  # no snapshot yet
+
+    tmp_path = latest_path + ".tmp"
+    src = sqlite3.connect(db_path)
+    try:
+        dst = sqlite3.connect(tmp_path)
+        try:
+            # Copies page by page while other connections keep reading/writing.
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    # Replace in one step so a removed drive never leaves a half-written latest DB.
+    os.replace(tmp_path, latest_path)
+
+    if archive_name:
+        archive_path = os.path.join(backup_dir, archive_name)
+        shutil.copy2(latest_path, archive_path + ".tmp")
+        os.replace(archive_path + ".tmp", archive_path)
+        logger.info("MAC DB snapshot written: latest='%s', archive='%s'", latest_path, archive_path)
+    else:
+        logger.info("MAC DB snapshot written to '%s'", latest_path)
+    return True
+
+
+def _snapshot_worker(backup_dirs: list, db_path: str, archive_name: str = None) -> None:
+    global _backup_thread
+    try:
+        for backup_dir in backup_dirs:
+            try:
+                _snapshot_db(backup_dir, db_path, archive_name)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("MAC DB snapshot to '%s' failed: %s", backup_dir, exc)
+    finally:
+        with _backup_lock:
+            _backup_thread = None
+
+
+def _schedule_snapshot(backup_dirs: list, archive_name: str = None) -> None:
+    """Start a background snapshot unless one is already running (coalescing)."""
+    global _backup_thread
+    with _backup_lock:
+        if _backup_thread is not None:
+            return
+        # Daemon: a one-shot adam_workstation.py process exits without waiting for
+        # the snapshot. A snapshot cut short leaves only a .tmp file behind; the
+        # fsynced journal plus replay_backup_journal cover the missing assignments.
+        # Callers that need the snapshot on disk call wait_for_backup().
+        _backup_thread = threading.Thread(
+            target=_snapshot_worker, args=(backup_dirs, DB_PATH, archive_name),
+            name="mac-db-backup", daemon=True,
+        )
+        _backup_thread.start()
+
+
+def wait_for_backup(timeout: float = None) -> None:
+    """Block until a running background snapshot has finished."""
+    with _backup_lock:
+        thread = _backup_thread
+    if thread is not None:
+        thread.join(timeout)
+
+
+def _maybe_backup_db(serial: str, mac: str, verified_at: str, workstation_id: str = None) -> bool:
+    """Back up a verified assignment to configured or auto-detected external targets.
+
+    The assignment is appended synchronously to BACKUP_JOURNAL_NAME on every
+    target, so each verified MAC is on removable media before provisioning
+    reports success. A full DB snapshot follows in a background daemon thread
+    and is coalesced across back-to-back provisions; each snapshot taken is
+    also archived under the name of the assignment that triggered it.
 
     Backup is best-effort: failures are logged but never abort provisioning.
     """
@@ -196,37 +571,108 @@ def _maybe_backup_db(serial: str, mac: str, verified_at: str) -> bool:
     if not backup_dirs:
         return False
 
-    timestamp_part = _safe_filename_part(verified_at)
-    serial_part = _safe_filename_part(serial)
-    mac_part = _safe_filename_part(mac)
-    backup_created = False
-
+    journaled_dirs = []
     for backup_dir in backup_dirs:
         try:
             os.makedirs(backup_dir, exist_ok=True)
-            latest_path = os.path.join(backup_dir, "mac_addresses_latest.db")
-            archive_path = os.path.join(
-                backup_dir,
-                f"mac_addresses_{timestamp_part}_{serial_part}_{mac_part}.db",
-            )
-
-            shutil.copy2(DB_PATH, latest_path)
-            shutil.copy2(DB_PATH, archive_path)
-            logger.info(
-                "MAC DB backup created: latest='%s', archive='%s'",
-                latest_path,
-                archive_path,
-            )
-            backup_created = True
+            _append_backup_journal(backup_dir, serial, mac, workstation_id, verified_at)
+            journaled_dirs.append(backup_dir)
         except Exception as exc:  # noqa: BLE001
             logger.warning(
-                "MAC DB backup skipped; could not copy '%s' to '%s': %s",
-                DB_PATH,
+                "MAC DB backup skipped; could not write journal to '%s': %s",
                 backup_dir,
                 exc,
             )
 
-    return backup_created
+    if journaled_dirs:
+        archive_name = (
+            f"mac_addresses_{_safe_filename_part(verified_at)}_"
+            f"{_safe_filename_part(serial)}_{_safe_filename_part(mac)}.db"
+        )
+        _schedule_snapshot(journaled_dirs, archive_name)
+    return bool(journaled_dirs)
+
+
+def _skip_journaled_in_blocks(cur: sqlite3.Cursor, journaled: list) -> None:
+    """Move lease and free-block starts past MACs the journal shows as issued.
+
+    Both are handed out lowest first, so everything up to the highest
+    journaled MAC inside a block was already issued.
+    """
+    _ensure_lease_table(cur)
+    cur.execute("SELECT workstation_id, next_mac, end_mac FROM mac_leases")
+    for lease in cur.fetchall():
+        first, last = _mac_to_int(lease["next_mac"]), _mac_to_int(lease["end_mac"])
+        issued = [m for m in journaled if first <= m <= last]
+        if issued:
+            cur.execute(
+                "UPDATE mac_leases SET next_mac = ? WHERE workstation_id = ?",
+                (_int_to_mac(max(issued) + 1), lease["workstation_id"])
+            )
+    cur.execute("SELECT start_mac, end_mac FROM mac_free_blocks")
+    for block in cur.fetchall():
+        first, last = _mac_to_int(block["start_mac"]), _mac_to_int(block["end_mac"])
+        issued = [m for m in journaled if first <= m <= last]
+        if not issued:
+            continue
+        if max(issued) >= last:
+            cur.execute("DELETE FROM mac_free_blocks WHERE start_mac = ?", (block["start_mac"],))
+        else:
+            cur.execute(
+                "UPDATE mac_free_blocks SET start_mac = ? WHERE start_mac = ?",
+                (_int_to_mac(max(issued) + 1), block["start_mac"])
+            )
+
+
+def replay_backup_journal(journal_path: str) -> int:
+    """Re-apply journaled verified assignments to the active DB (restore helper).
+
+    Use after restoring a snapshot: assignments verified after the snapshot was
+    taken are inserted as 'verified', and next_mac (and any lease or freed block
+    holding journaled MACs) is advanced past them so they are never issued again.
+
+    Returns:
+        Number of assignments inserted.
+    """
+    with open(journal_path, "r", newline="", encoding="utf-8") as f:
+        entries = list(csv.DictReader(f))
+
+    con = _get_connection()
+    cur = con.cursor()
+    inserted = 0
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        for entry in entries:
+            cur.execute(
+                "SELECT 1 FROM provisioning_log WHERE serial = ? AND mac = ? AND status = 'verified'",
+                (entry["serial"], entry["mac"])
+            )
+            if cur.fetchone() is not None:
+                continue
+            cur.execute(
+                """INSERT INTO provisioning_log
+                   (serial, mac, workstation_id, reserved_at, written_at, verified_at, status)
+                   VALUES (?, ?, ?, ?, ?, ?, 'verified')""",
+                (entry["serial"], entry["mac"], entry["workstation_id"] or None,
+                 entry["verified_at"], entry["verified_at"], entry["verified_at"])
+            )
+            inserted += 1
+
+        cur.execute("SELECT next_mac FROM mac_range WHERE id = 1")
+        row = cur.fetchone()
+        if row is not None and entries:
+            highest = max(_mac_to_int(e["mac"]) for e in entries)
+            if _mac_to_int(row["next_mac"]) <= highest:
+                cur.execute(
+                    "UPDATE mac_range SET next_mac = ? WHERE id = 1",
+                    (_int_to_mac(highest + 1),)
+                )
+            _skip_journaled_in_blocks(cur, [_mac_to_int(e["mac"]) for e in entries])
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    return inserted
 
 
 # ---------------------------------------------------------------------------
@@ -269,8 +715,10 @@ def init_db() -> None:
         )
     """)
 
+    _ensure_lease_table(cur)
+
     con.commit()
-    con.close()
+    _migrate(con)
 
 
 # ---------------------------------------------------------------------------
@@ -315,8 +763,11 @@ def set_mac_range(start_mac: str, end_mac: str, warn_threshold: int = DEFAULT_WA
         # next_mac is always reset to start_mac — not preserved from the previous range.
         # Calling set_mac_range() after provisioning has started reuses addresses from the top.
     )
+    # Leases and freed blocks belong to the previous range.
+    _ensure_lease_table(cur)
+    cur.execute("DELETE FROM mac_leases")
+    cur.execute("DELETE FROM mac_free_blocks")
     con.commit()
-    con.close()
 
 
 def get_mac_range() -> dict:
@@ -325,7 +776,6 @@ def get_mac_range() -> dict:
     cur = con.cursor()
     cur.execute("SELECT * FROM mac_range WHERE id = 1")
     row = cur.fetchone()
-    con.close()
     return dict(row) if row else None
 
 
@@ -337,7 +787,10 @@ def get_pool_status() -> dict:
           "range_set": bool,
           "start_mac": str, "end_mac": str, "next_mac": str,
           "total": int, "assigned": int, "reserved": int,
-          "remaining": int,   -- MACs not yet handed out
+          "remaining": int,   -- MACs any workstation can still get: unleased range,
+                              --   freed blocks and expired leases
+          "leased": int,      -- MACs held by active workstation leases, not yet
+                              --   reserved (not included in remaining)
           "low_pool": bool
         }
     """
@@ -346,19 +799,17 @@ def get_pool_status() -> dict:
     cur.execute("SELECT * FROM mac_range WHERE id = 1")
     row = cur.fetchone()
     if row is None:
-        con.close()
         return {"range_set": False}
 
-    end_int = _mac_to_int(row["end_mac"])
-    next_int = _mac_to_int(row["next_mac"])
-    total = end_int - _mac_to_int(row["start_mac"]) + 1
-    remaining = max(0, end_int - next_int + 1)
+    total = _block_count(row["start_mac"], row["end_mac"])
+    _ensure_lease_table(cur)
+    remaining, leased = _unissued_counts(cur, row, _lease_cutoff(None))
 
-    cur.execute("SELECT COUNT(*) FROM provisioning_log WHERE status = 'verified'")
-    assigned = cur.fetchone()[0]
-    cur.execute("SELECT COUNT(*) FROM provisioning_log WHERE status IN ('reserved', 'written')")
-    reserved = cur.fetchone()[0]
-    con.close()
+    # Maintained by triggers on provisioning_log — no scan of the history.
+    cur.execute("SELECT status, count FROM pool_counters")
+    counts = {r["status"]: r["count"] for r in cur.fetchall()}
+    assigned = counts.get("verified", 0)
+    reserved = counts.get("reserved", 0) + counts.get("written", 0)
 
     return {
         "range_set": True,
@@ -370,6 +821,7 @@ def get_pool_status() -> dict:
         "assigned": assigned,
         "reserved": reserved,
         "remaining": remaining,
+        "leased": leased,
         "low_pool": remaining <= row["warn_threshold"],
     }
 
@@ -394,7 +846,6 @@ def get_assigned_mac(serial: str):
         (serial,)
     )
     row = cur.fetchone()
-    con.close()
     return row["mac"] if row else None
 
 
@@ -405,55 +856,193 @@ def is_golden_sample(serial: str) -> bool:
     # SELECT 1 is the conventional existence check — fetches no column data.
     cur.execute("SELECT 1 FROM golden_samples WHERE serial = ?", (serial,))
     result = cur.fetchone() is not None  # None → not a golden sample
-    con.close()
     return result
 
 
-def reserve_mac(serial: str, workstation_id: str = None):
+def reserve_mac(serial: str, workstation_id: str = None, block_size: int = None):
     """Take the next MAC from the range and advance the pointer.
 
+    The whole reservation runs in one BEGIN IMMEDIATE transaction, so concurrent
+    workstations on a shared DB never receive the same MAC.
+
+    Args:
+        serial:          Device serial number.
+        workstation_id:  Test station ID (audit trail, and lease owner).
+        block_size:      Lease this many MACs per workstation at a time.
+                         None reads MAC_LEASE_BLOCK_SIZE (default 1 = no leasing).
+                         Leasing needs a workstation_id.
+
+    Other workstations' leases idle for longer than MAC_LEASE_MAX_AGE_HOURS
+    are reclaimed in the same transaction; their unissued MACs are handed out
+    before the shared pointer moves on.
+
     Returns:
         (mac, low_pool) tuple, or (None, False) if the range is exhausted.
         A rolled-back MAC is NOT re-used — the pointer always moves forward.
     """
+    block_size = _lease_block_size(block_size)
+    cutoff = _lease_cutoff(None)
     con = _get_connection()
     cur = con.cursor()
-    cur.execute("SELECT * FROM mac_range WHERE id = 1")
-    row = cur.fetchone()
-    if row is None:
-        con.close()
-        return None, False
+    try:
+        # Take the write lock before reading next_mac: two stations can no longer
+        # both read the same pointer value and both hand it out.
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("SELECT * FROM mac_range WHERE id = 1")
+        row = cur.fetchone()
+        if row is None:
+            con.rollback()
+            return None, False
+
+        _ensure_lease_table(cur)
+        _reclaim_expired_leases(cur, workstation_id, cutoff)
+        if block_size > 1 and workstation_id:
+            mac = _take_from_lease(cur, row, workstation_id, block_size)
+        else:
+            block = _take_block(cur, row, 1)
+            mac = _int_to_mac(block[0]) if block else None
+
+        if mac is None:
+            con.rollback()
+            return None, False
+
+        # Insert with status='reserved'. The address is now committed to this serial —
+        # it will not be issued to another device even if provisioning later fails.
+        cur.execute(
+            """INSERT INTO provisioning_log (serial, mac, workstation_id, reserved_at, status)
+               VALUES (?, ?, ?, ?, 'reserved')""",
+            (serial, mac, workstation_id, _now())
+        )
 
+        cur.execute("SELECT next_mac, end_mac FROM mac_range WHERE id = 1")
+        remaining_after, _ = _unissued_counts(cur, cur.fetchone(), cutoff)
+        low_pool = remaining_after <= row["warn_threshold"]
+
+        con.commit()
+        return mac, low_pool
+    except Exception:
+        con.rollback()
+        raise
+
+
+def _take_from_range(cur: sqlite3.Cursor, row, count: int):
+    """Advance the shared pointer by up to *count* MACs.
+
+    Returns the first MAC taken (the block is first..first+taken-1), or None
+    if the range is exhausted. Must run inside the reserve_mac transaction.
+    """
     next_int = _mac_to_int(row["next_mac"])
     end_int = _mac_to_int(row["end_mac"])
-
     if next_int > end_int:
-        con.close()
-        return None, False
+        return None
+    taken = min(count, end_int - next_int + 1)
+    # one past end_mac when the last MAC is taken
+    cur.execute(
+        "UPDATE mac_range SET next_mac = ? WHERE id = 1",
+        (_int_to_mac(next_int + taken),)
+    )
+    return row["next_mac"]
 
-    mac = row["next_mac"]     # the MAC address handed out in this call
-    ts = _now()               # UTC timestamp written to reserved_at
 
-    # Advance the pool pointer before inserting the log entry. Both updates run
-    # inside the same DB transaction, so a crash between them cannot leave the
-    # pool in an inconsistent state (SQLite atomicity guarantee).
-    new_next = _int_to_mac(next_int + 1)  # one past end_mac when the last MAC is taken
-    cur.execute("UPDATE mac_range SET next_mac = ? WHERE id = 1", (new_next,))
+def _take_block(cur: sqlite3.Cursor, row, count: int):
+    """Take up to *count* contiguous MACs, from mac_free_blocks first, then the range.
 
-    # Insert with status='reserved'. The address is now committed to this serial —
-    # it will not be issued to another device even if provisioning later fails.
+    Returns (first_int, last_int), or None if nothing is left. Must run inside
+    the reserve_mac transaction.
+    """
+    cur.execute("SELECT start_mac, end_mac FROM mac_free_blocks ORDER BY start_mac LIMIT 1")
+    free = cur.fetchone()
+    if free is not None:
+        first = _mac_to_int(free["start_mac"])
+        last = min(first + count - 1, _mac_to_int(free["end_mac"]))
+        if last == _mac_to_int(free["end_mac"]):
+            cur.execute("DELETE FROM mac_free_blocks WHERE start_mac = ?", (free["start_mac"],))
+        else:
+            cur.execute(
+                "UPDATE mac_free_blocks SET start_mac = ? WHERE start_mac = ?",
+                (_int_to_mac(last + 1), free["start_mac"])
+            )
+        return first, last
+
+    block_start = _take_from_range(cur, row, count)
+    if block_start is None:
+        return None
+    first = _mac_to_int(block_start)
+    return first, min(first + count - 1, _mac_to_int(row["end_mac"]))
+
+
+def _take_from_lease(cur: sqlite3.Cursor, row, workstation_id: str, block_size: int):
+    """Reserve one MAC from the workstation's lease, leasing a new block if needed."""
     cur.execute(
-        """INSERT INTO provisioning_log (serial, mac, workstation_id, reserved_at, status)
-           VALUES (?, ?, ?, ?, 'reserved')""",
-        (serial, mac, workstation_id, ts)
+        "SELECT next_mac, end_mac FROM mac_leases WHERE workstation_id = ?",
+        (workstation_id,)
     )
+    lease = cur.fetchone()
 
-    remaining_after = max(0, end_int - next_int)
-    low_pool = remaining_after <= row["warn_threshold"]
+    if lease is None or _mac_to_int(lease["next_mac"]) > _mac_to_int(lease["end_mac"]):
+        block = _take_block(cur, row, block_size)
+        if block is None:
+            return None
+        block_start, block_end = _int_to_mac(block[0]), block[1]
+        cur.execute(
+            """INSERT INTO mac_leases (workstation_id, next_mac, end_mac, leased_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(workstation_id) DO UPDATE SET
+                   next_mac  = excluded.next_mac,
+                   end_mac   = excluded.end_mac,
+                   leased_at = excluded.leased_at""",
+            (workstation_id, block_start, _int_to_mac(block_end), _now())
+        )
+        logger.info(
+            "Workstation %s leased MAC block %s..%s",
+            workstation_id, block_start, _int_to_mac(block_end),
+        )
+        lease = {"next_mac": block_start}
 
-    con.commit()
-    con.close()
-    return mac, low_pool
+    mac = lease["next_mac"]
+    cur.execute(
+        "UPDATE mac_leases SET next_mac = ?, leased_at = ? WHERE workstation_id = ?",
+        (_int_to_mac(_mac_to_int(mac) + 1), _now(), workstation_id)
+    )
+    return mac
+
+
+def get_mac_leases() -> list:
+    """Return all workstation MAC leases with their unused MAC count."""
+    con = _get_connection()
+    cur = con.cursor()
+    _ensure_lease_table(cur)
+    cur.execute("SELECT * FROM mac_leases ORDER BY workstation_id")
+    rows = []
+    for r in cur.fetchall():
+        lease = dict(r)
+        lease["remaining"] = _block_count(r["next_mac"], r["end_mac"])
+        rows.append(lease)
+    return rows
+
+
+def release_mac_lease(workstation_id: str) -> int:
+    """Return the unissued MACs of a workstation's lease to the pool.
+
+    Use when a station is retired or moved to another DB. Leases idle for
+    longer than MAC_LEASE_MAX_AGE_HOURS are reclaimed automatically.
+
+    Returns:
+        Number of MACs returned to the pool (0 if the station holds no lease).
+    """
+    con = _get_connection()
+    cur = con.cursor()
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        _ensure_lease_table(cur)
+        count = _free_lease(cur, workstation_id)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    if count:
+        logger.info("Released MAC lease of workstation %s (%d unissued MACs).", workstation_id, count)
+    return count
 
 
 def confirm_mac_written(serial: str, mac: str, workstation_id: str = None) -> bool:
@@ -471,7 +1060,6 @@ def confirm_mac_written(serial: str, mac: str, workstation_id: str = None) -> bo
     )
     updated = cur.rowcount > 0  # False → entry was already advanced or rolled back
     con.commit()
-    con.close()
     return updated
 
 
@@ -490,9 +1078,8 @@ def confirm_mac_verified(serial: str, mac: str, workstation_id: str = None) -> b
     )
     success = cur.rowcount > 0  # False → entry was already verified or rolled back
     con.commit()
-    con.close()
     if success:
-        _maybe_backup_db(serial=serial, mac=mac, verified_at=verified_at)
+        _maybe_backup_db(serial=serial, mac=mac, verified_at=verified_at, workstation_id=workstation_id)
     return success
 
 
@@ -516,7 +1103,6 @@ def rollback_mac(serial: str, mac: str, reason: str = None) -> bool:
     )
     updated = cur.rowcount > 0  # False → entry not found or already verified/rolled_back
     con.commit()
-    con.close()
     return updated
 
 
@@ -538,7 +1124,6 @@ def add_golden_sample(serial: str, note: str = None) -> bool:
     )
     added = cur.rowcount > 0
     con.commit()
-    con.close()
     return added
 
 
@@ -560,5 +1145,4 @@ def get_provisioning_log(serial: str = None) -> list:
         # Full table dump — default export and pool diagnostics.
         cur.execute("SELECT * FROM provisioning_log ORDER BY id")
     rows = [dict(r) for r in cur.fetchall()]
-    con.close()
     return rows
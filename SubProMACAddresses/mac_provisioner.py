@@ -10,7 +10,8 @@ Flow
     - Check DB: SN already assigned?  →  DUPLICATE SN  →  HALT
     - Pool empty?                      →  POOL EXHAUSTED →  HALT
     - reserve_mac → set_mac_address → confirm_mac_written
-    - ARP flush + sleep → get_mac_address → compare
+    - ARP flush → poll get_mac_address with exponential backoff
+      (up to ARP_FLUSH_DELAY) → compare
       - Match   → confirm_mac_verified → SUCCESS
       - Mismatch → rollback_mac        → VERIFY FAILED
 2b. current_mac != DEFAULT_MAC  → Re-test path
@@ -33,6 +34,7 @@ Error dicts additionally contain a "reason" key:
 """
 
 import logging
+import math
 import subprocess
 import sys
 import time
@@ -48,9 +50,16 @@ from SubProMACAddresses.mac_database import (
 
 logger = logging.getLogger(__name__)
 
-# Seconds to wait after flushing the ARP cache so the device can
-# re-announce itself with the new MAC via mDNS.
+# Upper bound in seconds for the read-back after flushing the ARP cache, while
+# the device re-announces itself with the new MAC via mDNS. Read-back is polled
+# from READBACK_INITIAL_INTERVAL, doubling each attempt, and stops as soon as the
+# written MAC is read back.
 ARP_FLUSH_DELAY = 3.0
+READBACK_INITIAL_INTERVAL = 0.1
+READBACK_BACKOFF = 2.0
+
+# Discovery timeout for the in-poll retarget after a MAC-dependent name change.
+READBACK_DISCOVER_TIMEOUT = 1
 
 
 # ---------------------------------------------------------------------------
@@ -62,7 +71,7 @@ def _flush_arp_cache() -> None:
     try:
         if sys.platform == "win32":
             # Requires elevated privileges on Windows. check=False: a permission error
-            # does not abort provisioning — the sleep(arp_delay) is the real safeguard.
+            # does not abort provisioning — polling read-back is the real safeguard.
             subprocess.run(["arp", "-d", "*"], check=False, capture_output=True)
         else:
             # Linux / macOS — requires CAP_NET_ADMIN (root or sudo). Same rationale.
@@ -208,6 +217,68 @@ def _retarget_device_after_mac_change(device, expected_mac: str, timeout: int =
     return True
 
 
+def _target_matches_mac(device, expected_mac: str) -> bool:
+    """True if the device target carries the SubPro-<last 6 MAC hex digits> suffix of *expected_mac*."""
+    target = getattr(device, "target", None)
+    return isinstance(target, str) and target.upper().endswith(expected_mac.replace(":", "")[-6:].upper())
+
+
+def _poll_readback(device, expected_mac: str, ceiling: float) -> tuple:
+    """Poll the device MAC until it reads back *expected_mac* or *ceiling* seconds pass.
+
+    Intervals start at READBACK_INITIAL_INTERVAL and grow by READBACK_BACKOFF.
+    Failed reads trigger a rediscovery until one is confirmed, since newer
+    firmware renames the device after a MAC write. A retarget counts as
+    confirmed when the new name carries the expected MAC suffix or a read
+    through it succeeds; an unconfirmed single-device fallback is retried on
+    the next backoff step. Discovery never starts past the ceiling.
+
+    Returns:
+        (read_back, elapsed_s, attempts, retargeted) — read_back is the last
+        value read (None if the device never answered); retargeted is True if
+        a confirmed rediscovery already moved the device to its new name.
+    """
+    start = time.monotonic()
+    deadline = start + max(ceiling, 0.0)
+    interval = READBACK_INITIAL_INTERVAL
+    attempts = 0
+    retargeted = False
+    unconfirmed_target = False
+    read_back = None
+
+    while True:
+        attempts += 1
+        value = _read_mac(device)
+        if value is not None:
+            read_back = value
+            if unconfirmed_target:
+                retargeted = True
+                unconfirmed_target = False
+        if value == expected_mac:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if value is None and not retargeted:
+            # Keep trying until a rediscovery is confirmed: the device may still be
+            # rebooting its network stack on the first attempts.
+            # discover --timeout takes whole seconds.
+            discover_timeout = max(1, math.ceil(min(READBACK_DISCOVER_TIMEOUT, remaining)))
+            if _retarget_device_after_mac_change(device, expected_mac=expected_mac, timeout=discover_timeout):
+                if _target_matches_mac(device, expected_mac):
+                    retargeted = True
+                    continue
+                # Fallback to the only discovered name: confirmed by the next successful read
+                unconfirmed_target = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+        time.sleep(min(interval, remaining))
+        interval *= READBACK_BACKOFF
+
+    return read_back, time.monotonic() - start, attempts, retargeted
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -227,6 +298,8 @@ def provision_mac(
         workstation_id:  ID string of the test station (for audit log).
         default_mac:     The factory default MAC address used before provisioning,
                          e.g. "02:00:00:00:00:00".
+        arp_delay:       Read-back ceiling in seconds (default ARP_FLUSH_DELAY).
+                         Read-back returns as soon as the written MAC is seen.
 
     Returns:
         dict with keys:
@@ -235,6 +308,7 @@ def provision_mac(
             mac          assigned/verified MAC address (on success / retest_ok)
             low_pool     True if fewer than LOW_POOL_WARN MACs remain (on success)
             available    number of available MACs remaining (on success)
+            readback_s   seconds until the written MAC was read back (on success)
     """
     default_mac = _normalise_mac(default_mac)
 
@@ -303,20 +377,22 @@ def _provision_first_test(device, serial: str, workstation_id: str, arp_delay: f
     confirm_mac_written(serial, mac, workstation_id)
     logger.info("[%s] MAC written: %s", serial, mac)
 
-    # Flush ARP cache and wait for device to re-announce via mDNS
+    # Flush ARP cache and poll read-back while the device re-announces via mDNS
     delay = arp_delay if arp_delay is not None else ARP_FLUSH_DELAY
     _flush_arp_cache()
-    logger.debug("[%s] Waiting %.1f s after ARP flush…", serial, delay)
-    time.sleep(delay)
+    read_back, readback_s, attempts, retargeted = _poll_readback(device, mac, delay)
+    logger.info(
+        "[%s] Read-back after %.3f s (%d attempt(s), ceiling %.1f s): %s",
+        serial, readback_s, attempts, delay, read_back,
+    )
 
-    # Read back MAC from device to verify
-    read_back = _read_mac(device)
-    if read_back is None:
+    if read_back is None and not retargeted:
         # Device name may have changed with new MAC on newer firmware.
         if _retarget_device_after_mac_change(device, expected_mac=mac, timeout=3):
             read_back = _read_mac(device)
+            retargeted = read_back is not None or _target_matches_mac(device, mac)
 
-    if read_back != mac:
+    if read_back != mac and not retargeted:
         # One more recovery attempt for name-change race conditions.
         if _retarget_device_after_mac_change(device, expected_mac=mac, timeout=3):
             retried = _read_mac(device)
@@ -352,6 +428,7 @@ def _provision_first_test(device, serial: str, workstation_id: str, arp_delay: f
         "mac": mac,
         "low_pool": low_pool,
         "remaining": pool.get("remaining", 0),
+        "readback_s": round(readback_s, 3),
     }
 
 
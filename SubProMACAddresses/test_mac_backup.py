@@ -0,0 +1,167 @@
+"""
+test_mac_backup.py
+
+Tests for the MAC database backup to external media (MAC_DB_BACKUP_DIR).
+
+Paths covered
+-------------
+test_verified_mac_is_journaled    — every verified MAC lands in the journal synchronously
+test_snapshot_is_consistent       — background snapshot holds the verified record
+test_snapshots_are_coalesced      — back-to-back provisions trigger one snapshot and archive
+test_snapshot_thread_does_not_block_exit — the snapshot runs on a daemon thread
+test_unverified_mac_not_backed_up — reserved/written entries do not trigger a backup
+test_replay_journal               — restoring a stale snapshot + journal recovers all MACs
+test_replay_journal_skips_leased_macs — replay also moves workstation leases past journaled MACs
+
+Run:
+    pytest SubProMACAddresses/test_mac_backup.py -v
+"""
+
+import csv
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import SubProMACAddresses.mac_database as mac_db
+
+RANGE_START = "02:DD:00:00:00:00"
+RANGE_END   = "02:DD:00:00:00:FF"
+WS_ID       = "backup_test_workstation"
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(monkeypatch, tmp_path):
+    db_dir = tmp_path / "db"
+    monkeypatch.setattr(mac_db, "DB_PATH", str(db_dir / "mac_addresses.db"))
+    monkeypatch.setattr(mac_db, "_DB_DIR", str(db_dir))
+    mac_db.init_db()
+    mac_db.set_mac_range(RANGE_START, RANGE_END, 10)
+    yield
+
+
+@pytest.fixture
+def backup_dir(monkeypatch, tmp_path):
+    path = tmp_path / "usb" / mac_db.AUTO_BACKUP_SUBDIR
+    monkeypatch.setenv(mac_db.BACKUP_DIR_ENV_VAR, str(path))
+    yield str(path)
+    mac_db.wait_for_backup()
+
+
+def _provision(serial):
+    mac, _ = mac_db.reserve_mac(serial, WS_ID)
+    mac_db.confirm_mac_written(serial, mac, WS_ID)
+    assert mac_db.confirm_mac_verified(serial, mac, WS_ID)
+    return mac
+
+
+def _journal(backup_dir):
+    with open(os.path.join(backup_dir, mac_db.BACKUP_JOURNAL_NAME), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _snapshot_macs(backup_dir):
+    con = sqlite3.connect(os.path.join(backup_dir, mac_db.BACKUP_SNAPSHOT_NAME))
+    rows = con.execute("SELECT mac FROM provisioning_log WHERE status = 'verified'").fetchall()
+    con.close()
+    return [r[0] for r in rows]
+
+
+def test_verified_mac_is_journaled(backup_dir):
+    mac = _provision("CI0000001")
+
+    (entry,) = _journal(backup_dir)
+    assert entry["serial"] == "CI0000001"
+    assert entry["mac"] == mac
+    assert entry["workstation_id"] == WS_ID
+
+
+def test_snapshot_is_consistent(backup_dir):
+    mac = _provision("CI0000001")
+    mac_db.wait_for_backup()
+
+    assert _snapshot_macs(backup_dir) == [mac]
+    archives = [n for n in os.listdir(backup_dir) if n.startswith("mac_addresses_2")]
+    assert len(archives) == 1
+    assert not os.path.exists(os.path.join(backup_dir, mac_db.BACKUP_SNAPSHOT_NAME + ".tmp"))
+
+
+def test_snapshots_are_coalesced(backup_dir):
+    first = _provision("CI0000001")
+    mac_db.wait_for_backup()
+    for i in range(2, 6):
+        _provision(f"CI000000{i}")
+        mac_db.wait_for_backup()
+
+    # Snapshot still from the first provision; the journal holds all five.
+    assert _snapshot_macs(backup_dir) == [first]
+    assert len(_journal(backup_dir)) == 5
+    # One archive per snapshot taken, named after the assignment that triggered it
+    archives = [n for n in os.listdir(backup_dir) if n.startswith("mac_addresses_2")]
+    assert len(archives) == 1 and archives[0].endswith("_CI0000001_02_DD_00_00_00_00.db")
+
+
+def test_snapshot_thread_does_not_block_exit(backup_dir, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(mac_db, "_snapshot_worker", lambda *args: release.wait(5))
+
+    _provision("CI0000001")
+    thread = mac_db._backup_thread
+    try:
+        assert thread.daemon and thread.is_alive()
+    finally:
+        release.set()
+        thread.join()
+        mac_db._backup_thread = None  # the stub worker does not clear it
+
+
+def test_unverified_mac_not_backed_up(backup_dir):
+    mac, _ = mac_db.reserve_mac("CI0000001", WS_ID)
+    mac_db.confirm_mac_written("CI0000001", mac, WS_ID)
+
+    assert not os.path.exists(backup_dir)
+
+
+def test_replay_journal(backup_dir, monkeypatch):
+    _provision("CI0000001")
+    mac_db.wait_for_backup()
+    later = [_provision(f"CI000000{i}") for i in range(2, 4)]
+
+    # Simulate losing the local DB: restore the (stale) snapshot, then replay.
+    restored = os.path.join(os.path.dirname(mac_db.DB_PATH), "restored.db")
+    os.replace(os.path.join(backup_dir, mac_db.BACKUP_SNAPSHOT_NAME), restored)
+    monkeypatch.setattr(mac_db, "DB_PATH", restored)
+    assert mac_db.get_pool_status()["assigned"] == 1
+
+    inserted = mac_db.replay_backup_journal(os.path.join(backup_dir, mac_db.BACKUP_JOURNAL_NAME))
+
+    assert inserted == 2
+    assert [mac_db.get_assigned_mac(f"CI000000{i}") for i in range(2, 4)] == later
+    pool = mac_db.get_pool_status()
+    assert pool["assigned"] == 3
+    assert pool["next_mac"] == "02:DD:00:00:00:03"
+
+
+def test_replay_journal_skips_leased_macs(backup_dir, monkeypatch):
+    monkeypatch.setenv(mac_db.LEASE_BLOCK_SIZE_ENV_VAR, "8")
+    _provision("CI0000001")
+    mac_db.wait_for_backup()
+    later = [_provision(f"CI000000{i}") for i in range(2, 4)]
+
+    restored = os.path.join(os.path.dirname(mac_db.DB_PATH), "restored.db")
+    os.replace(os.path.join(backup_dir, mac_db.BACKUP_SNAPSHOT_NAME), restored)
+    monkeypatch.setattr(mac_db, "DB_PATH", restored)
+    mac_db.replay_backup_journal(os.path.join(backup_dir, mac_db.BACKUP_JOURNAL_NAME))
+
+    # The snapshot's lease still started at the second MAC; replay moves it past the journal.
+    assert mac_db.get_mac_leases()[0]["next_mac"] == "02:DD:00:00:00:03"
+    assert _provision("CI0000004") not in later
@@ -0,0 +1,176 @@
+"""
+test_mac_concurrency.py
+
+Concurrency tests for SubProMACAddresses.mac_database.reserve_mac.
+
+Several worker processes (standing in for workstations sharing one DB file)
+reserve MACs at the same time. No MAC may be handed out twice, and the pool
+pointer must account for every reservation — with and without per-workstation
+block leasing.
+
+Run:
+    pytest SubProMACAddresses/test_mac_concurrency.py -v
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import SubProMACAddresses.mac_database as mac_db
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+RANGE_START   = "02:CC:00:00:00:00"
+RANGE_END     = "02:CC:00:00:03:FF"   # 1024 MACs
+STATIONS      = 4
+PER_STATION   = 40
+
+
+def _reserve_many(db_path, db_dir, workstation_id, count, block_size):
+    """Worker: reserve *count* MACs as *workstation_id* in its own process."""
+    mac_db.DB_PATH = db_path
+    mac_db._DB_DIR = db_dir
+    macs = []
+    for i in range(count):
+        mac, _ = mac_db.reserve_mac(f"{workstation_id}-{i:04d}", workstation_id, block_size=block_size)
+        macs.append(mac)
+    return macs
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(monkeypatch, tmp_path):
+    db_path = str(tmp_path / "mac_test.db")
+    monkeypatch.setattr(mac_db, "DB_PATH", db_path)
+    monkeypatch.setattr(mac_db, "_DB_DIR", str(tmp_path))
+    mac_db.init_db()
+    mac_db.set_mac_range(RANGE_START, RANGE_END, 10)
+    yield db_path
+
+
+def _run_stations(db_path, block_size):
+    with ProcessPoolExecutor(max_workers=STATIONS) as pool:
+        futures = [
+            pool.submit(_reserve_many, db_path, os.path.dirname(db_path), f"WS{n}", PER_STATION, block_size)
+            for n in range(STATIONS)
+        ]
+        return {f"WS{n}": f.result() for n, f in enumerate(futures)}
+
+
+@pytest.mark.parametrize("block_size", [1, 8])
+def test_concurrent_reservations_are_unique(isolated_db, block_size):
+    per_station = _run_stations(isolated_db, block_size)
+    macs = [mac for station in per_station.values() for mac in station]
+
+    assert None not in macs
+    assert len(macs) == STATIONS * PER_STATION
+    assert len(set(macs)) == len(macs), "duplicate MAC handed out"
+
+    log_macs = [row["mac"] for row in mac_db.get_provisioning_log()]
+    assert sorted(log_macs) == sorted(macs)
+
+    pool = mac_db.get_pool_status()
+    assert pool["total"] - pool["remaining"] == len(macs)
+
+
+def test_lease_blocks_are_contiguous_per_station():
+    macs = [mac_db.reserve_mac(f"SN{i}", "WS1", block_size=4)[0] for i in range(6)]
+    other = mac_db.reserve_mac("SN-other", "WS2", block_size=4)[0]
+
+    ints = [mac_db._mac_to_int(m) for m in macs]
+    start = mac_db._mac_to_int(RANGE_START)
+    # WS1: first block 0..3, second block 4..7; WS2 leases the next block 8..11.
+    assert ints == [start + i for i in range(6)]
+    assert mac_db._mac_to_int(other) == start + 8
+
+    leases = {lease["workstation_id"]: lease for lease in mac_db.get_mac_leases()}
+    assert leases["WS1"]["remaining"] == 2
+    assert leases["WS2"]["remaining"] == 3
+
+    pool = mac_db.get_pool_status()
+    assert pool["leased"] == 5
+    # Active leases are reported apart from what other stations can still get
+    assert pool["remaining"] == 1024 - 12
+
+
+def test_lease_is_cut_at_range_end():
+    mac_db.set_mac_range("02:CC:00:00:00:00", "02:CC:00:00:00:04", 0)   # 5 MACs
+    macs = [mac_db.reserve_mac(f"SN{i}", "WS1", block_size=4)[0] for i in range(6)]
+
+    assert macs[:5] == [f"02:CC:00:00:00:0{i}" for i in range(5)]
+    assert macs[5] is None
+    assert mac_db.get_pool_status()["remaining"] == 0
+
+
+def test_set_mac_range_clears_leases():
+    mac_db.reserve_mac("SN1", "WS1", block_size=16)
+    mac_db.set_mac_range(RANGE_START, RANGE_END, 10)
+
+    assert mac_db.get_mac_leases() == []
+    assert mac_db.get_pool_status()["leased"] == 0
+
+
+def test_block_size_from_env(monkeypatch):
+    monkeypatch.setenv(mac_db.LEASE_BLOCK_SIZE_ENV_VAR, "10")
+    mac_db.reserve_mac("SN1", "WS1")
+
+    assert mac_db.get_mac_leases()[0]["remaining"] == 9
+
+
+def _age_lease(workstation_id, hours):
+    con = mac_db._get_connection()
+    con.execute(
+        "UPDATE mac_leases SET leased_at = ? WHERE workstation_id = ?",
+        ((datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat(), workstation_id),
+    )
+    con.commit()
+
+
+def test_expired_lease_is_reclaimed_by_other_station(monkeypatch):
+    mac_db.set_mac_range("02:CC:00:00:00:00", "02:CC:00:00:00:07", 0)   # 8 MACs
+    monkeypatch.setenv(mac_db.LEASE_MAX_AGE_ENV_VAR, "24")
+    mac_db.reserve_mac("SN1", "WS1", block_size=8)   # WS1 leases everything, then leaves
+    assert mac_db.reserve_mac("SN2", "WS2")[0] is None
+    assert mac_db.get_pool_status()["remaining"] == 0
+
+    _age_lease("WS1", 25)
+    assert mac_db.get_pool_status()["remaining"] == 7
+
+    # The stranded block is handed out lowest first, before the (exhausted) range
+    macs = [mac_db.reserve_mac(f"SN{i}", "WS2", block_size=4)[0] for i in range(3, 11)]
+    assert macs == [f"02:CC:00:00:00:0{i}" for i in range(1, 8)] + [None]
+    assert [lease["workstation_id"] for lease in mac_db.get_mac_leases()] == ["WS2"]
+
+
+def test_active_lease_is_not_reclaimed(monkeypatch):
+    monkeypatch.setenv(mac_db.LEASE_MAX_AGE_ENV_VAR, "24")
+    mac_db.reserve_mac("SN1", "WS1", block_size=4)
+    _age_lease("WS1", 23)
+    mac_db.reserve_mac("SN2", "WS2", block_size=4)
+    # Reserving from a lease refreshes it
+    mac_db.reserve_mac("SN3", "WS1", block_size=4)
+    _age_lease("WS2", 1)
+
+    leases = {lease["workstation_id"]: lease["remaining"] for lease in mac_db.get_mac_leases()}
+    assert leases == {"WS1": 2, "WS2": 3}
+
+
+def test_release_mac_lease_returns_unissued_macs():
+    mac_db.reserve_mac("SN1", "WS1", block_size=4)
+    assert mac_db.release_mac_lease("WS1") == 3
+    assert mac_db.release_mac_lease("WS1") == 0
+    assert mac_db.get_pool_status()["leased"] == 0
+    assert mac_db.get_pool_status()["remaining"] == 1024 - 1
+
+    assert mac_db.reserve_mac("SN2", "WS2")[0] == "02:CC:00:00:00:01"
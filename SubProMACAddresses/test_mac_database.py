@@ -0,0 +1,149 @@
+"""
+test_mac_database.py
+
+Tests for the mac_database data layer: persistent connections, schema
+migration of existing databases, indexes and the pool_counters table.
+
+Run:
+    pytest SubProMACAddresses/test_mac_database.py -v
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import SubProMACAddresses.mac_database as mac_db
+
+RANGE_START = "02:EE:00:00:00:00"
+RANGE_END   = "02:EE:00:00:FF:FF"
+
+# Schema as created before indexes and counters existed.
+_LEGACY_SCHEMA = """
+CREATE TABLE mac_range (
+    id INTEGER PRIMARY KEY CHECK (id=1),
+    start_mac TEXT NOT NULL,
+    end_mac TEXT NOT NULL,
+    next_mac TEXT NOT NULL,
+    warn_threshold INTEGER NOT NULL
+);
+CREATE TABLE provisioning_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    serial TEXT NOT NULL,
+    mac TEXT NOT NULL,
+    workstation_id TEXT,
+    reserved_at TEXT,
+    written_at TEXT,
+    verified_at TEXT,
+    status TEXT NOT NULL
+);
+CREATE TABLE golden_samples (
+    serial TEXT PRIMARY KEY,
+    added_at TEXT NOT NULL,
+    note TEXT
+);
+INSERT INTO mac_range VALUES (1, '02:EE:00:00:00:00', '02:EE:00:00:FF:FF', '02:EE:00:00:00:03', 5);
+INSERT INTO provisioning_log (serial, mac, status) VALUES ('SN1', '02:EE:00:00:00:00', 'verified');
+INSERT INTO provisioning_log (serial, mac, status) VALUES ('SN2', '02:EE:00:00:00:01', 'rolled_back');
+INSERT INTO provisioning_log (serial, mac, status) VALUES ('SN3', '02:EE:00:00:00:02', 'written');
+"""
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(monkeypatch, tmp_path):
+    db_path = str(tmp_path / "mac_test.db")
+    monkeypatch.setattr(mac_db, "DB_PATH", db_path)
+    monkeypatch.setattr(mac_db, "_DB_DIR", str(tmp_path))
+    yield db_path
+    mac_db.close_database()
+
+
+def _counts_by_scan(db_path):
+    con = sqlite3.connect(db_path)
+    rows = con.execute("SELECT status, COUNT(*) FROM provisioning_log GROUP BY status").fetchall()
+    con.close()
+    return dict(rows)
+
+
+def _counters(db_path):
+    con = sqlite3.connect(db_path)
+    rows = con.execute("SELECT status, count FROM pool_counters WHERE count > 0").fetchall()
+    con.close()
+    return dict(rows)
+
+
+def test_connection_is_reused():
+    mac_db.init_db()
+    con = mac_db._get_connection()
+    mac_db.set_mac_range(RANGE_START, RANGE_END, 10)
+    mac_db.get_pool_status()
+    assert mac_db._get_connection() is con
+
+
+def test_db_path_change_reopens(tmp_path, monkeypatch):
+    mac_db.init_db()
+    first = mac_db._get_connection()
+    monkeypatch.setattr(mac_db, "DB_PATH", str(tmp_path / "other.db"))
+    assert mac_db._get_connection() is not first
+
+
+def test_legacy_db_is_migrated(isolated_db):
+    con = sqlite3.connect(isolated_db)
+    con.executescript(_LEGACY_SCHEMA)
+    con.close()
+
+    pool = mac_db.get_pool_status()
+
+    assert pool["assigned"] == 1
+    assert pool["reserved"] == 1
+    con = sqlite3.connect(isolated_db)
+    assert con.execute("PRAGMA user_version").fetchone()[0] == mac_db.SCHEMA_VERSION
+    indexes = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    con.close()
+    assert "idx_provisioning_log_serial_status" in indexes
+
+
+def test_counters_follow_every_change(isolated_db):
+    mac_db.init_db()
+    mac_db.set_mac_range(RANGE_START, RANGE_END, 10)
+
+    for i in range(6):
+        serial = f"SN{i}"
+        mac, _ = mac_db.reserve_mac(serial, "WS")
+        if i % 3 == 0:
+            mac_db.rollback_mac(serial, mac)
+            continue
+        mac_db.confirm_mac_written(serial, mac, "WS")
+        if i % 2:
+            mac_db.confirm_mac_verified(serial, mac, "WS")
+
+    # Writers outside this module (stress test helpers, manual repairs).
+    con = sqlite3.connect(isolated_db)
+    con.execute("DELETE FROM provisioning_log WHERE serial = 'SN1'")
+    con.commit()
+    con.close()
+
+    assert _counters(isolated_db) == _counts_by_scan(isolated_db)
+    pool = mac_db.get_pool_status()
+    assert pool["assigned"] == _counts_by_scan(isolated_db).get("verified", 0)
+
+
+def test_assigned_mac_lookup_uses_index():
+    mac_db.init_db()
+    con = mac_db._get_connection()
+    plan = con.execute(
+        "EXPLAIN QUERY PLAN SELECT mac FROM provisioning_log WHERE serial = ? AND status = 'verified'"
+        " ORDER BY id DESC LIMIT 1",
+        ("SN1",),
+    ).fetchall()
+    detail = " ".join(r["detail"] for r in plan)
+    assert "idx_provisioning_log_serial_status" in detail
+    assert "TEMP B-TREE" not in detail
@@ -5,7 +5,9 @@ Stress test for the SubPro MAC address provisioning write → read-back verifica
 
 What is tested:
   - Many provisioning cycles in sequence
-  - Variable ARP_FLUSH_DELAY (0 s … 3 s) to find the minimum viable delay
+  - Variable read-back ceiling (--arp-delay 0 s … 3 s). Read-back is polled
+    with backoff and returns as soon as the MAC matches, so per-cycle time
+    at the 3 s production ceiling shows the time saved versus a fixed sleep
   - OCA communication reliability under rapid successive calls
   - Read-back consistency: every provisioned MAC is confirmed via RETEST_OK
 
@@ -59,8 +61,8 @@ MAC_RANGE_START = "02:FE:ED:01:00:00"
 MAC_RANGE_END   = "02:FE:ED:01:FF:FF"   # 65 536 MACs
 WARN_THRESHOLD  = 100
 
-# ARP delays to test (seconds).
-# 0.0 = maximum stress; 3.0 = production default.
+# Read-back ceilings to test (seconds).
+# 0.0 = single read, maximum stress; 3.0 = production default.
 DELAYS = [0.0, 0.5, 1.0, 2.0, 3.0]
 
 # Number of full provision → verify cycles per delay value
@@ -17,6 +17,8 @@ test_retest_ok          — Device already has its provisioned MAC            
 test_unknown_device     — Unique MAC on device, SN not in DB               → error/unknown_device
 test_mac_mismatch       — Unique MAC on device, differs from DB record     → error/mac_mismatch
 test_db_path_propagation — provision_mac uses whichever DB_PATH is active  → isolation test
+test_readback_*         — Read-back polls with backoff and stops at the first match
+test_simulated_device   — End to end against OCADeviceSimulator (rename + downtime)
 
 Run:
     pytest SubProMACAddresses/test_provisioner_unit.py -v
@@ -25,7 +27,8 @@ Run:
 import os
 import sqlite3
 import sys
-from unittest.mock import MagicMock
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -37,6 +40,7 @@ _HERE = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(_HERE))
 
 import SubProMACAddresses.mac_database as mac_db
+import SubProMACAddresses.mac_provisioner as mac_prov
 from SubProMACAddresses.mac_database import set_mac_range
 from SubProMACAddresses.mac_provisioner import provision_mac
 
@@ -314,3 +318,148 @@ class TestDbPathPropagation:
         mac_db.DB_PATH = db_a
         assert mac_db.get_pool_status()["assigned"] == 1   # only the pre-seeded record
         assert mac_db.get_pool_status()["next_mac"] == "02:AA:00:00:00:01"
+
+
+# ---------------------------------------------------------------------------
+# Read-back polling
+# ---------------------------------------------------------------------------
+
+def _make_slow_device(unreachable_reads: int) -> MagicMock:
+    """OCADevice mock whose get_mac_address fails *unreachable_reads* times after a write."""
+    dev = _make_device(DEFAULT_MAC)
+    state = {"failures": 0}
+
+    def _set(m):
+        dev.get_mac_address.side_effect = _get_after_write
+        state["mac"] = m
+
+    def _get_after_write():
+        if state["failures"] < unreachable_reads:
+            state["failures"] += 1
+            raise RuntimeError("Command failed (exit code 100): Device not found")
+        return {"value": state["mac"]}
+
+    dev.set_mac_address.side_effect = _set
+    return dev
+
+
+@patch.object(mac_prov, "_flush_arp_cache", lambda: None)
+class TestReadbackPolling:
+    def test_readback_returns_before_ceiling(self):
+        """Device reachable after two failed reads → success well under the ceiling."""
+        _seed_range()
+        dev = _make_slow_device(unreachable_reads=2)
+
+        t0 = time.monotonic()
+        result = provision_mac(dev, "CI0000001", WS_ID, DEFAULT_MAC, arp_delay=3.0)
+        elapsed = time.monotonic() - t0
+
+        assert result["status"] == "success"
+        assert elapsed < 1.0
+        assert result["readback_s"] <= elapsed
+        # Initial read + 2 failures + 1 successful read-back
+        assert dev.get_mac_address.call_count == 4
+        # First failure triggers a single rediscovery attempt
+        dev.discover.assert_called_with(timeout=mac_prov.READBACK_DISCOVER_TIMEOUT)
+
+    def test_readback_gives_up_at_ceiling(self):
+        """Device never reads back the written MAC → verify_failed after the ceiling."""
+        _seed_range()
+        dev = _make_device(DEFAULT_MAC, readback_mac="FF:FF:FF:FF:FF:FF")
+
+        t0 = time.monotonic()
+        result = provision_mac(dev, "CI0000001", WS_ID, DEFAULT_MAC, arp_delay=0.5)
+        elapsed = time.monotonic() - t0
+
+        assert result["reason"] == "verify_failed"
+        assert 0.5 <= elapsed < 1.5
+
+    def test_readback_backoff_intervals(self):
+        """Poll intervals start at READBACK_INITIAL_INTERVAL and double."""
+        dev = _make_slow_device(unreachable_reads=3)
+        dev.set_mac_address(RANGE_START)
+        sleeps = []
+
+        with patch.object(mac_prov.time, "sleep", side_effect=sleeps.append):
+            read_back, _, attempts, _ = mac_prov._poll_readback(dev, RANGE_START, ceiling=60.0)
+
+        assert read_back == RANGE_START
+        assert attempts == 4
+        assert sleeps == [0.1, 0.2, 0.4]
+
+    def test_readback_discovery_bounded_by_ceiling(self):
+        """In-poll rediscovery never asks for more time than the ceiling has left."""
+        dev = _make_slow_device(unreachable_reads=100)
+        dev.set_mac_address(RANGE_START)
+
+        read_back, elapsed, _, retargeted = mac_prov._poll_readback(dev, RANGE_START, ceiling=0.3)
+
+        assert read_back is None and not retargeted
+        assert elapsed < 0.5
+        assert dev.discover.call_count >= 1
+        # discover --timeout takes whole seconds
+        assert all(call.kwargs["timeout"] == 1 for call in dev.discover.call_args_list)
+
+    def test_no_fallback_retarget_after_poll_retargeted(self):
+        """Rediscovery done while polling is not repeated by the post-poll fallbacks."""
+        _seed_range()
+        dev = _make_slow_device(unreachable_reads=1)
+        dev.discover.return_value = {"devices": [{"name": "SubPro-4923DA"}]}
+
+        result = provision_mac(dev, "CI0000001", WS_ID, DEFAULT_MAC, arp_delay=3.0)
+
+        assert result["status"] == "success"
+        assert dev.target == "SubPro-4923DA"
+        assert dev.discover.call_count == 1
+
+    def test_unconfirmed_fallback_target_is_rediscovered(self):
+        """A stale single-device fallback name does not stop rediscovery once the renamed device appears."""
+        _seed_range()
+        state = {"mac": DEFAULT_MAC, "written": False}
+        dev = MagicMock()
+        dev.target = "SubPro-000000-old"
+
+        def _get():
+            if state["written"] and dev.target != "SubPro-000000":
+                raise RuntimeError("Command failed (exit code 100): Device not found")
+            return {"value": state["mac"]}
+
+        def _set(m):
+            state["mac"], state["written"] = m, True
+
+        dev.get_mac_address.side_effect = _get
+        dev.set_mac_address.side_effect = _set
+        dev.discover.side_effect = [
+            {"devices": [{"name": "SubPro-EF0000"}]},  # stale name, suffix does not match
+            {"devices": [{"name": "SubPro-000000"}]},
+        ]
+
+        result = provision_mac(dev, "CI0000001", WS_ID, DEFAULT_MAC, arp_delay=3.0)
+
+        assert result["status"] == "success"
+        assert dev.target == "SubPro-000000"
+        assert dev.discover.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# End to end against the OCA device simulator
+# ---------------------------------------------------------------------------
+
+class TestSimulatedDevice:
+    def test_simulated_device_rename_and_downtime(self, monkeypatch):
+        """Device renames itself and is unreachable briefly → retarget, verify well under the ceiling."""
+        from oca.oca_device import OCADevice
+        from oca.oca_simulator import OCADeviceSimulator
+
+        monkeypatch.setenv("ADAM_OCA_TIMING", "off")
+        monkeypatch.setattr(mac_prov, "_flush_arp_cache", lambda: None)
+        _seed_range()
+        with OCADeviceSimulator(mac=DEFAULT_MAC, mac_change_downtime=0.3) as sim:
+            sim.state["locked"] = False
+            dev = OCADevice(target=sim.name, wrapper_factory=sim.wrapper_factory)
+
+            result = provision_mac(dev, "CI0000001", WS_ID, DEFAULT_MAC, arp_delay=3.0)
+
+            assert result["status"] == "success"
+            assert dev.target == sim.name == "SubPro-000000"
+            assert 0.3 <= result["readback_s"] < 1.5
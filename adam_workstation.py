@@ -50,6 +50,8 @@ from analysis.csv_processing import filter_reference_by_limits as filter_referen
 from analysis.csv_processing import compensate_lr_diff as compensate_lr_diff_local
 from analysis.csv_processing import extract_compensated_lr_diff_pair as extract_compensated_lr_diff_pair_local
 from analysis.csv_processing import extract_compensated_lr_diff_combined as extract_compensated_lr_diff_combined_local
+from analysis.pipeline import run_pipeline as run_analysis_pipeline_local
+from analysis.batch import expand_inputs, is_batch_input, per_file_name, run_batch
 from helpers import (
     generate_timestamp_extension,
     construct_path,
@@ -143,13 +145,16 @@ class AdamWorkstation:
             "split_ap_distortion_csv": self.split_ap_distortion_csv,
             "octave_smooth_ap_csv": self.octave_smooth_ap_csv,
             "merge_ap_distortion_csvs": self.merge_ap_distortion_csvs,
+            "run_analysis_pipeline": self.run_analysis_pipeline,
             "set_channel": self.set_channel,
             "open_box": self.open_box,
             "scan_serial": self.scan_serial,
             "get_biquad_coefficients": self.get_biquad_coefficients,
             "check_measurement_trials": self.check_measurement_trials,
             "upload_measurement": self.upload_measurement,  # Changed from process_measurement
+            "upload_measurements": self.upload_measurements,
             "calibrate_gain": self.calibrate_gain,  # NEU: Gain Calibration
+            "calibrate_gain_batch": self.calibrate_gain_batch,
             "get_bass_management": self.get_bass_management,
             "set_bass_management": self.set_bass_management,
             "get_bass_management_bypass": self.get_bass_management_bypass,
@@ -185,6 +190,7 @@ class AdamWorkstation:
             "init_mac_db": self.init_mac_db,
             "set_mac_range": self.set_mac_range,
             "get_mac_pool_status": self.get_mac_pool_status,
+            "release_mac_lease": self.release_mac_lease,
             "export_mac_log": self.export_mac_log,
             "register_golden_sample": self.register_golden_sample,
         }
@@ -464,12 +470,57 @@ class AdamWorkstation:
         # Generate and print the prefix locally
         print(generate_file_prefix(args.strings))
 
+    def _run_csv_batch(self, args, function_name, make_kwargs):
+        """
+        Run a per-file CSV command on every match of a glob/directory ``input_path``.
+
+        ``make_kwargs(path)`` returns the csv_processing keyword arguments for
+        one input. Prints one ``input -> output`` line per file and a summary;
+        raises RuntimeError if nothing matched or any file failed.
+        """
+        if getattr(args, "server", False):
+            raise RuntimeError(f"{function_name}: glob/directory input runs locally only; omit --server.")
+        inputs = expand_inputs(args.input_path)
+        if not inputs:
+            raise RuntimeError(f"No CSV files match {args.input_path}")
+        WORKSTATION_LOGGER.info(
+            "Executing '%s' batch: %d file(s) from %s, workers=%s",
+            function_name, len(inputs), args.input_path, args.workers or "auto",
+        )
+
+        def _progress(done, total):
+            WORKSTATION_LOGGER.info("%s batch: %d/%d file(s) done", function_name, done, total)
+
+        result = run_batch(
+            function_name, [(path, make_kwargs(path)) for path in inputs], workers=args.workers, progress=_progress,
+        )
+        for path, output in result.succeeded:
+            if isinstance(output, dict):
+                output = ", ".join(f"{metric}: {out}" for metric, out in output.items())
+            print(f"{path} -> {output}")
+        for path, error in result.failed:
+            WORKSTATION_LOGGER.error("%s failed for %s: %s", function_name, path, error)
+            print(f"FAILED {path}: {error}")
+        print(result.summary())
+        if result.failed:
+            raise RuntimeError(f"{function_name}: {len(result.failed)} of {result.total} file(s) failed")
+
     def extract_csv_columns(self, args):
         """
         Extract selected CSV columns from row 2 onward into a new CSV file.
 
         Runs locally by default. If --server is provided, delegates to ADAM service.
+        A glob or directory input_path processes every match in parallel; the
+        output filename then gets the input stem (``{stem}`` or a ``<stem>_`` prefix).
         """
+        if is_batch_input(args.input_path):
+            self._run_csv_batch(args, "extract_csv_columns", lambda path: {
+                "input_path": path,
+                "columns": args.columns,
+                "output_filename": per_file_name(args.output_filename, path),
+                "output_dir": args.output_dir,
+            })
+            return
         if args.server:
             WORKSTATION_LOGGER.info(
                 "Executing 'extract_csv_columns' via service: input=%s, columns=%s, output=%s, output_dir=%s",
@@ -509,7 +560,16 @@ class AdamWorkstation:
         Split an AP Level & Distortion CSV into per-metric files (F, H2, H3, Total).
 
         Runs locally by default. If --server is provided, delegates to ADAM service.
+        A glob or directory input_path splits every match in parallel.
         """
+        if is_batch_input(args.input_path):
+            self._run_csv_batch(args, "split_ap_distortion_csv", lambda path: {
+                "input_path": path,
+                "output_dir": args.output_dir,
+                "fraction": args.fraction,
+                "output_prefix": per_file_name(args.output_prefix, path),
+            })
+            return
         if args.server:
             WORKSTATION_LOGGER.info(
                 "Executing 'split_ap_distortion_csv' via service: input=%s, output_dir=%s, fraction=%s, output_prefix=%s",
@@ -588,12 +648,41 @@ class AdamWorkstation:
         for metric, path in results.items():
             print(f"{metric}: {path}")
 
+    def run_analysis_pipeline(self, args):
+        """
+        Run a declarative chain of CSV processing steps in this process.
+
+        Intermediate results stay in memory; only the pipeline's write steps
+        produce files. Runs locally.
+        """
+        WORKSTATION_LOGGER.info(
+            "Executing 'run_analysis_pipeline': spec=%s, base_dir=%s", args.spec_path, args.base_dir,
+        )
+        try:
+            results = run_analysis_pipeline_local(args.spec_path, base_dir=args.base_dir)
+        except Exception as e:
+            WORKSTATION_LOGGER.error("Error in run_analysis_pipeline: %s", e)
+            print(str(e))
+            raise
+        for name, path in results.items():
+            print(f"{name}: {path}")
+
     def octave_smooth_ap_csv(self, args):
         """
         Apply 1/n-octave smoothing to all Y columns of an AP measurement CSV.
 
         Runs locally by default. If --server is provided, delegates to ADAM service.
+        A glob or directory input_path smooths every match in parallel.
         """
+        if is_batch_input(args.input_path):
+            self._run_csv_batch(args, "octave_smooth_ap_csv", lambda path: {
+                "input_path": path,
+                "fraction": args.fraction,
+                "output_filename": per_file_name(args.output_filename, path),
+                "output_dir": args.output_dir,
+                "chunk_rows": args.chunk_rows,
+            })
+            return
         if args.server:
             WORKSTATION_LOGGER.info(
                 "Executing 'octave_smooth_ap_csv' via service: input=%s, fraction=%d, output=%s, output_dir=%s",
@@ -611,14 +700,16 @@ class AdamWorkstation:
             return
 
         WORKSTATION_LOGGER.info(
-            "Executing 'octave_smooth_ap_csv' locally: input=%s, fraction=%d, output=%s, output_dir=%s",
-            args.input_path, args.fraction, args.output_filename, args.output_dir,
+            "Executing 'octave_smooth_ap_csv' locally: input=%s, fraction=%d, output=%s, output_dir=%s, "
+            "chunk_rows=%s",
+            args.input_path, args.fraction, args.output_filename, args.output_dir, args.chunk_rows,
         )
         output_path = octave_smooth_ap_csv_local(
             input_path=args.input_path,
             fraction=args.fraction,
             output_filename=args.output_filename,
             output_dir=args.output_dir,
+            chunk_rows=args.chunk_rows,
         )
         print(output_path)
 
@@ -627,7 +718,19 @@ class AdamWorkstation:
         Compensate L/R imbalance of a stereo RMS measurement CSV using a mono diff CSV.
 
         ``L_new = L + 0.5 * diff``, ``R_new = R - 0.5 * diff``. Runs locally.
+        A glob or directory input_path compensates every match in parallel;
+        output_path is then a directory (``<stem>_comp.csv``) or contains ``{stem}``.
         """
+        if is_batch_input(args.input_path):
+            def _batch_kwargs(path):
+                if "{stem}" in args.output_path:
+                    output_path = per_file_name(args.output_path, path)
+                else:
+                    output_path = os.path.join(args.output_path, per_file_name("{stem}_comp.csv", path))
+                return {"input_path": path, "diff_path": args.diff_path, "output_path": output_path}
+
+            self._run_csv_batch(args, "compensate_lr_diff", _batch_kwargs)
+            return
         WORKSTATION_LOGGER.info(
             "Executing 'compensate_lr_diff': input=%s, diff=%s, output=%s",
             args.input_path, args.diff_path, args.output_path,
@@ -1024,7 +1127,7 @@ class AdamWorkstation:
             serial=args.serial,
             workstation_id=self.workstation_id,  # written to DB as audit trail
             default_mac=args.default_mac,
-            arp_delay=args.arp_delay,             # None uses ARP_FLUSH_DELAY constant (3.0 s)
+            arp_delay=args.arp_delay,             # read-back ceiling; None uses ARP_FLUSH_DELAY (3.0 s)
         )
         WORKSTATION_LOGGER.info("provision_mac [%s]: %s", args.serial, result)
         if result.get("low_pool"):
@@ -1096,6 +1199,12 @@ class AdamWorkstation:
         status = mac_database.get_pool_status()
         print(json.dumps(status))
 
+    def release_mac_lease(self, args):
+        # Returns a retired station's unissued leased MACs to the shared pool.
+        released = mac_database.release_mac_lease(args.workstation_id)
+        WORKSTATION_LOGGER.info("release_mac_lease: %s released %d MACs", args.workstation_id, released)
+        print(json.dumps({"status": "ok", "workstation_id": args.workstation_id, "released": released}))
+
     def export_mac_log(self, args):
         # getattr guards against callers that omit the --serial flag entirely;
         # `or None` converts an empty string to None so the DB query returns all rows.
@@ -1244,7 +1353,8 @@ class AdamWorkstation:
             upload_data = MeasurementUpload.prepare_upload(
                 args.measurement_path,
                 args.serial_number,
-                self.workstation_id
+                self.workstation_id,
+                as_arrays=True,
             )
 
             if getattr(args, "server", False):
@@ -1266,6 +1376,8 @@ class AdamWorkstation:
                 upload_data,
                 args.serial_number,
                 args.db_path,
+                resample_points=getattr(args, "resample_points", None),
+                keep_raw=getattr(args, "keep_raw_levels", None),
             )
 
             if result.get("status") == "success":
@@ -1299,6 +1411,46 @@ class AdamWorkstation:
             WORKSTATION_LOGGER.error("Measurement upload failed: %s", str(e))
             print(False)
 
+    def upload_measurements(self, args):
+        """
+        Bulk-writes measurement CSVs (files, globs or directories) into the local
+        matcher DB in one transaction. The serial number comes from each file name.
+        Prints one line per written, skipped or unreadable file and a summary;
+        raises RuntimeError if nothing matched, a file could not be parsed or the
+        DB write failed.
+        """
+        inputs = [path for input_path in args.input_paths for path in expand_inputs(input_path)]
+        if not inputs:
+            raise RuntimeError(f"No CSV files match {' '.join(args.input_paths)}")
+        WORKSTATION_LOGGER.info("Executing 'upload_measurements': %d file(s) into %s", len(inputs), args.db_path)
+
+        result = MeasurementUpload.upload_measurements_local_db(
+            inputs,
+            args.db_path,
+            self.workstation_id,
+            serial_pattern=args.serial_pattern,
+            resample_points=args.resample_points,
+            keep_raw=args.keep_raw_levels,
+        )
+        for path, error in result["failed"]:
+            WORKSTATION_LOGGER.error("upload_measurements could not read %s: %s", path, error)
+            print(f"FAILED {path}: {error}")
+        if "error" in result:
+            raise RuntimeError(f"upload_measurements: DB write failed, nothing was written: {result['error']}")
+
+        for operation in ("inserted", "updated"):
+            for serial in result[operation]:
+                print(f"{serial}: {operation}")
+        for serial, reason in result["skipped"]:
+            print(f"SKIPPED {serial}: {reason}")
+        print(
+            f"Wrote {len(result['inserted']) + len(result['updated'])} of {len(inputs)} file(s): "
+            f"{len(result['inserted'])} inserted, {len(result['updated'])} updated, "
+            f"{len(result['skipped'])} skipped, {len(result['failed'])} failed"
+        )
+        if result["failed"]:
+            raise RuntimeError(f"upload_measurements: {len(result['failed'])} of {len(inputs)} file(s) failed")
+
     def calibrate_gain(self, args):
         """Calculates gain calibration between input and target measurements."""
         try:
@@ -1306,7 +1458,9 @@ class AdamWorkstation:
             results = GainCalibration.calculate_gain_difference(
                 args.input_file,
                 args.target_file,
-                args.frequencies
+                args.frequencies,
+                fraction=args.fraction,
+                weights=args.weights,
             )
             
             # Only print the average gain difference
@@ -1316,6 +1470,28 @@ class AdamWorkstation:
             WORKSTATION_LOGGER.error("Gain calibration failed: %s", str(e))
             print(f"ERROR: {str(e)}")
 
+    def calibrate_gain_batch(self, args):
+        """
+        Calculates the gain offset of every measurement matching a glob/directory
+        against one target. Prints one ``input,offset`` line per file (``input,ERROR: ...``
+        for files that fail) so a station's history can be checked for drift.
+        """
+        inputs = expand_inputs(args.input_path)
+        if not inputs:
+            raise RuntimeError(f"No CSV files match {args.input_path}")
+        WORKSTATION_LOGGER.info(
+            "Executing 'calibrate_gain_batch': %d file(s) from %s against %s",
+            len(inputs), args.input_path, args.target_file,
+        )
+        results = GainCalibration.calculate_gain_differences(
+            inputs, args.target_file, args.frequencies, fraction=args.fraction, weights=args.weights,
+        )
+        for path, result in results.items():
+            if "error" in result:
+                print(f"{path},ERROR: {result['error']}")
+            else:
+                print(f"{path},{result['average_gain_db']:.2f}")
+
     def init_sub(self, args):
         """Initialize ASubs subwoofer with default settings."""
         try:
@@ -0,0 +1,139 @@
+"""
+batch.py
+
+Batch mode for the per-file CSV commands: expand a glob or directory into
+input files and run one csv_processing call per file across a process pool.
+
+Used by the workstation commands ``octave_smooth_ap_csv``,
+``split_ap_distortion_csv``, ``extract_csv_columns`` and ``compensate_lr_diff``
+when their input path is a directory or contains ``*``, ``?`` or ``[``.
+"""
+
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from . import csv_processing
+
+logger = logging.getLogger(__name__)
+
+_PROGRESS_STEPS = 20
+
+
+def is_batch_input(input_path: str) -> bool:
+    """True if *input_path* names a directory or is a glob pattern."""
+    return bool(input_path) and (os.path.isdir(input_path) or glob.has_magic(input_path))
+
+
+def expand_inputs(input_path: str) -> list[str]:
+    """
+    Return the sorted CSV files matched by a directory, glob or single path.
+
+    A directory matches its ``*.csv`` files (not recursive; use ``dir/**/*.csv``
+    for that). ``**`` in a pattern matches any number of subdirectories.
+    """
+    if os.path.isdir(input_path):
+        pattern = os.path.join(input_path, "*.csv")
+    elif glob.has_magic(input_path):
+        pattern = input_path
+    else:
+        return [input_path]
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def per_file_name(template: Optional[str], input_path: str) -> Optional[str]:
+    """
+    Output name for one input of a batch.
+
+    ``{stem}`` in *template* is replaced by the input file stem; a template
+    without it is prefixed with ``<stem>_`` so matches never overwrite each
+    other. ``None`` stays None (the command's own per-file default).
+    """
+    if template is None:
+        return None
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return template.format(stem=stem) if "{stem}" in template else f"{stem}_{template}"
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch run, in input order."""
+
+    succeeded: list[tuple[str, object]] = field(default_factory=list)
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def summary(self) -> str:
+        rate = self.total / self.elapsed_s if self.elapsed_s else 0.0
+        return (
+            f"Processed {self.total} file(s): {len(self.succeeded)} ok, {len(self.failed)} failed "
+            f"in {self.elapsed_s:.1f} s ({rate:.1f} files/s)"
+        )
+
+
+def _call(function_name: str, kwargs: dict):
+    """Worker entry point: run one csv_processing function (picklable by name)."""
+    return getattr(csv_processing, function_name)(**kwargs)
+
+
+def run_batch(
+    function_name: str,
+    jobs: list[tuple[str, dict]],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> BatchResult:
+    """
+    Run ``csv_processing.<function_name>(**kwargs)`` for every ``(input, kwargs)`` job.
+
+    Args:
+        function_name: Name of a csv_processing function.
+        jobs:          One ``(input path, keyword arguments)`` pair per file.
+        workers:       Process count (default: CPU count). 1 runs in this process.
+        progress:      Called as ``progress(done, total)`` about every 5 %.
+
+    Returns:
+        BatchResult; a failing file is recorded with its error and does not
+        stop the others.
+    """
+    if not hasattr(csv_processing, function_name):
+        raise ValueError(f"Unknown csv_processing function: {function_name}")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    step = max(1, len(jobs) // _PROGRESS_STEPS)
+    outcomes: dict[int, tuple[bool, object]] = {}
+    start = time.perf_counter()
+
+    def _record(index, ok, value):
+        outcomes[index] = (ok, value)
+        done = len(outcomes)
+        if progress is not None and (done % step == 0 or done == len(jobs)):
+            progress(done, len(jobs))
+
+    if workers == 1:
+        for index, (_, kwargs) in enumerate(jobs):
+            try:
+                _record(index, True, _call(function_name, kwargs))
+            except Exception as e:
+                _record(index, False, f"{type(e).__name__}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_call, function_name, kwargs): index for index, (_, kwargs) in enumerate(jobs)}
+            for future in as_completed(futures):
+                try:
+                    _record(futures[future], True, future.result())
+                except Exception as e:
+                    _record(futures[future], False, f"{type(e).__name__}: {e}")
+
+    result = BatchResult(elapsed_s=time.perf_counter() - start)
+    for index, (input_path, _) in enumerate(jobs):
+        ok, value = outcomes[index]
+        (result.succeeded if ok else result.failed).append((input_path, value))
+    logger.info("%s batch: %s", function_name, result.summary())
+    return result
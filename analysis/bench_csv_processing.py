@@ -0,0 +1,265 @@
+"""
+Benchmark the AP CSV engine in analysis.csv_processing on synthetic exports.
+
+Generates AP-style CSV files of --points frequency points and --channels
+channels in a temporary directory, then times every processing entry point:
+
+  octave_smooth                          one dBSPL column, in memory
+  octave_smooth_ap_csv                   X/Y file, every channel
+  split_ap_distortion_csv (+ smooth)     Level & Distortion file, 8 columns per channel
+  merge_ap_distortion_csvs (+ smooth)    two Level & Distortion files
+  filter_reference_by_limits             X/Y reference + mono limits
+  compensate_lr_diff                     stereo RMS + mono diff
+  extract_compensated_lr_diff_combined   two stereo RMS + mono diff
+
+Each case reports the median wall time over --repeat runs, throughput in
+input cells per second and peak traced memory (tracemalloc, one extra run;
+NumPy buffers are included). --save-baseline stores the result as JSON and
+--baseline compares a later run against it; the exit code is 1 when any case
+is slower than the baseline by more than --tolerance.
+
+Usage:
+    python analysis/bench_csv_processing.py --points 20000 --channels 2
+    python analysis/bench_csv_processing.py --points 200000 --channels 16 --repeat 1
+    python analysis/bench_csv_processing.py --save-baseline logs/bench_csv_baseline.json
+    python analysis/bench_csv_processing.py --baseline logs/bench_csv_baseline.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+import numpy as np
+
+from analysis import csv_processing as cp
+from analysis import parse_cache
+
+LAYOUTS = ("distortion", "xy")
+
+
+def write_synthetic_ap_csv(path, points, channels, layout="distortion", seed=0, f_min=20.0, f_max=20000.0):
+    """
+    Write an AP export with *points* log-spaced frequencies per curve.
+
+    ``layout="distortion"`` writes the Level & Distortion layout (F, H2, H3,
+    Total per channel, 8 columns); ``layout="xy"`` one X/Y pair per channel.
+    Levels follow a smooth response plus noise, distortion curves are in %.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}")
+    rng = np.random.default_rng(seed)
+    freqs = np.geomspace(f_min, f_max, points)
+    log_f = np.log10(freqs)
+
+    curves, units, columns = [], [], []
+    for ch in range(channels):
+        response = 90.0 + 4.0 * np.sin(log_f * 3.0 + ch) - 12.0 * (freqs < 40.0) + rng.normal(0.0, 0.5, points)
+        if layout == "xy":
+            curves.append(f"Ch{ch + 1}")
+            units.append("dBSPL")
+            columns.append(response)
+            continue
+        h2 = np.abs(0.3 + 0.2 * np.cos(log_f * 2.0 + ch) + rng.normal(0.0, 0.02, points))
+        h3 = np.abs(0.1 + 0.05 * np.sin(log_f * 5.0) + rng.normal(0.0, 0.01, points))
+        for name, unit, values in (("F", "dBSPL", response), ("H2", "%", h2), ("H3", "%", h3),
+                                   ("Total", "%", np.hypot(h2, h3))):
+            curves.append(f"Ch{ch + 1}({name})")
+            units.append(unit)
+            columns.append(values)
+
+    header = [
+        ["Synthetic " + ("Level And Distortion" if layout == "distortion" else "RMS Level")],
+        [cell for curve in curves for cell in (curve, "")],
+        ["X", "Y"] * len(curves),
+        [cell for unit in units for cell in ("Hz", unit)],
+    ]
+    data = np.empty((points, 2 * len(columns)))
+    data[:, 0::2] = freqs[:, None]
+    data[:, 1::2] = np.column_stack(columns)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(header)
+        csv.writer(f).writerows(data.tolist())
+    return path
+
+
+def _write_mono(path, title, unit, freqs, values):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerows([[title], [title], ["X", "Y"], ["Hz", unit]])
+        writer.writerows(zip(freqs.tolist(), values.tolist()))
+    return path
+
+
+def _cases(tmp_dir, points, channels, seed):
+    """Return [(name, fn, input cells)] for one benchmark configuration."""
+    def path(name):
+        return os.path.join(tmp_dir, name)
+
+    out_dir = path("out")
+    dist_a = write_synthetic_ap_csv(path("dist_a.csv"), points, channels, "distortion", seed)
+    dist_b = write_synthetic_ap_csv(path("dist_b.csv"), points, channels, "distortion", seed + 1)
+    xy = write_synthetic_ap_csv(path("xy.csv"), points, channels, "xy", seed)
+    stereo_a = write_synthetic_ap_csv(path("stereo_a.csv"), points, 2, "xy", seed)
+    stereo_b = write_synthetic_ap_csv(path("stereo_b.csv"), points, 2, "xy", seed + 1)
+
+    # Limits on a coarser, offset grid so filtering interpolates; diff on every 2nd point
+    limit_freqs = np.geomspace(25.0, 18000.0, max(2, points // 10))
+    limits = _write_mono(path("limits.csv"), "Upper Limit", "dB", limit_freqs, 3.0 + np.log10(limit_freqs))
+    diff_freqs = np.geomspace(20.0, 20000.0, points)[::2]
+    diff = _write_mono(path("diff.csv"), "L-R Diff", "dB", diff_freqs, 0.5 * np.sin(np.log10(diff_freqs) * 4.0))
+
+    frequencies = np.geomspace(20.0, 20000.0, points).tolist()
+    levels = (90.0 + 4.0 * np.sin(np.log10(frequencies) * 3.0)).tolist()
+    dist_cells = points * channels * cp._AP_COLS_PER_CHANNEL
+    xy_cells = points * channels * 2
+    stereo_cells = points * 4
+
+    return [
+        ("octave_smooth", lambda: cp.octave_smooth(frequencies, levels, 3), points),
+        ("octave_smooth_ap_csv", lambda: cp.octave_smooth_ap_csv(xy, 3, output_dir=out_dir), xy_cells),
+        ("split_ap_distortion_csv",
+         lambda: cp.split_ap_distortion_csv(dist_a, output_dir=out_dir), dist_cells),
+        ("split_ap_distortion_csv --fraction 3",
+         lambda: cp.split_ap_distortion_csv(dist_a, output_dir=out_dir, fraction=3), dist_cells),
+        ("merge_ap_distortion_csvs",
+         lambda: cp.merge_ap_distortion_csvs([dist_a, dist_b], output_dir=out_dir), 2 * dist_cells),
+        ("merge_ap_distortion_csvs --fraction 3",
+         lambda: cp.merge_ap_distortion_csvs([dist_a, dist_b], output_dir=out_dir, fraction=3), 2 * dist_cells),
+        ("filter_reference_by_limits",
+         lambda: cp.filter_reference_by_limits(xy, limits, output_dir=out_dir), xy_cells),
+        ("compensate_lr_diff",
+         lambda: cp.compensate_lr_diff(stereo_a, diff, path("out/comp.csv")), stereo_cells),
+        ("extract_compensated_lr_diff_combined",
+         lambda: cp.extract_compensated_lr_diff_combined(diff, stereo_a, stereo_b, path("out/lr.csv")),
+         2 * stereo_cells),
+    ]
+
+
+def _peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(points=20000, channels=2, repeat=3, seed=0, only=None):
+    """Run every case (or those whose name contains *only*) and return a result dict."""
+    tmp_dir = tempfile.mkdtemp(prefix="csv_bench_")
+    saved_cache = os.environ.pop(parse_cache.CACHE_DIR_ENV_VAR, None)
+    logging.disable(logging.WARNING)
+    try:
+        cases = {}
+        for name, fn, cells in _cases(tmp_dir, points, channels, seed):
+            if only and only not in name:
+                continue
+            fn()  # warm-up: imports, smoothing window cache, page cache
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - t0)
+            median_s = statistics.median(samples)
+            cases[name] = {
+                "median_ms": round(median_s * 1000.0, 3),
+                "cells": cells,
+                "mcells_per_s": round(cells / median_s / 1e6, 3) if median_s else None,
+                "peak_mib": round(_peak_bytes(fn) / 2**20, 2),
+            }
+    finally:
+        logging.disable(logging.NOTSET)
+        if saved_cache is not None:
+            os.environ[parse_cache.CACHE_DIR_ENV_VAR] = saved_cache
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        "settings": {"points": points, "channels": channels, "repeat": repeat, "seed": seed},
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "machine": platform.node()},
+        "cases": cases,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Return ``{case: time ratio vs baseline}`` and the list of cases slower than 1 + tolerance."""
+    if result["settings"]["points"] != baseline["settings"]["points"] or \
+            result["settings"]["channels"] != baseline["settings"]["channels"]:
+        print("Warning: baseline was recorded with different --points/--channels; ratios are not comparable.")
+    ratios, regressions = {}, []
+    for name, case in result["cases"].items():
+        base = baseline["cases"].get(name)
+        if not base or not base.get("median_ms"):
+            continue
+        ratios[name] = case["median_ms"] / base["median_ms"]
+        if ratios[name] > 1.0 + tolerance:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def _print_report(result, ratios=None):
+    s = result["settings"]
+    print(f"\n{s['points']} points x {s['channels']} channel(s), median of {s['repeat']} run(s)\n")
+    header = f"{'case':<40} {'median ms':>11} {'Mcells/s':>9} {'peak MiB':>9}"
+    if ratios is not None:
+        header += f" {'vs base':>8}"
+    print(header)
+    for name, case in result["cases"].items():
+        line = f"{name:<40} {case['median_ms']:>11.2f} {case['mcells_per_s']:>9.2f} {case['peak_mib']:>9.1f}"
+        if ratios is not None:
+            ratio = ratios.get(name)
+            line += f" {ratio:>7.2f}x" if ratio is not None and math.isfinite(ratio) else f" {'-':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis.csv_processing on synthetic AP exports")
+    parser.add_argument("--points", type=int, default=20000, help="Frequency points per curve (default: 20000)")
+    parser.add_argument("--channels", type=int, default=2, help="Channels per file (default: 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text")
+    parser.add_argument("--json", default=None, help="Also write the result to this JSON file")
+    parser.add_argument("--save-baseline", dest="save_baseline", default=None,
+                        help="Store the result as the baseline JSON")
+    parser.add_argument("--baseline", default=None, help="Compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline before exit code 1 (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+    if args.points < 2 or args.channels < 1 or args.repeat < 1:
+        parser.error("--points must be >= 2, --channels and --repeat >= 1")
+
+    result = run(args.points, args.channels, args.repeat, args.seed, args.only)
+
+    ratios, regressions = None, []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            ratios, regressions = compare(result, json.load(f), args.tolerance)
+    _print_report(result, ratios)
+
+    for target in (args.json, args.save_baseline):
+        if target:
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+
+    if regressions:
+        print(f"\nSlower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,16 @@ import csv
 import logging
 import math
 import os
-from itertools import chain
-from typing import Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional, Union
 
 try:
     import numpy as np
+    from . import parse_cache
+    from .smoothing import StreamingOctaveSmoother, octave_smooth_matrix
     NUMPY_AVAILABLE = True
 except ImportError:
     NUMPY_AVAILABLE = False
@@ -20,17 +25,13 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-def _write_rows_with_fallback(output_path: str, rows: Iterable[list[str]]) -> str:
-    """Write CSV rows and gracefully handle locked target files by using a fallback name."""
+def _open_output_with_fallback(output_path: str):
+    """Open a CSV for writing; if the target is locked, open the first free ``<base>_<n><ext>``."""
     if os.path.isdir(output_path):
         raise IsADirectoryError(f"Output path points to a directory, not a file: {output_path}")
 
     try:
-        with open(output_path, "w", newline="", encoding="utf-8") as output_file:
-            writer = csv.writer(output_file)
-            for row in rows:
-                writer.writerow(row)
-        return output_path
+        return open(output_path, "w", newline="", encoding="utf-8"), output_path
     except PermissionError as exc:
         base, ext = os.path.splitext(output_path)
         for index in range(1, 100):
@@ -39,11 +40,7 @@ def _write_rows_with_fallback(output_path: str, rows: Iterable[list[str]]) -> st
                 continue
 
             try:
-                with open(fallback_path, "x", newline="", encoding="utf-8") as output_file:
-                    writer = csv.writer(output_file)
-                    for row in rows:
-                        writer.writerow(row)
-                return fallback_path
+                return open(fallback_path, "x", newline="", encoding="utf-8"), fallback_path
             except PermissionError:
                 continue
 
@@ -52,6 +49,16 @@ def _write_rows_with_fallback(output_path: str, rows: Iterable[list[str]]) -> st
         ) from exc
 
 
+def _write_rows_with_fallback(output_path: str, rows: Iterable[list[str]]) -> str:
+    """Write CSV rows and gracefully handle locked target files by using a fallback name."""
+    output_file, written_path = _open_output_with_fallback(output_path)
+    with output_file:
+        writer = csv.writer(output_file)
+        for row in rows:
+            writer.writerow(row)
+    return written_path
+
+
 def extract_csv_columns(
     input_path: str,
     columns: Iterable[int],
@@ -111,7 +118,9 @@ def octave_smooth(
     Apply 1/n-octave smoothing to frequency-domain data.
 
     Smoothing is performed in the linear amplitude domain (Pa) to be
-    physically correct, then converted back to dB.
+    physically correct, then converted back to dB. With NumPy available the
+    shared prefix-sum kernel in ``analysis.smoothing`` is used (O(n log n));
+    otherwise every window is summed directly.
 
     For each output point at frequency f the window covers:
         [f / 2^(1 / (2*fraction)),  f * 2^(1 / (2*fraction))]
@@ -130,11 +139,15 @@ def octave_smooth(
     """
     if len(frequencies) != len(values_db):
         raise ValueError("frequencies and values_db must have the same length.")
-    if not frequencies:
+    if len(frequencies) == 0:
         raise ValueError("Input arrays must not be empty.")
     if fraction < 1:
         raise ValueError("fraction must be >= 1.")
 
+    if NUMPY_AVAILABLE:
+        return _smooth_db_block(np.asarray(frequencies, dtype=float), np.asarray(values_db, dtype=float),
+                                fraction).tolist()
+
     # dBSPL → linear pressure (Pa): p = 10^(dBSPL / 20)
     linear = [10.0 ** (db / 20.0) for db in values_db]
 
@@ -156,6 +169,504 @@ def octave_smooth(
 
 
 _AP_NUM_HEADER_ROWS = 4
+_AP_DISTORTION_METRICS = ["F", "H2", "H3", "Total"]
+_AP_COLS_PER_CURVE = 2
+_AP_CURVES_PER_CHANNEL = 4
+_AP_COLS_PER_CHANNEL = _AP_COLS_PER_CURVE * _AP_CURVES_PER_CHANNEL  # 8
+
+
+@dataclass
+class APCsvData:
+    """
+    An AP measurement CSV parsed column-wise by :func:`read_ap_csv`.
+
+    Attributes:
+        path:        Source file path.
+        header_rows: Raw cells of the header rows (name, curves, X/Y roles, units).
+        data:        float64 array of shape (rows, columns); empty or
+                     non-numeric cells are NaN.
+        text_rows:   Raw data cells per row, only with ``keep_text=True``.
+    """
+
+    path: str
+    header_rows: list[list[str]]
+    data: "np.ndarray"
+    text_rows: Optional[list[list[str]]] = None
+
+    def _header_row(self, index: int) -> list[str]:
+        return self.header_rows[index] if index < len(self.header_rows) else []
+
+    @property
+    def num_columns(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def title(self) -> str:
+        """Measurement name from Row 1."""
+        row = self._header_row(0)
+        return row[0].strip() if row else ""
+
+    @property
+    def curve_names(self) -> list[str]:
+        """Non-empty curve descriptions from Row 2, one per X/Y pair."""
+        return [cell.strip() for cell in self._header_row(1) if cell.strip()]
+
+    @property
+    def units(self) -> list[str]:
+        """Unit cell per column from the last header row ("" where missing)."""
+        row = self._header_row(len(self.header_rows) - 1)
+        return [row[i].strip() if i < len(row) else "" for i in range(self.num_columns)]
+
+    @property
+    def column_names(self) -> list[str]:
+        """Name per column: "<curve> X" / "<curve> Y" (curve from Row 2, role from Row 3)."""
+        curves = self._header_row(1)
+        roles = self._header_row(2)
+        names = []
+        for col in range(self.num_columns):
+            x_col = col - col % _AP_COLS_PER_CURVE
+            curve = curves[x_col].strip() if x_col < len(curves) else ""
+            role = roles[col].strip() if col < len(roles) and roles[col].strip() else ("X", "Y")[col % 2]
+            names.append(f"{curve or f'Col {x_col // 2 + 1}'} {role}")
+        return names
+
+    @property
+    def num_channels(self) -> Optional[int]:
+        """Channel count of a Level & Distortion export (4 curves per channel), else None."""
+        num_curves = len(self.curve_names)
+        if num_curves == 0 or num_curves % _AP_CURVES_PER_CHANNEL != 0:
+            return None
+        return num_curves // _AP_CURVES_PER_CHANNEL
+
+    def __getitem__(self, key) -> "np.ndarray":
+        """Column by index or by name from :attr:`column_names`."""
+        if isinstance(key, str):
+            key = self.column_names.index(key)
+        return self.data[:, key]
+
+    def pair(self, index: int) -> tuple:
+        """(x, y) column arrays of the *index*-th X/Y pair."""
+        x_col = index * _AP_COLS_PER_CURVE
+        return self.data[:, x_col], self.data[:, x_col + 1]
+
+    def metric_columns(self, metric: str) -> list[int]:
+        """
+        X/Y column indices of *metric* (one of F, H2, H3, Total) across all channels.
+
+        Raises:
+            ValueError: If Row 2 does not hold a multiple of 4 curves.
+        """
+        num_channels = self.num_channels
+        if num_channels is None:
+            raise ValueError(
+                f"Expected a multiple of {_AP_CURVES_PER_CHANNEL} curves in Row 2, "
+                f"got {len(self.curve_names)}: {self.curve_names}"
+            )
+        metric_index = _AP_DISTORTION_METRICS.index(metric)
+        columns: list[int] = []
+        for ch in range(num_channels):
+            base_col = ch * _AP_COLS_PER_CHANNEL + metric_index * _AP_COLS_PER_CURVE
+            columns.extend([base_col, base_col + 1])
+        return columns
+
+
+def _cell_to_float(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return math.nan
+
+
+def _text_rows_to_array(rows: list[list[str]], width: Optional[int] = None) -> "np.ndarray":
+    """Convert CSV cell rows to a float64 array; short rows are padded, bad cells become NaN."""
+    if width is None:
+        width = max((len(row) for row in rows), default=0)
+    if all(len(row) == width for row in rows):
+        try:
+            return np.array(rows, dtype=float).reshape(len(rows), width)
+        except ValueError:
+            pass
+    data = np.full((len(rows), width), np.nan)
+    for row_idx, row in enumerate(rows):
+        data[row_idx, :len(row)] = [_cell_to_float(cell) for cell in row[:width]]
+    return data
+
+
+def _find_units_row(lines: list[str]) -> int:
+    for index, line in enumerate(lines):
+        if "Hz" in line and "dB" in line:
+            return index
+    raise ValueError("No units header (Hz,dB...) found")
+
+
+# Tried in order. APx exports are UTF-8; older ones write cp1252 labels (µ, °).
+# latin-1 maps every byte, so it is the last resort for bytes cp1252 leaves undefined.
+_AP_CSV_ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+
+
+def _decode_ap_csv(raw: bytes) -> str:
+    for encoding in _AP_CSV_ENCODINGS[:-1]:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode(_AP_CSV_ENCODINGS[-1])
+
+
+def read_ap_csv(
+    input_path: str,
+    header_rows: Optional[int] = _AP_NUM_HEADER_ROWS,
+    keep_text: bool = False,
+) -> APCsvData:
+    """
+    Read an AP measurement CSV into float64 column arrays in one pass.
+
+    Blank lines are ignored. Well-formed numeric blocks are parsed by
+    NumPy's C reader; ragged rows, empty cells or text fall back to a
+    per-cell parse, padding short rows and mapping bad cells to NaN.
+    The file is decoded as UTF-8, falling back to cp1252 and then latin-1
+    for the whole file if it is not valid UTF-8, so header bytes are never
+    dropped.
+
+    With ``ADAM_CSV_CACHE_DIR`` set, the parse result is cached on disk
+    (see ``analysis.parse_cache``) unless *keep_text* is requested.
+
+    Args:
+        input_path:  Path to the AP CSV file.
+        header_rows: Number of header rows (default 4). ``None`` ends the
+                     header at the first row containing "Hz" and "dB"
+                     (non-standard exports).
+        keep_text:   Also return the raw data cells in ``text_rows``.
+
+    Returns:
+        APCsvData with the header rows and a (rows, columns) float64 array.
+
+    Raises:
+        FileNotFoundError: If input_path does not exist.
+        ValueError:        If the file has no data rows after the header.
+        RuntimeError:      If numpy is not installed.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for read_ap_csv")
+    if not input_path or not os.path.isfile(input_path):
+        raise FileNotFoundError(f"Input CSV not found: {input_path}")
+
+    with open(input_path, "rb") as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+
+    use_cache = not keep_text and parse_cache.cache_dir() is not None
+    if use_cache:
+        raw_hash = parse_cache.content_hash(raw)
+        options = f"header_rows={header_rows}"
+        cached = parse_cache.load(input_path, stat, raw_hash, options)
+        if cached is not None:
+            header, data = cached
+            return APCsvData(path=input_path, header_rows=header, data=data)
+
+    text = _decode_ap_csv(raw)
+    lines = list(filter(str.strip, text.splitlines()))
+
+    num_header = _find_units_row(lines) + 1 if header_rows is None else header_rows
+    header = list(csv.reader(lines[:num_header]))
+    data_lines = lines[num_header:]
+    if not data_lines:
+        raise ValueError(f"Input CSV has no data rows after the header: {input_path}")
+
+    text_rows = list(csv.reader(data_lines)) if keep_text else None
+    try:
+        data = np.loadtxt(data_lines, delimiter=",", dtype=float, ndmin=2, comments=None, quotechar='"')
+    except ValueError:
+        data = _text_rows_to_array(text_rows if text_rows is not None else list(csv.reader(data_lines)))
+
+    if use_cache:
+        parse_cache.store(input_path, stat, raw_hash, options, header, data)
+    return APCsvData(path=input_path, header_rows=header, data=data, text_rows=text_rows)
+
+
+_STREAM_CHUNK_ROWS = 1 << 16
+
+
+def read_ap_csv_chunks(
+    input_path: str,
+    header_rows: Optional[int] = _AP_NUM_HEADER_ROWS,
+    chunk_rows: int = _STREAM_CHUNK_ROWS,
+) -> tuple[list[list[str]], Iterator["np.ndarray"]]:
+    """
+    Read an AP measurement CSV in blocks of at most *chunk_rows* data rows.
+
+    The bounded-memory counterpart of :func:`read_ap_csv` for very long
+    exports. A first pass reads the header and the widest row, so every
+    block has the same columns as ``read_ap_csv(...).data`` and their
+    concatenation equals it. The first pass also picks the encoding the
+    same way as :func:`read_ap_csv`. The parse cache is not used.
+
+    Returns:
+        (header rows, iterator of float64 blocks of shape (rows, columns)).
+
+    Raises:
+        FileNotFoundError: If input_path does not exist.
+        ValueError:        If the file has no data rows after the header or chunk_rows < 1.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for read_ap_csv_chunks")
+    if not input_path or not os.path.isfile(input_path):
+        raise FileNotFoundError(f"Input CSV not found: {input_path}")
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1.")
+
+    def _lines(f):
+        return (line for line in f if line.strip())
+
+    def _first_pass(encoding):
+        with open(input_path, "r", encoding=encoding) as f:
+            lines = _lines(f)
+            if header_rows is None:
+                header_lines = []
+                for line in lines:
+                    header_lines.append(line)
+                    if "Hz" in line and "dB" in line:
+                        break
+                else:
+                    raise ValueError("No units header (Hz,dB...) found")
+            else:
+                header_lines = list(islice(lines, header_rows))
+            return header_lines, max((len(row) for row in csv.reader(lines)), default=None)
+
+    # The first pass decodes the whole file, so the encoding it accepts also holds for _blocks.
+    for encoding in _AP_CSV_ENCODINGS:
+        try:
+            header_lines, width = _first_pass(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    if width is None:
+        raise ValueError(f"Input CSV has no data rows after the header: {input_path}")
+    header = list(csv.reader(header_lines))
+
+    def _blocks():
+        with open(input_path, "r", encoding=encoding) as f:
+            lines = _lines(f)
+            for _ in islice(lines, len(header_lines)):
+                pass
+            while True:
+                block_lines = list(islice(lines, chunk_rows))
+                if not block_lines:
+                    return
+                try:
+                    block = np.loadtxt(block_lines, delimiter=",", dtype=float, ndmin=2, comments=None, quotechar='"')
+                except ValueError:
+                    block = _text_rows_to_array(list(csv.reader(block_lines)), width)
+                if block.shape[1] < width:
+                    block = np.hstack([block, np.full((block.shape[0], width - block.shape[1]), np.nan)])
+                yield block
+
+    return header, _blocks()
+
+
+_WRITE_CHUNK_CELLS = 1 << 18
+
+
+def _format_numeric_block(data: "np.ndarray", precision: Optional[int] = None) -> str:
+    """
+    Format a 2-D float block as CSV text with ``\r\n`` line endings (as ``csv.writer``).
+
+    The whole block goes through a single ``%`` format. ``precision=None`` gives
+    ``repr`` (shortest round-trip) cells, an int gives ``%.<precision>g``. NaN
+    cells are written empty.
+    """
+    rows, cols = data.shape
+    if rows == 0 or cols == 0:
+        return "\r\n" * rows
+    cell = "%r" if precision is None else f"%.{int(precision)}g"
+    line = ",".join([cell] * cols) + "\r\n"
+    # Finite numbers never contain "nan", so the only matches are NaN cells
+    return ((line * rows) % tuple(data.ravel().tolist())).replace("nan", "")
+
+
+def write_ap_csv(
+    output_path: str,
+    data,
+    header_rows: Optional[Iterable[list[str]]] = None,
+    precision: Optional[int] = None,
+) -> str:
+    """
+    Write a numeric block as an AP-style CSV.
+
+    Header rows are written as-is through ``csv.writer``; the data block is
+    formatted in chunks of whole rows and written through the same handle.
+    A locked target falls back to ``<base>_<n><ext>`` like every other writer.
+
+    Args:
+        output_path: Destination CSV path.
+        data:        2-D array-like of floats (rows, columns). NaN is written empty.
+        header_rows: Rows written before the data (e.g. ``APCsvData.header_rows``).
+        precision:   Significant digits (``%.<precision>g``). ``None`` writes the
+                     shortest text that round-trips the float (``repr``).
+
+    Returns:
+        The actual written path.
+    """
+    block = np.asarray(data, dtype=float)
+    if block.ndim != 2:
+        raise ValueError("data must be a 2-D array of shape (rows, columns).")
+    if precision is not None and precision < 1:
+        raise ValueError("precision must be >= 1.")
+
+    output_file, written_path = _open_output_with_fallback(output_path)
+    with output_file:
+        if header_rows:
+            csv.writer(output_file).writerows(header_rows)
+        _write_numeric_rows(output_file, block, precision)
+    return written_path
+
+
+# Smoothing blocks at least this large are split by columns across threads;
+# NumPy releases the GIL in the power / cumsum / log10 kernels.
+_PARALLEL_SMOOTH_MIN_CELLS = 1 << 20
+
+
+def _smooth_db_block(frequencies: "np.ndarray", values_db: "np.ndarray", fraction: int) -> "np.ndarray":
+    """:func:`octave_smooth` for an (n, columns) dB block on one frequency grid."""
+    linear = 10.0 ** (values_db / 20.0)
+    return 20.0 * np.log10(octave_smooth_matrix(frequencies, linear, fraction))
+
+
+def _smooth_ap_data(data: "np.ndarray", fraction: int, workers: Optional[int] = None) -> "np.ndarray":
+    """
+    Smooth every Y column of an AP data block.
+
+    X cols = even indices (0, 2, …), Y cols = odd (1, 3, …); each Y uses the X
+    before it. Rows with a missing X or Y are NaN (written empty) in that Y column.
+
+    Y columns with the same X values and the same missing rows (usually every
+    column of an export) are smoothed as one 2-D block. Blocks of at least
+    ``_PARALLEL_SMOOTH_MIN_CELLS`` are split by columns over *workers* threads
+    (default: CPU count). Results are identical to smoothing column by column.
+    """
+    smoothed_columns = data.copy()
+    groups: dict[tuple, tuple] = {}
+    for col_idx in range(1, data.shape[1], 2):
+        frequencies = data[:, col_idx - 1]
+        valid = ~(np.isnan(frequencies) | np.isnan(data[:, col_idx]))
+        if not valid.any():
+            continue
+        smoothed_columns[~valid, col_idx] = np.nan
+        valid_freqs = frequencies[valid]
+        key = (valid.tobytes(), valid_freqs.tobytes())
+        groups.setdefault(key, (valid, valid_freqs, []))[2].append(col_idx)
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    tasks = []
+    for valid, valid_freqs, columns in groups.values():
+        parts = 1
+        if workers > 1 and len(valid_freqs) * len(columns) >= _PARALLEL_SMOOTH_MIN_CELLS:
+            parts = min(workers, len(columns))
+        tasks.extend((valid, valid_freqs, chunk) for chunk in np.array_split(columns, parts))
+
+    def _run(task):
+        valid, valid_freqs, columns = task
+        rows = np.flatnonzero(valid)
+        smoothed_columns[np.ix_(rows, columns)] = _smooth_db_block(
+            valid_freqs, data[np.ix_(rows, columns)], fraction
+        )
+
+    if len(tasks) > 1 and workers > 1 and data.size >= _PARALLEL_SMOOTH_MIN_CELLS:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            list(pool.map(_run, tasks))
+    else:
+        for task in tasks:
+            _run(task)
+    return smoothed_columns
+
+
+class _StreamingAPSmoother:
+    """
+    :func:`_smooth_ap_data` for an AP data block that arrives in row chunks.
+
+    Each Y column feeds its valid points to a :class:`StreamingOctaveSmoother`;
+    ``feed`` returns the rows for which every column has its smoothed value,
+    ``finish`` the remaining rows. A Y column that never has a valid point is
+    copied unchanged, as in memory, so rows wait until each column has seen one.
+
+    Raises (from ``feed``):
+        ValueError: If a frequency column is not positive and ascending.
+    """
+
+    def __init__(self, fraction: int, width: int):
+        self._y_cols = list(range(1, width, 2))
+        self._smoothers = [StreamingOctaveSmoother(fraction) for _ in self._y_cols]
+        self._pending = np.empty((0, width))
+        self._pending_valid = np.empty((0, len(self._y_cols)), dtype=bool)
+        self._smoothed = [np.empty(0) for _ in self._y_cols]
+        self._seen_valid = [False] * len(self._y_cols)
+
+    def feed(self, block: "np.ndarray") -> "np.ndarray":
+        y_cols = self._y_cols
+        valid = ~(np.isnan(block[:, [col - 1 for col in y_cols]]) | np.isnan(block[:, y_cols]))
+        for k, col in enumerate(y_cols):
+            rows = valid[:, k]
+            self._seen_valid[k] = self._seen_valid[k] or bool(rows.any())
+            out = self._smoothers[k].feed(block[rows, col - 1], 10.0 ** (block[rows, col] / 20.0))
+            self._smoothed[k] = np.concatenate((self._smoothed[k], out))
+        self._pending = np.concatenate((self._pending, block))
+        self._pending_valid = np.concatenate((self._pending_valid, valid))
+        return self._emit(final=False)
+
+    def finish(self) -> "np.ndarray":
+        for k, smoother in enumerate(self._smoothers):
+            self._smoothed[k] = np.concatenate((self._smoothed[k], smoother.finish()))
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> "np.ndarray":
+        pending, pending_valid, smoothed = self._pending, self._pending_valid, self._smoothed
+        ready = len(pending)
+        for k in range(len(self._y_cols)):
+            if not self._seen_valid[k] and not final:
+                ready = 0
+            elif self._seen_valid[k]:
+                done = np.cumsum(pending_valid[:, k])
+                ready = min(ready, int(np.searchsorted(done, len(smoothed[k]), side="right")))
+
+        out_block = pending[:ready].copy()
+        for k, col in enumerate(self._y_cols):
+            if not self._seen_valid[k]:
+                continue
+            rows = pending_valid[:ready, k]
+            count = int(np.count_nonzero(rows))
+            out_block[:, col] = np.nan
+            out_block[rows, col] = 20.0 * np.log10(smoothed[k][:count])
+            smoothed[k] = smoothed[k][count:]
+        self._pending = pending[ready:]
+        self._pending_valid = pending_valid[ready:]
+        return out_block
+
+
+def _write_numeric_rows(output_file, data: "np.ndarray", precision: Optional[int] = None) -> None:
+    """Write a float block to an open CSV file in chunks of whole rows (see :func:`write_ap_csv`)."""
+    chunk_rows = max(1, _WRITE_CHUNK_CELLS // max(1, data.shape[1]))
+    for start in range(0, data.shape[0], chunk_rows):
+        output_file.write(_format_numeric_block(data[start:start + chunk_rows], precision))
+
+
+def _stream_smooth_ap_csv(input_path: str, fraction: int, output_path: str, chunk_rows: int) -> str:
+    """Chunked :func:`octave_smooth_ap_csv`: same output bytes, bounded memory."""
+    header, blocks = read_ap_csv_chunks(input_path, chunk_rows=chunk_rows)
+    smoother = None
+    output_file, written_path = _open_output_with_fallback(output_path)
+    try:
+        with output_file:
+            csv.writer(output_file).writerows(header)
+            for block in blocks:
+                if smoother is None:
+                    smoother = _StreamingAPSmoother(fraction, block.shape[1])
+                _write_numeric_rows(output_file, smoother.feed(block))
+            if smoother is not None:
+                _write_numeric_rows(output_file, smoother.finish())
+    except Exception:
+        os.remove(written_path)
+        raise
+    return written_path
 
 
 def octave_smooth_ap_csv(
@@ -163,6 +674,7 @@ def octave_smooth_ap_csv(
     fraction: int = 3,
     output_filename: Optional[str] = None,
     output_dir: Optional[str] = None,
+    chunk_rows: Optional[int] = None,
 ) -> str:
     """
     Apply 1/n-octave smoothing to all Y columns in an AP measurement CSV.
@@ -176,97 +688,141 @@ def octave_smooth_ap_csv(
         output_filename: Output filename. Defaults to
                          ``<stem>_smooth<fraction>.csv``.
         output_dir:      Output directory. Defaults to the input file's directory.
+        chunk_rows:      Stream the file in blocks of this many rows instead of
+                         reading it whole. The output is byte-identical; memory
+                         is bounded by one block plus the widest smoothing
+                         window. Needs positive, ascending frequencies.
 
     Returns:
         Path to the written CSV file.
 
     Raises:
         FileNotFoundError: If input_path does not exist.
-        ValueError:        If fraction < 1 or the file has no data rows.
+        ValueError:        If fraction < 1 or the file has no data rows, or in
+                           streaming mode a frequency column is not ascending.
     """
     if not input_path or not os.path.isfile(input_path):
         raise FileNotFoundError(f"Input CSV not found: {input_path}")
     if fraction < 1:
         raise ValueError("fraction must be >= 1.")
 
-    with open(input_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        all_rows = list(reader)
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    if output_filename is None:
+        output_filename = f"{base_name}_smooth{fraction}.csv"
+
+    output_base = output_dir if output_dir else os.path.dirname(os.path.abspath(input_path))
+    os.makedirs(output_base, exist_ok=True)
+    output_path = os.path.join(output_base, output_filename)
+
+    if chunk_rows is not None:
+        return _stream_smooth_ap_csv(input_path, fraction, output_path, chunk_rows)
 
-    if len(all_rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError("Input CSV has no data rows after the header.")
+    table = read_ap_csv(input_path)
+    smoothed = _smooth_ap_data(table.data, fraction)
+    return write_ap_csv(output_path, smoothed, header_rows=table.header_rows)
 
-    header_rows = all_rows[:_AP_NUM_HEADER_ROWS]
-    data_rows = all_rows[_AP_NUM_HEADER_ROWS:]
 
-    num_cols = max(len(row) for row in data_rows)
+def _select_columns(table: APCsvData, columns: list[int]) -> "np.ndarray":
+    """Columns of ``table.data``; columns beyond its width are NaN."""
+    data = table.data
+    if columns and max(columns) >= data.shape[1]:
+        data = np.hstack([data, np.full((data.shape[0], max(columns) + 1 - data.shape[1]), np.nan)])
+    return data[:, columns]
 
-    # Parse all columns; X cols = even indices (0, 2, …), Y cols = odd (1, 3, …)
-    columns: list[list[float]] = []
-    for col_idx in range(num_cols):
-        col_values: list[float] = []
-        for row in data_rows:
-            raw = row[col_idx].strip() if col_idx < len(row) else ""
-            try:
-                col_values.append(float(raw))
-            except ValueError:
-                col_values.append(float("nan"))
-        columns.append(col_values)
-
-    # Extract X columns (frequencies) to find the right X for each Y
-    # Y columns are at odd indices; the corresponding X is at index - 1
-    smoothed_columns = list(columns)  # shallow copy, we'll replace Y cols
-    for col_idx in range(1, num_cols, 2):  # odd = Y
-        x_idx = col_idx - 1
-        frequencies = columns[x_idx]
-        values_db = columns[col_idx]
-
-        # Filter out NaN pairs before smoothing
-        valid_pairs = [
-            (f, v)
-            for f, v in zip(frequencies, values_db)
-            if not (math.isnan(f) or math.isnan(v))
-        ]
-        if not valid_pairs:
-            continue
-        valid_freqs, valid_vals = zip(*valid_pairs)
-        smoothed = octave_smooth(list(valid_freqs), list(valid_vals), fraction)
-
-        # Put smoothed values back (NaN positions remain NaN)
-        smoothed_iter = iter(smoothed)
-        new_col: list[float] = []
-        for v in values_db:
-            if math.isnan(v):
-                new_col.append(float("nan"))
-            else:
-                new_col.append(next(smoothed_iter))
-        smoothed_columns[col_idx] = new_col
 
-    # Rebuild rows
-    def _fmt(v: float) -> str:
-        return "" if math.isnan(v) else repr(v)
+def _header_columns(row: list[str], columns: list[int]) -> list[str]:
+    return [row[c] if c < len(row) else "" for c in columns]
 
-    smoothed_data_rows = [
-        [_fmt(smoothed_columns[col_idx][row_idx]) for col_idx in range(num_cols)]
-        for row_idx in range(len(data_rows))
-    ]
 
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
-    if output_filename is None:
-        output_filename = f"{base_name}_smooth{fraction}.csv"
+def split_table(table: APCsvData) -> dict[str, APCsvData]:
+    """
+    Split a parsed Level & Distortion table into one table per metric.
 
-    output_base = output_dir if output_dir else os.path.dirname(os.path.abspath(input_path))
-    os.makedirs(output_base, exist_ok=True)
-    output_path = os.path.join(output_base, output_filename)
+    The in-memory form of :func:`split_ap_distortion_csv`: Row 1 is reduced
+    to its first cell, Rows 2-4 and the data keep the metric's X/Y columns of
+    every channel.
 
-    all_output_rows = header_rows + smoothed_data_rows
-    return _write_rows_with_fallback(output_path, all_output_rows)
+    Returns:
+        ``{"F": table, "H2": table, "H3": table, "Total": table}``
 
+    Raises:
+        ValueError: If Row 2 does not hold a multiple of 4 curves.
+    """
+    results = {}
+    for metric in _AP_DISTORTION_METRICS:
+        columns = table.metric_columns(metric)
+        first_row = table.header_rows[0] if table.header_rows else []
+        header = [[first_row[0] if first_row else ""] + ["" for _ in columns[1:]]]
+        header += [_header_columns(row, columns) for row in table.header_rows[1:]]
+        results[metric] = APCsvData(path=table.path, header_rows=header, data=_select_columns(table, columns))
+    return results
 
-_AP_DISTORTION_METRICS = ["F", "H2", "H3", "Total"]
-_AP_COLS_PER_CURVE = 2
-_AP_CURVES_PER_CHANNEL = 4
-_AP_COLS_PER_CHANNEL = _AP_COLS_PER_CURVE * _AP_CURVES_PER_CHANNEL  # 8
+
+def _aligned_indices(blocks: list["np.ndarray"]) -> list["np.ndarray"]:
+    """
+    Row index per block for every output row (-1 where a block has no point),
+    using the same frequency alignment as :func:`merge_ap_distortion_csvs`.
+    """
+    first = blocks[0][:, 0]
+    if all(len(b) == len(first) and np.array_equal(b[:, 0], first, equal_nan=True) for b in blocks):
+        return [np.arange(len(first))] * len(blocks)
+
+    # One [frequency, row] entry per point; only the first item is used for alignment
+    readers = [iter([[f, i] for i, f in enumerate(b[:, 0].tolist())]) for b in blocks]
+    parts = list(_frequency_aligned_rows(readers))
+    return [np.array([p[1] if p is not None else -1 for p in column], dtype=np.intp)
+            for column in zip(*parts)]
+
+
+def merge_tables(tables: list[APCsvData]) -> dict[str, APCsvData]:
+    """
+    Merge parsed Level & Distortion tables into one table per metric.
+
+    The in-memory form of :func:`merge_ap_distortion_csvs`: the metric
+    columns of all inputs side by side, rows aligned on frequency the same way.
+
+    Returns:
+        ``{"F": table, "H2": table, "H3": table, "Total": table}``
+
+    Raises:
+        ValueError: If fewer than 2 tables are given or a Row 2 curve count
+                    is not a multiple of 4.
+    """
+    if len(tables) < 2:
+        raise ValueError("merge needs at least 2 inputs.")
+    indices = _aligned_indices([t.data for t in tables])
+    num_header_rows = max(len(t.header_rows) for t in tables)
+
+    results = {}
+    for metric in _AP_DISTORTION_METRICS:
+        columns = [t.metric_columns(metric) for t in tables]
+        header = []
+        for i in range(num_header_rows):
+            row: list[str] = []
+            for table, cols in zip(tables, columns):
+                source = table.header_rows[i] if i < len(table.header_rows) else []
+                row.extend(_header_columns(source, cols))
+            header.append(row)
+
+        blocks = []
+        for table, cols, index in zip(tables, columns, indices):
+            block = _select_columns(table, cols)[np.maximum(index, 0)]
+            block[index < 0] = np.nan
+            blocks.append(block)
+        results[metric] = APCsvData(path=tables[0].path, header_rows=header, data=np.hstack(blocks))
+    return results
+
+
+def smooth_table(table: APCsvData, fraction: int) -> APCsvData:
+    """
+    1/n-octave smooth every Y column of a parsed table (:func:`octave_smooth_ap_csv` in memory).
+
+    Raises:
+        ValueError: If fraction < 1.
+    """
+    if fraction < 1:
+        raise ValueError("fraction must be >= 1.")
+    return APCsvData(path=table.path, header_rows=table.header_rows, data=_smooth_ap_data(table.data, fraction))
 
 
 def split_ap_distortion_csv(
@@ -289,13 +845,15 @@ def split_ap_distortion_csv(
       F (cols 0-1), H2 (cols 2-3), H3 (cols 4-5), Total (cols 6-7)
 
     Detects the number of channels automatically from the non-empty entries
-    in Row 2 (must be a multiple of 4).
+    in Row 2 (must be a multiple of 4). Data cells are written by
+    :func:`write_ap_csv` (missing or non-numeric cells empty), the same bytes
+    a pipeline ``split`` + ``write`` produces.
 
     Args:
         input_path:    Path to the source AP measurement CSV file.
         output_dir:    Output directory. Defaults to the input file's directory.
-        fraction:      If provided, applies 1/n-octave smoothing to every output
-                       file after extraction (e.g. 3 for 1/3 octave).
+        fraction:      If provided, applies 1/n-octave smoothing to every metric
+                       before it is written (e.g. 3 for 1/3 octave).
                        If None (default), no smoothing is applied.
         output_prefix: Base name for output files. Defaults to the input file stem.
 
@@ -306,52 +864,88 @@ def split_ap_distortion_csv(
     Raises:
         FileNotFoundError: If input_path does not exist.
         ValueError: If the curve count in Row 2 is not a multiple of 4,
-                    or fraction < 1 when provided.
+                    the file has no data rows, or fraction < 1 when provided.
     """
     if not input_path or not os.path.isfile(input_path):
         raise FileNotFoundError(f"Input CSV not found: {input_path}")
     if fraction is not None and fraction < 1:
         raise ValueError("fraction must be >= 1.")
 
-    # Detect channel count from Row 2
-    with open(input_path, "r", newline="", encoding="utf-8") as source_file:
-        reader = csv.reader(source_file)
-        next(reader, None)  # skip Row 1 (measurement name)
-        header_row = next(reader, [])
-
-    curve_names = [cell.strip() for cell in header_row if cell.strip()]
-    num_curves = len(curve_names)
-    if num_curves == 0 or num_curves % _AP_CURVES_PER_CHANNEL != 0:
-        raise ValueError(
-            f"Expected a multiple of {_AP_CURVES_PER_CHANNEL} curves in Row 2, "
-            f"got {num_curves}: {curve_names}"
-        )
-    num_channels = num_curves // _AP_CURVES_PER_CHANNEL
+    # Parse the source once; every metric file is cut from the same table
+    parts = split_table(read_ap_csv(input_path, header_rows=_AP_NUM_HEADER_ROWS))
 
     base_name = output_prefix if output_prefix else os.path.splitext(os.path.basename(input_path))[0]
+    output_base = output_dir if output_dir else os.path.dirname(os.path.abspath(input_path))
+    os.makedirs(output_base, exist_ok=True)
 
     results: dict[str, str] = {}
-    for metric_index, metric in enumerate(_AP_DISTORTION_METRICS):
-        # Collect X/Y column pairs for this metric across all channels
-        columns: list[int] = []
-        for ch in range(num_channels):
-            base_col = ch * _AP_COLS_PER_CHANNEL + metric_index * _AP_COLS_PER_CURVE
-            columns.extend([base_col, base_col + 1])
-
-        output_filename = f"{base_name}_{metric}.csv"
-        written_path = extract_csv_columns(input_path, columns, output_filename, output_dir)
+    for metric, part in parts.items():
         if fraction is not None:
-            written_path = octave_smooth_ap_csv(
-                input_path=written_path,
-                fraction=fraction,
-                output_filename=output_filename,  # overwrite same file
-                output_dir=output_dir,
-            )
-        results[metric] = written_path
+            part = smooth_table(part, fraction)
+        output_path = os.path.join(output_base, f"{base_name}_{metric}.csv")
+        results[metric] = write_ap_csv(output_path, part.data, header_rows=part.header_rows)
 
     return results
 
 
+_MERGE_CHUNK_ROWS = 4096
+_MERGE_FREQ_REL_TOL = 1e-6
+
+
+def _chunked(iterable: Iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _frequency_aligned_rows(readers: list) -> Iterator[list[Optional[list[str]]]]:
+    """
+    Yield one list per output row holding each reader's row, or None where
+    that input has no point at this frequency.
+
+    Rows are keyed by the frequency in their first cell. While all inputs
+    agree (the usual case: one sweep setup) rows are paired line by line.
+    When they differ, the input whose frequency is closest to the previously
+    emitted one goes first, which keeps ascending and descending sweeps in
+    order. Rows without a numeric first cell pair with whatever comes next;
+    exhausted inputs contribute None.
+    """
+    heads = [next(reader, None) for reader in readers]
+    previous = None
+    while any(head is not None for head in heads):
+        first_cells = {head[0] if head else "" for head in heads if head is not None}
+        if len(first_cells) == 1:
+            # Same frequency text in every input: pair line by line
+            parts = list(heads)
+            heads = [next(reader, None) if head is not None else None for head, reader in zip(heads, readers)]
+            key = _cell_to_float(first_cells.pop())
+            if not math.isnan(key):
+                previous = key
+            yield parts
+            continue
+
+        keys = [_cell_to_float(head[0]) if head else math.nan for head in heads]
+        numeric = [k for h, k in zip(heads, keys) if h is not None and not math.isnan(k)]
+        lead = None
+        if numeric and not all(math.isclose(k, numeric[0], rel_tol=_MERGE_FREQ_REL_TOL) for k in numeric):
+            lead = min(numeric) if previous is None else min(numeric, key=lambda k: abs(k - previous))
+
+        parts: list[Optional[list[str]]] = []
+        for index, (head, key) in enumerate(zip(heads, keys)):
+            if head is not None and (lead is None or math.isnan(key)
+                                     or math.isclose(key, lead, rel_tol=_MERGE_FREQ_REL_TOL)):
+                parts.append(head)
+                heads[index] = next(readers[index], None)
+            else:
+                parts.append(None)
+        if numeric:
+            previous = lead if lead is not None else numeric[0]
+        yield parts
+
+
 def merge_ap_distortion_csvs(
     input_paths: list[str],
     output_dir: Optional[str] = None,
@@ -364,14 +958,18 @@ def merge_ap_distortion_csvs(
     For each metric (F, H2, H3, Total) the corresponding columns from all input
     files are placed side-by-side in a single output file.  Each input file may
     contain one or more channels; all channels of all files are collected into
-    the respective metric output.
+    the respective metric output. Data cells are written by :func:`write_ap_csv`
+    (missing or non-numeric cells empty), the same bytes a pipeline ``merge`` +
+    ``write`` produces.
 
     Args:
         input_paths:   List of at least 2 source AP CSV file paths.
         output_dir:    Output directory.  Defaults to the directory of the first
                        input file.
-        fraction:      If provided, apply 1/n-octave smoothing to every output
-                       file after merging (e.g. 3 = 1/3 octave).
+        fraction:      If provided, apply 1/n-octave smoothing to every metric
+                       before it is written (e.g. 3 = 1/3 octave). Ascending
+                       sweeps are smoothed while streaming; other sweeps are
+                       re-read and smoothed in memory.
         output_prefix: Base name for output files.  Defaults to the longest
                        common prefix of all input file stems (trimmed of
                        trailing ``_`` / ``-`` / space).
@@ -383,36 +981,17 @@ def merge_ap_distortion_csvs(
     Raises:
         FileNotFoundError: If any input path does not exist.
         ValueError:        If fewer than 2 paths are given, any file has an
-                           invalid curve count in Row 2, or fraction < 1.
+                           invalid curve count in Row 2, no file has data
+                           rows, or fraction < 1.
     """
     if len(input_paths) < 2:
         raise ValueError("At least 2 input paths are required.")
     if fraction is not None and fraction < 1:
         raise ValueError("fraction must be >= 1.")
 
-    # Read all files into memory
-    all_rows: list[list[list[str]]] = []
     for path in input_paths:
         if not path or not os.path.isfile(path):
             raise FileNotFoundError(f"Input CSV not found: {path}")
-        with open(path, "r", newline="", encoding="utf-8") as f:
-            all_rows.append(list(csv.reader(f)))
-
-    def _metric_cols(rows: list[list[str]], metric_idx: int) -> list[int]:
-        """Return the column indices for *metric_idx* across all channels of *rows*."""
-        header_row = rows[1]  # Row 2 (0-indexed)
-        num_curves = sum(1 for v in header_row if v.strip())
-        if num_curves == 0 or num_curves % _AP_CURVES_PER_CHANNEL != 0:
-            raise ValueError(
-                f"Expected a multiple of {_AP_CURVES_PER_CHANNEL} curves in Row 2, "
-                f"got {num_curves}."
-            )
-        num_channels = num_curves // _AP_CURVES_PER_CHANNEL
-        cols: list[int] = []
-        for ch in range(num_channels):
-            base = ch * _AP_COLS_PER_CHANNEL + metric_idx * _AP_COLS_PER_CURVE
-            cols.extend([base, base + 1])
-        return cols
 
     # Derive output prefix from common stem if not supplied
     if output_prefix is None:
@@ -430,194 +1009,309 @@ def merge_ap_distortion_csvs(
     output_base = output_dir if output_dir else os.path.dirname(os.path.abspath(input_paths[0]))
     os.makedirs(output_base, exist_ok=True)
 
-    results: dict[str, str] = {}
-    for metric_idx, metric in enumerate(_AP_DISTORTION_METRICS):
-        file_cols = [_metric_cols(rows, metric_idx) for rows in all_rows]
-        num_rows = max(len(rows) for rows in all_rows)
-
-        merged: list[list[str]] = []
-        for row_i in range(num_rows):
+    with ExitStack() as stack:
+        readers = [
+            csv.reader(stack.enter_context(open(path, "r", newline="", encoding="utf-8")))
+            for path in input_paths
+        ]
+        headers = [list(islice(reader, _AP_NUM_HEADER_ROWS)) for reader in readers]
+
+        # Column indices of each metric across all channels, per input file
+        file_cols: dict[str, list[list[int]]] = {}
+        for metric_idx, metric in enumerate(_AP_DISTORTION_METRICS):
+            file_cols[metric] = []
+            for header in headers:
+                num_curves = sum(1 for v in header[1] if v.strip()) if len(header) > 1 else 0
+                if num_curves == 0 or num_curves % _AP_CURVES_PER_CHANNEL != 0:
+                    raise ValueError(
+                        f"Expected a multiple of {_AP_CURVES_PER_CHANNEL} curves in Row 2, "
+                        f"got {num_curves}."
+                    )
+                cols: list[int] = []
+                for ch in range(num_curves // _AP_CURVES_PER_CHANNEL):
+                    base = ch * _AP_COLS_PER_CHANNEL + metric_idx * _AP_COLS_PER_CURVE
+                    cols.extend([base, base + 1])
+                file_cols[metric].append(cols)
+
+        def _merge(metric: str, parts: list[Optional[list[str]]]) -> list[str]:
             merged_row: list[str] = []
-            for file_idx, rows in enumerate(all_rows):
-                cols = file_cols[file_idx]
-                if row_i < len(rows):
-                    row = rows[row_i]
-                    merged_row.extend(row[c] if c < len(row) else "" for c in cols)
-                else:
+            for row, cols in zip(parts, file_cols[metric]):
+                if row is None:
                     merged_row.extend("" for _ in cols)
-            merged.append(merged_row)
-
-        output_filename = f"{output_prefix}_{metric}.csv"
-        output_path = os.path.join(output_base, output_filename)
-        written_path = _write_rows_with_fallback(output_path, merged)
-
-        if fraction is not None:
-            written_path = octave_smooth_ap_csv(
-                input_path=written_path,
-                fraction=fraction,
-                output_filename=output_filename,  # overwrite same file
-                output_dir=output_base,
-            )
+                else:
+                    merged_row.extend(row[c] if c < len(row) else "" for c in cols)
+            return merged_row
 
-        results[metric] = written_path
+        header_parts = [
+            [header[i] if i < len(header) else None for header in headers]
+            for i in range(max(len(header) for header in headers))
+        ]
+        data_parts = _frequency_aligned_rows(readers)
+
+        results: dict[str, str] = {}
+        widths = {metric: sum(len(cols) for cols in file_cols[metric]) for metric in _AP_DISTORTION_METRICS}
+        header_rows = {
+            metric: [_merge(metric, parts) for parts in header_parts[:_AP_NUM_HEADER_ROWS]]
+            for metric in _AP_DISTORTION_METRICS
+        }
+        chunks = _chunked(data_parts, _MERGE_CHUNK_ROWS)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            raise ValueError("Input CSV has no data rows after the header.")
+
+        # Stream: every aligned chunk goes to all four metric files, through one
+        # _StreamingAPSmoother per metric when smoothing
+        outputs = {}
+        try:
+            for metric in _AP_DISTORTION_METRICS:
+                output_file, written_path = _open_output_with_fallback(
+                    os.path.join(output_base, f"{output_prefix}_{metric}.csv")
+                )
+                smoother = _StreamingAPSmoother(fraction, widths[metric]) if fraction is not None else None
+                outputs[metric] = (output_file, smoother)
+                results[metric] = written_path
+                csv.writer(output_file).writerows(header_rows[metric])
+            for chunk in chain([first_chunk], chunks):
+                for metric, (output_file, smoother) in outputs.items():
+                    block = _text_rows_to_array([_merge(metric, parts) for parts in chunk], width=widths[metric])
+                    _write_numeric_rows(output_file, smoother.feed(block) if smoother else block)
+            for output_file, smoother in outputs.values():
+                if smoother:
+                    _write_numeric_rows(output_file, smoother.finish())
+            streamed = True
+        except ValueError:
+            # A descending or unordered sweep cannot be smoothed in one pass
+            streamed = False
+        finally:
+            for output_file, _ in outputs.values():
+                output_file.close()
+        if streamed:
+            return results
+        for written_path in results.values():
+            os.remove(written_path)
+
+    # Fallback for non-ascending frequencies: second pass, whole columns in memory
+    with ExitStack() as stack:
+        readers = [
+            csv.reader(stack.enter_context(open(path, "r", newline="", encoding="utf-8")))
+            for path in input_paths
+        ]
+        for reader in readers:
+            list(islice(reader, _AP_NUM_HEADER_ROWS))
+        blocks: dict[str, list] = {metric: [] for metric in _AP_DISTORTION_METRICS}
+        for chunk in _chunked(_frequency_aligned_rows(readers), _MERGE_CHUNK_ROWS):
+            for metric in _AP_DISTORTION_METRICS:
+                blocks[metric].append(
+                    _text_rows_to_array([_merge(metric, parts) for parts in chunk], width=widths[metric])
+                )
+
+    for metric in _AP_DISTORTION_METRICS:
+        data = np.vstack(blocks.pop(metric))
+        output_path = os.path.join(output_base, f"{output_prefix}_{metric}.csv")
+        results[metric] = write_ap_csv(output_path, _smooth_ap_data(data, fraction), header_rows=header_rows[metric])
 
     return results
 
 
 def _apply_limits_offset(
-    ref_value: float,
-    limit_value: float,
+    ref_values: "np.ndarray",
+    limit_values: "np.ndarray",
     ref_unit: str,
     limit_unit: str,
-) -> float:
+) -> "np.ndarray":
     """
-    Apply limits offset to reference value with unit conversion.
-    
+    Apply limits offsets to reference values with unit conversion.
+
     Args:
-        ref_value: Reference value (in ref_unit).
-        limit_value: Limits offset value (in limit_unit).
-        ref_unit: Unit of reference value ("dB", "dBSPL", or "%").
-        limit_unit: Unit of limits value ("dB" or "%").
-    
+        ref_values: Reference values (in ref_unit), shape (rows, columns).
+        limit_values: Limits offset per row (in limit_unit), shape (rows,).
+        ref_unit: Unit of reference values ("dB", "dBSPL", or "%").
+        limit_unit: Unit of limits values ("dB" or "%").
+
     Returns:
-        New value with offset applied (in ref_unit).
-    
+        New values with offsets applied (in ref_unit). Rows whose offset
+        cannot be converted keep their reference values.
+
     Notes:
         - dB + dB → addition: ref_value + limit_value
         - dB + % → convert % to dB, then add: ref_value + 20*log10(1 + limit%/100)
         - % + % → multiply factors: ref_value * (1 + limit%/100)
         - % + dB → convert dB to factor: ref_value * 10^(limit_dB/20)
     """
-    import math
-    
     # Normalize units (dBSPL is treated as dB)
     ref_is_db = ref_unit.upper() in ("DB", "DBSPL")
     ref_is_percent = ref_unit == "%"
-    
+
     limit_is_db = limit_unit.upper() in ("DB", "DBSPL")
     limit_is_percent = limit_unit == "%"
-    
+
+    limits = limit_values[:, None]
     if ref_is_db and limit_is_db:
         # dB + dB → simple addition
-        return ref_value + limit_value
-    
-    elif ref_is_db and limit_is_percent:
-        # dB + % → convert % to dB, then add
-        factor = 1 + limit_value / 100
-        if factor <= 0:
-            return float('-inf')  # Avoid log of non-positive
-        dB_change = 20 * math.log10(factor)
-        return ref_value + dB_change
-    
-    elif ref_is_percent and limit_is_percent:
+        return ref_values + limits
+
+    if ref_is_db and limit_is_percent:
+        # dB + % → convert % to dB, then add (log of non-positive factor → -inf)
+        factor = 1 + limits / 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            db_change = np.where(factor > 0, 20 * np.log10(factor), np.nan)
+        return np.where(factor <= 0, -np.inf, ref_values + db_change)
+
+    if ref_is_percent and limit_is_percent:
         # % + % → multiply factors
-        return ref_value * (1 + limit_value / 100)
-    
-    elif ref_is_percent and limit_is_db:
-        # % + dB → convert dB to factor, then multiply
-        factor = 10 ** (limit_value / 20)
-        return ref_value * factor
-    
-    else:
-        raise ValueError(f"Unsupported unit combination: ref={ref_unit}, limit={limit_unit}")
+        return ref_values * (1 + limits / 100)
 
+    if ref_is_percent and limit_is_db:
+        # % + dB → convert dB to factor, then multiply (overflowing factors keep the reference)
+        with np.errstate(over="ignore", invalid="ignore"):
+            factor = np.power(10.0, limits / 20)
+            return np.where(np.isfinite(factor), ref_values * factor, ref_values)
 
-def _interpolate_reference_frequencies(
-    ref_frequencies: list[float],
-    ref_values: list[list[float]],
-    target_frequencies: list[float],
-    num_channels: int,
-) -> list[list[str]]:
+    raise ValueError(f"Unsupported unit combination: ref={ref_unit}, limit={limit_unit}")
+
+
+def _log_interp(
+    target_frequencies: "np.ndarray",
+    frequencies: "np.ndarray",
+    values: "np.ndarray",
+) -> "np.ndarray":
     """
-    Interpolate reference values at target frequencies using logarithmic-linear interpolation.
-    
+    Logarithmic-linear interpolation of every column of *values* at the targets.
+
+    NaNs are dropped per column before interpolating; a column without any
+    valid value yields NaN. Outside the range the edge values are used.
+
     Args:
-        ref_frequencies: Original reference frequencies (Hz).
-        ref_values: List of value arrays, one per column (X,Y for each channel).
-        target_frequencies: Target frequencies to interpolate at (from limits CSV).
-        num_channels: Number of channels (1 for mono, 2 for stereo).
-    
+        target_frequencies: Frequencies to interpolate at (Hz), shape (k,).
+        frequencies:        Source frequencies (Hz), shape (n,).
+        values:             Source values, shape (n,) or (n, columns).
+
     Returns:
-        List of rows with interpolated values as strings.
+        Interpolated values, shape (k,) or (k, columns).
     """
-    import numpy as np
-    
-    # Convert to numpy arrays
-    ref_freq_array = np.array(ref_frequencies)
-    log_ref_freq = np.log10(ref_freq_array)
-    log_target_freq = np.log10(target_frequencies)
-    
-    interpolated_rows: list[list[str]] = []
-    
-    for target_freq, log_target in zip(target_frequencies, log_target_freq):
-        row_data: list[str] = []
-        
-        # Process each column (X,Y for each channel)
-        for col_idx in range(num_channels * 2):
-            if col_idx % 2 == 0:
-                # X column (frequency) - use target frequency
-                row_data.append(str(target_freq))
-            else:
-                # Y column (dB value) - interpolate
-                ref_col_values = np.array(ref_values[col_idx])
-                
-                # Filter out NaN values for interpolation
-                valid_mask = ~np.isnan(ref_col_values)
-                if not valid_mask.any():
-                    row_data.append("")
-                    continue
-                
-                valid_log_freq = log_ref_freq[valid_mask]
-                valid_values = ref_col_values[valid_mask]
-                
-                # Perform logarithmic-linear interpolation
-                # extrapolate with edge values if outside range
-                interpolated = np.interp(log_target, valid_log_freq, valid_values)
-                row_data.append(str(interpolated))
-        
-        interpolated_rows.append(row_data)
-    
-    return interpolated_rows
-
-
-def _interpolate_limits_values(
-    limits_frequencies: list[float],
-    limits_values: list[float],
-    target_frequencies: list[float],
-) -> list[float]:
+    log_target = np.log10(target_frequencies)
+    log_freq = np.log10(frequencies)
+    columns = values[:, None] if values.ndim == 1 else values
+    result = np.full((len(log_target), columns.shape[1]), np.nan)
+    for col_idx in range(columns.shape[1]):
+        column = columns[:, col_idx]
+        valid = ~np.isnan(column)
+        if valid.any():
+            result[:, col_idx] = np.interp(log_target, log_freq[valid], column[valid])
+    return result[:, 0] if values.ndim == 1 else result
+
+
+def _header_y_unit(header_rows: list[list[str]], default: str) -> str:
+    """Y unit of the first curve from the units row (Row 4)."""
+    units_row = header_rows[3] if len(header_rows) > 3 else []
+    return units_row[1].strip() if len(units_row) > 1 else default
+
+
+def _reference_channel_count(header_rows: list[list[str]]) -> int:
+    """X/Y pairs of a reference, counted from the X cells of Row 3 (X,Y or X,Y,X,Y)."""
+    header_row_3 = header_rows[2] if len(header_rows) > 2 else []
+    return sum(1 for i, val in enumerate(header_row_3) if i % 2 == 0 and val.strip())
+
+
+def _apply_limits_to_reference(
+    ref_data: "np.ndarray",
+    ref_y_unit: str,
+    limit_freqs: "np.ndarray",
+    limit_values: "np.ndarray",
+    limits_y_unit: str,
+) -> "np.ndarray":
     """
-    Interpolate limits values at target frequencies using logarithmic-linear interpolation.
-    
+    Core of :func:`filter_reference_by_limits` on parsed arrays.
+
     Args:
-        limits_frequencies: Original limits frequencies (Hz).
-        limits_values: Limits Y-values (dB or %).
-        target_frequencies: Target frequencies to interpolate at.
-    
+        ref_data:      Reference X/Y columns, rows with a valid frequency only.
+        ref_y_unit:    Unit of the reference Y values.
+        limit_freqs:   Sorted limits frequencies.
+        limit_values:  Limits offsets on that grid (NaN where empty).
+        limits_y_unit: Unit of the limits values.
+
     Returns:
-        Interpolated limits values at target frequencies.
+        The filtered, offset reference rows sorted by frequency; empty cells are NaN.
     """
-    import numpy as np
-    
-    if not NUMPY_AVAILABLE:
-        raise RuntimeError("numpy is required for limits interpolation")
+    num_cols = ref_data.shape[1]
+    ref_frequencies = ref_data[:, 0] if num_cols else np.empty(0)
+    freq_min = float(limit_freqs[0])
+    freq_max = float(limit_freqs[-1])
+
+    if not len(ref_frequencies):
+        raise ValueError("No valid frequency data found in reference CSV.")
     
-    # Convert to numpy arrays
-    limits_freq_array = np.array(limits_frequencies)
-    log_limits_freq = np.log10(limits_freq_array)
-    log_target_freq = np.log10(target_frequencies)
+    logger.info(f"Loaded {len(ref_frequencies)} frequency points from reference CSV")
+
+    # Step 1: Filter reference data rows to include only frequencies within limits range
+    in_range = (ref_frequencies >= freq_min) & (ref_frequencies <= freq_max)
+    filtered = ref_data[in_range]
     
-    # Filter out NaN values
-    valid_mask = ~np.isnan(limits_values)
-    if not valid_mask.any():
-        return [float('nan')] * len(target_frequencies)
+    logger.info(f"Filtered to {len(filtered)} frequency points from reference")
+
+    # Step 2: Find limits frequencies that are NOT already in the filtered reference
+    present = np.sort(filtered[:, 0])
+    pos = np.searchsorted(present, limit_freqs)
+    found = (pos < len(present)) & (present[np.minimum(pos, len(present) - 1)] == limit_freqs) \
+        if len(present) else np.zeros(len(limit_freqs), dtype=bool)
+    missing_limit_freqs = limit_freqs[~found]
+
+    # Empty cells are written as "", everything else as str(float)
+    values = filtered
+    empty = np.isnan(filtered)
+    if len(missing_limit_freqs):
+        logger.info(
+            f"Interpolating {len(missing_limit_freqs)} missing limits frequencies: "
+            f"{[f'{f:.1f}' for f in missing_limit_freqs[:5]]}{'...' if len(missing_limit_freqs) > 5 else ''}"
+        )
+
+        # Interpolate the Y columns at the missing frequencies; X columns take the frequency
+        interpolated = np.empty((len(missing_limit_freqs), num_cols))
+        interpolated[:, 0::2] = missing_limit_freqs[:, None]
+        interpolated[:, 1::2] = _log_interp(missing_limit_freqs, ref_frequencies, ref_data[:, 1::2])
+        interpolated_empty = np.zeros_like(interpolated, dtype=bool)
+        interpolated_empty[:, 1::2] = np.isnan(ref_data[:, 1::2]).all(axis=0)
+
+        values = np.vstack([filtered, interpolated])
+        empty = np.vstack([empty, interpolated_empty])
+        
+        logger.info(f"Added {len(interpolated)} interpolated frequency points")
     
-    valid_log_freq = log_limits_freq[valid_mask]
-    valid_values = np.array(limits_values)[valid_mask]
+    # Step 3: Sort all rows by frequency
+    if not len(values):
+        raise ValueError(
+            f"No frequencies in reference CSV fall within limits range: [{freq_min:.1f}-{freq_max:.1f}] Hz."
+        )
+    output_frequencies = np.concatenate([filtered[:, 0], missing_limit_freqs])
+    order = np.argsort(output_frequencies, kind="stable")
+    values, empty, output_frequencies = values[order], empty[order], output_frequencies[order]
     
-    # Perform logarithmic-linear interpolation
-    interpolated = np.interp(log_target_freq, valid_log_freq, valid_values)
+    logger.info(f"Total output frequencies: {len(values)} (sorted by frequency)")
+
+    # Step 4: Apply limits as offset to reference Y-values
+    # Interpolate limits Y-values for all output frequencies
+    limits_at_output_freq = _log_interp(output_frequencies, limit_freqs, limit_values)
+    logger.info(f"Interpolated limits values for {len(output_frequencies)} output frequencies")
+
+    # Apply offset to each non-empty Y-value; rows without a limits value stay unchanged
+    rows_with_limit = ~np.isnan(limits_at_output_freq)
+    try:
+        offset = _apply_limits_offset(
+            values[rows_with_limit, 1::2],
+            limits_at_output_freq[rows_with_limit],
+            ref_y_unit,
+            limits_y_unit,
+        )
+        y_values = values[:, 1::2]
+        y_values[rows_with_limit] = np.where(empty[rows_with_limit, 1::2], y_values[rows_with_limit], offset)
+        values[:, 1::2] = y_values
+    except ValueError as e:
+        logger.warning(f"Could not apply limits offset: {e}")
     
-    return interpolated.tolist()
+    logger.info(f"Applied limits offset to all Y-values (ref unit: {ref_y_unit}, limit unit: {limits_y_unit})")
+
+    values[empty] = np.nan
+    return values
 
 
 def filter_reference_by_limits(
@@ -666,6 +1360,8 @@ def filter_reference_by_limits(
         - Frequency ranges are determined by min/max limits frequency.
         - Requires numpy for interpolation and offset calculations.
     """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for filter_reference_by_limits")
     if not reference_path or not os.path.isfile(reference_path):
         raise FileNotFoundError(f"Reference CSV not found: {reference_path}")
     if not limits_path or not os.path.isfile(limits_path):
@@ -683,8 +1379,7 @@ def filter_reference_by_limits(
     limits_data_rows = limits_rows[_AP_NUM_HEADER_ROWS:]
     
     # Extract units from limits header (row 4, index 3)
-    limits_units_row = limits_header_rows[3] if len(limits_header_rows) > 3 else []
-    limits_y_unit = limits_units_row[1].strip() if len(limits_units_row) > 1 else "dB"
+    limits_y_unit = _header_y_unit(limits_header_rows, "dB")
     
     # Extract frequency and Y values from limits (column 0 = X = Hz, column 1 = Y)
     limit_frequencies: list[float] = []
@@ -703,16 +1398,15 @@ def filter_reference_by_limits(
         raise ValueError("No valid frequency values found in limits CSV.")
 
     # Sort frequencies and corresponding Y-values
-    freq_y_pairs = list(zip(limit_frequencies, limit_y_values))
-    freq_y_pairs.sort(key=lambda x: x[0])
-    limit_frequencies = [f for f, _ in freq_y_pairs]
-    limit_y_values = [y for _, y in freq_y_pairs]
+    limit_order = np.argsort(limit_frequencies, kind="stable")
+    limit_freqs = np.array(limit_frequencies)[limit_order]
+    limit_values = np.array(limit_y_values)[limit_order]
     
-    logger.info(f"Loaded {len(limit_frequencies)} frequency points from limits CSV")
+    logger.info(f"Loaded {len(limit_freqs)} frequency points from limits CSV")
 
     # Define frequency range from min to max limits frequency (no gaps)
-    freq_min = min(limit_frequencies)
-    freq_max = max(limit_frequencies)
+    freq_min = float(limit_freqs[0])
+    freq_max = float(limit_freqs[-1])
     
     logger.info(f"Limits frequency range: [{freq_min:.1f}-{freq_max:.1f}] Hz")
 
@@ -728,146 +1422,22 @@ def filter_reference_by_limits(
     ref_data_rows = ref_rows[_AP_NUM_HEADER_ROWS:]
 
     # Extract units from reference header (row 4, index 3)
-    ref_units_row = ref_header_rows[3] if len(ref_header_rows) > 3 else []
-    ref_y_unit = ref_units_row[1].strip() if len(ref_units_row) > 1 else "dBSPL"
+    ref_y_unit = _header_y_unit(ref_header_rows, "dBSPL")
     
     logger.info(f"Reference Y-unit: {ref_y_unit}, Limits Y-unit: {limits_y_unit}")
 
-    # Detect if reference is stereo or mono by checking number of non-empty columns in header row 3
-    # Header row 3 (index 2) contains X,Y or X,Y,X,Y
-    header_row_3 = ref_header_rows[2] if len(ref_header_rows) > 2 else []
-    num_channels = sum(1 for i, val in enumerate(header_row_3) if i % 2 == 0 and val.strip())
+    # Detect if reference is stereo or mono from the X cells of header row 3
+    num_channels = _reference_channel_count(ref_header_rows)
     
     ref_type = "Stereo" if num_channels > 1 else "Mono"
     logger.info(f"Reference type: {ref_type} ({num_channels} channel(s))")
 
-    # Parse reference data into structured format
-    ref_frequencies: list[float] = []
-    ref_values: list[list[float]] = [[] for _ in range(num_channels * 2)]  # X,Y for each channel
-    
-    for row in ref_data_rows:
-        if not row or not row[0].strip():
-            continue
-        
-        try:
-            freq = float(row[0])
-            ref_frequencies.append(freq)
-            
-            # Parse all column values
-            for col_idx in range(min(len(row), num_channels * 2)):
-                try:
-                    val = float(row[col_idx]) if row[col_idx].strip() else float('nan')
-                    ref_values[col_idx].append(val)
-                except (ValueError, IndexError):
-                    ref_values[col_idx].append(float('nan'))
-        except ValueError:
-            continue
-
-    if not ref_frequencies:
-        raise ValueError("No valid frequency data found in reference CSV.")
-    
-    logger.info(f"Loaded {len(ref_frequencies)} frequency points from reference CSV")
-
-    # Step 1: Filter reference data rows to include only frequencies within limits range
-    filtered_frequencies: list[float] = []
-    filtered_data_rows: list[list[str]] = []
-    
-    for i, freq in enumerate(ref_frequencies):
-        # Check if frequency falls within the limits range
-        if freq_min <= freq <= freq_max:
-            filtered_frequencies.append(freq)
-            row_data = []
-            for col_idx in range(num_channels * 2):
-                val = ref_values[col_idx][i]
-                row_data.append("" if math.isnan(val) else str(val))
-            filtered_data_rows.append(row_data)
-    
-    logger.info(f"Filtered to {len(filtered_data_rows)} frequency points from reference")
+    # Parse reference data (X,Y for each channel); rows without a frequency are skipped
+    num_cols = num_channels * 2
+    ref_data = _text_rows_to_array([row[:num_cols] for row in ref_data_rows], width=num_cols)
+    ref_data = ref_data[~np.isnan(ref_data[:, 0])] if num_cols else ref_data[:0]
 
-    # Step 2: Check if limits frequencies need to be added via interpolation
-    # Find limits frequencies that are NOT already in the filtered reference
-    missing_limit_freqs = [freq for freq in limit_frequencies if freq not in filtered_frequencies]
-    
-    if missing_limit_freqs:
-        if not NUMPY_AVAILABLE:
-            logger.warning(
-                f"{len(missing_limit_freqs)} limits frequencies are missing from reference but cannot be interpolated "
-                f"(numpy not available). Continuing with existing frequencies only."
-            )
-        else:
-            logger.info(
-                f"Interpolating {len(missing_limit_freqs)} missing limits frequencies: "
-                f"{[f'{f:.1f}' for f in missing_limit_freqs[:5]]}{'...' if len(missing_limit_freqs) > 5 else ''}"
-            )
-            
-            # Interpolate missing limits frequencies
-            interpolated_rows = _interpolate_reference_frequencies(
-                ref_frequencies,
-                ref_values,
-                missing_limit_freqs,
-                num_channels
-            )
-            
-            # Add interpolated rows to filtered data
-            for i, interp_row in enumerate(interpolated_rows):
-                filtered_frequencies.append(missing_limit_freqs[i])
-                filtered_data_rows.append(interp_row)
-            
-            logger.info(f"Added {len(interpolated_rows)} interpolated frequency points")
-    
-    # Step 3: Sort all rows by frequency
-    if filtered_data_rows:
-        # Create list of (frequency, row) tuples, sort by frequency, then extract rows
-        freq_row_pairs = list(zip(filtered_frequencies, filtered_data_rows))
-        freq_row_pairs.sort(key=lambda x: x[0])
-        filtered_frequencies = [freq for freq, _ in freq_row_pairs]
-        filtered_data_rows = [row for _, row in freq_row_pairs]
-        
-        logger.info(f"Total output frequencies: {len(filtered_data_rows)} (sorted by frequency)")
-    else:
-        raise ValueError(
-            f"No frequencies in reference CSV fall within limits range: [{freq_min:.1f}-{freq_max:.1f}] Hz."
-        )
-
-    # Step 4: Apply limits as offset to reference Y-values
-    # Interpolate limits Y-values for all output frequencies
-    if not NUMPY_AVAILABLE:
-        logger.warning("numpy not available - cannot apply limits offset. Output will contain reference values only.")
-        limits_at_output_freq = [float('nan')] * len(filtered_frequencies)
-    else:
-        limits_at_output_freq = _interpolate_limits_values(
-            limit_frequencies,
-            limit_y_values,
-            filtered_frequencies
-        )
-        logger.info(f"Interpolated limits values for {len(filtered_frequencies)} output frequencies")
-    
-    # Apply offset to each Y-value in filtered_data_rows
-    for row_idx, row in enumerate(filtered_data_rows):
-        limit_offset = limits_at_output_freq[row_idx]
-        
-        # Skip if limits value is NaN
-        if math.isnan(limit_offset):
-            continue
-        
-        # Apply offset to each Y column (every odd column index)
-        for col_idx in range(len(row)):
-            if col_idx % 2 == 1:  # Y columns only
-                if row[col_idx].strip():
-                    try:
-                        ref_y_value = float(row[col_idx])
-                        new_y_value = _apply_limits_offset(
-                            ref_y_value,
-                            limit_offset,
-                            ref_y_unit,
-                            limits_y_unit
-                        )
-                        row[col_idx] = str(new_y_value)
-                    except (ValueError, ArithmeticError) as e:
-                        logger.warning(f"Could not apply offset at row {row_idx}, col {col_idx}: {e}")
-                        continue
-    
-    logger.info(f"Applied limits offset to all Y-values (ref unit: {ref_y_unit}, limit unit: {limits_y_unit})")
+    values = _apply_limits_to_reference(ref_data, ref_y_unit, limit_freqs, limit_values, limits_y_unit)
 
     # Prepare output
     base_name = os.path.splitext(os.path.basename(reference_path))[0]
@@ -878,15 +1448,47 @@ def filter_reference_by_limits(
     os.makedirs(output_base, exist_ok=True)
     output_path = os.path.join(output_base, output_filename)
 
-    # Write filtered CSV
-    all_output_rows = ref_header_rows + filtered_data_rows
-    written_path = _write_rows_with_fallback(output_path, all_output_rows)
+    # Write filtered CSV (empty reference cells stay empty)
+    written_path = write_ap_csv(output_path, values, header_rows=ref_header_rows)
     
     logger.info(f"Output written to: {written_path}")
     
     return written_path
 
 
+def filter_reference_table(reference: APCsvData, limits: APCsvData) -> APCsvData:
+    """
+    Absolute limits from a parsed reference and limits table.
+
+    The in-memory form of :func:`filter_reference_by_limits`, with the same
+    range filtering, interpolation and unit conversion.
+
+    Raises:
+        ValueError: If the limits have no valid frequency or no reference
+                    frequency falls inside the limits range.
+    """
+    limit_freqs, limit_values = limits.pair(0) if limits.num_columns > 1 else (limits.data[:, 0], None)
+    if limit_values is None:
+        limit_values = np.full(len(limit_freqs), np.nan)
+    valid = ~np.isnan(limit_freqs)
+    if not valid.any():
+        raise ValueError("No valid frequency values found in limits CSV.")
+    order = np.argsort(limit_freqs[valid], kind="stable")
+
+    num_cols = _reference_channel_count(reference.header_rows) * 2
+    ref_data = _select_columns(reference, list(range(num_cols)))
+    ref_data = ref_data[~np.isnan(ref_data[:, 0])] if num_cols else ref_data[:0]
+
+    values = _apply_limits_to_reference(
+        ref_data,
+        _header_y_unit(reference.header_rows, "dBSPL"),
+        limit_freqs[valid][order],
+        limit_values[valid][order],
+        _header_y_unit(limits.header_rows, "dB"),
+    )
+    return APCsvData(path=reference.path, header_rows=reference.header_rows, data=values)
+
+
 def compensate_lr_diff(
     input_path: str,
     diff_path: str,
@@ -908,7 +1510,9 @@ def compensate_lr_diff(
         input_path:     Stereo AP measurement CSV (4 header rows, then ``X,Y,X,Y``).
         diff_path:      Mono AP CSV with the L-R difference (4 header rows, then ``X,Y``).
         output_path:    Destination CSV path. Parent directories are created if needed.
-        freq_tolerance: Allowed absolute mismatch (Hz) between input and diff frequency grids.
+        freq_tolerance: Allowed absolute mismatch (Hz) between the L and R columns, and
+                        between the input and diff frequency grids. Input points with no
+                        diff point that close are interpolated from the diff curve.
 
     Returns:
         The actual written path (may differ from ``output_path`` if the target is locked).
@@ -925,105 +1529,164 @@ def compensate_lr_diff(
     if not output_path:
         raise ValueError("output_path must be provided")
 
-    with open(input_path, "r", newline="", encoding="utf-8-sig") as f:
-        in_rows = list(csv.reader(f))
-    with open(diff_path, "r", newline="", encoding="utf-8-sig") as f:
-        diff_rows = list(csv.reader(f))
-
-    if len(in_rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError("Input CSV has no data rows after the header.")
-    if len(diff_rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError("Diff CSV has no data rows after the header.")
-
-    in_header = in_rows[:_AP_NUM_HEADER_ROWS]
-    in_data = in_rows[_AP_NUM_HEADER_ROWS:]
-    diff_data = diff_rows[_AP_NUM_HEADER_ROWS:]
-
-    # Sanity-check stereo layout on the input (X,Y,X,Y).
-    if not in_data or len(in_data[0]) < 4:
-        raise ValueError("Input CSV is not stereo (expected at least 4 columns: X,Y,X,Y).")
-
-    # Build a lookup of diff values keyed by frequency rounded to mHz to tolerate
-    # the formatting precision difference between AP exports (e.g. 17.36111111
-    # vs 17.3611111111111).
-    diff_lookup: dict[float, float] = {}
-    for row in diff_data:
-        if not row or not row[0].strip():
-            continue
-        try:
-            f = float(row[0])
-            y = float(row[1]) if len(row) > 1 and row[1].strip() else float("nan")
-        except ValueError:
-            continue
-        diff_lookup[round(f, 3)] = y
+    compensated = compensate_lr_table(read_ap_csv(input_path), read_ap_csv(diff_path), freq_tolerance)
 
-    out_data: list[list[str]] = []
-    missing = 0
-    for row in in_data:
-        if not row or not row[0].strip():
-            continue
-        try:
-            x_l = float(row[0])
-            y_l = float(row[1])
-            x_r = float(row[2])
-            y_r = float(row[3])
-        except (ValueError, IndexError):
-            continue
+    parent = os.path.dirname(os.path.abspath(output_path))
+    if parent:
+        os.makedirs(parent, exist_ok=True)
 
-        if abs(x_l - x_r) > freq_tolerance:
-            raise ValueError(
-                f"Left/right frequency mismatch in input at {x_l} Hz vs {x_r} Hz."
-            )
+    written_path = write_ap_csv(output_path, compensated.data, header_rows=compensated.header_rows, precision=10)
+    logger.info(
+        "compensate_lr_diff: wrote %d compensated rows to %s", len(compensated.data), written_path
+    )
+    return written_path
+
+
+def compensate_lr_table(table: APCsvData, diff: APCsvData, freq_tolerance: float = 1e-3) -> APCsvData:
+    """
+    L/R compensation of a parsed stereo table by a parsed diff table.
 
-        diff_val = diff_lookup.get(round(x_l, 3))
-        if diff_val is None or math.isnan(diff_val):
-            missing += 1
-            new_row = [f"{x_l:.10g}", f"{y_l:.10g}", f"{x_r:.10g}", f"{y_r:.10g}"]
-        else:
-            new_row = [
-                f"{x_l:.10g}",
-                f"{y_l + 0.5 * diff_val:.10g}",
-                f"{x_r:.10g}",
-                f"{y_r - 0.5 * diff_val:.10g}",
-            ]
-        out_data.append(new_row)
+    The in-memory form of :func:`compensate_lr_diff`; points without a diff
+    value are left unchanged and counted in a warning.
 
+    Raises:
+        ValueError: If the input is not stereo or its L/R frequencies differ
+                    by more than *freq_tolerance*.
+    """
+    out_data, missing = _compensate_lr(_stereo_lr(table, freq_tolerance), _diff_curve(diff), freq_tolerance)
     if missing:
         logger.warning(
             "compensate_lr_diff: %d/%d frequency points had no diff entry and were left unchanged.",
-            missing,
-            len(out_data),
+            missing, len(out_data),
         )
+    return APCsvData(path=table.path, header_rows=table.header_rows, data=out_data)
 
-    parent = os.path.dirname(os.path.abspath(output_path))
-    if parent:
-        os.makedirs(parent, exist_ok=True)
 
-    written_path = _write_rows_with_fallback(output_path, in_header + out_data)
-    logger.info(
-        "compensate_lr_diff: wrote %d compensated rows to %s", len(out_data), written_path
+def _compensate_lr(
+    lr: "np.ndarray",
+    diff_curve: tuple["np.ndarray", "np.ndarray"],
+    freq_tolerance: float,
+) -> tuple["np.ndarray", int]:
+    """
+    Apply ``L + 0.5 * diff`` / ``R - 0.5 * diff`` to ``X_L, Y_L, X_R, Y_R`` rows.
+
+    Returns the compensated rows and the number of points left unchanged
+    because the diff curve has no value there.
+    """
+    x_l, y_l, x_r, y_r = lr.T
+    diff = _match_diff(x_l, diff_curve, freq_tolerance)
+    missing = np.isnan(diff)
+    out_data = np.column_stack((
+        x_l,
+        np.where(missing, y_l, y_l + 0.5 * diff),
+        x_r,
+        np.where(missing, y_r, y_r - 0.5 * diff),
+    ))
+    return out_data, int(missing.sum())
+
+
+def _load_diff_curve(diff_path: str) -> tuple["np.ndarray", "np.ndarray"]:
+    """Load a mono AP diff CSV as ``(frequencies, values)`` sorted by frequency, NaN points dropped."""
+    return _diff_curve(read_ap_csv(diff_path))
+
+
+def _diff_curve(table: APCsvData) -> tuple["np.ndarray", "np.ndarray"]:
+    """The first X/Y pair of a parsed diff CSV, sorted by frequency, NaN points dropped."""
+    freqs = table[0]
+    values = table[1] if table.num_columns > 1 else np.full(len(freqs), np.nan)
+    valid = ~(np.isnan(freqs) | np.isnan(values))
+    order = np.argsort(freqs[valid], kind="stable")
+    return freqs[valid][order], values[valid][order]
+
+
+def _match_diff(
+    frequencies: "np.ndarray",
+    diff_curve: tuple["np.ndarray", "np.ndarray"],
+    tolerance: float,
+) -> "np.ndarray":
+    """
+    Look up the diff curve at *frequencies*.
+
+    The nearest diff point is used when it lies within *tolerance* Hz (grids
+    exported with different precision). Otherwise the curve is interpolated
+    log-linearly inside its range. Frequencies outside the range give NaN.
+    """
+    diff_freqs, diff_values = diff_curve
+    result = np.full(len(frequencies), np.nan)
+    if not len(diff_freqs):
+        return result
+
+    pos = np.searchsorted(diff_freqs, frequencies)
+    left = np.clip(pos - 1, 0, len(diff_freqs) - 1)
+    right = np.clip(pos, 0, len(diff_freqs) - 1)
+    nearest = np.where(
+        np.abs(frequencies - diff_freqs[left]) <= np.abs(diff_freqs[right] - frequencies), left, right
     )
-    return written_path
+    matched = np.abs(diff_freqs[nearest] - frequencies) <= tolerance
+    result[matched] = diff_values[nearest[matched]]
 
+    inside = ~matched & (frequencies >= diff_freqs[0]) & (frequencies <= diff_freqs[-1])
+    if inside.any():
+        result[inside] = _log_interp(frequencies[inside], diff_freqs, diff_values)
+    return result
 
-def _load_diff_lookup(diff_path: str) -> dict[float, float]:
-    """Load a mono AP diff CSV into a {round(freq, 3) -> y} lookup."""
-    with open(diff_path, "r", newline="", encoding="utf-8-sig") as f:
-        rows = list(csv.reader(f))
-    if len(rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError(f"Diff CSV has no data rows after the header: {diff_path}")
 
-    lookup: dict[float, float] = {}
-    for row in rows[_AP_NUM_HEADER_ROWS:]:
-        if not row or not row[0].strip():
-            continue
-        try:
-            f_hz = float(row[0])
-            y = float(row[1]) if len(row) > 1 and row[1].strip() else float("nan")
-        except ValueError:
-            continue
-        lookup[round(f_hz, 3)] = y
-    return lookup
+def _stereo_lr(table: APCsvData, freq_tolerance: float) -> "np.ndarray":
+    """
+    Return the complete ``X_L, Y_L, X_R, Y_R`` rows of a parsed stereo AP CSV.
+
+    Raises:
+        ValueError: If the file is not stereo or L/R frequencies differ by
+                    more than *freq_tolerance*.
+    """
+    input_path = table.path
+    if table.num_columns < 4:
+        raise ValueError(
+            f"Input CSV is not stereo (expected at least 4 columns: X,Y,X,Y): {input_path}"
+        )
+    lr = table.data[:, :4]
+    lr = lr[~np.isnan(lr).any(axis=1)]
+
+    mismatch = np.flatnonzero(np.abs(lr[:, 0] - lr[:, 2]) > freq_tolerance)
+    if mismatch.size:
+        x_l, _, x_r, _ = lr[mismatch[0]].tolist()
+        raise ValueError(
+            f"Left/right frequency mismatch in {input_path} at {x_l} Hz vs {x_r} Hz."
+        )
+    return lr
+
+
+def _compensated_lr_diff(
+    input_path: str,
+    diff_curve: tuple["np.ndarray", "np.ndarray"],
+    freq_tolerance: float = 1e-3,
+) -> tuple[list[list[str]], "np.ndarray", "np.ndarray", int]:
+    """
+    Return ``(src_header, frequencies, comp_diff, missing)`` for one stereo
+    input: ``comp_diff = (L - R) + mic_diff``, or raw ``L - R`` where the
+    diff curve has no value.
+    """
+    if not input_path or not os.path.isfile(input_path):
+        raise FileNotFoundError(f"Input CSV not found: {input_path}")
+
+    table = read_ap_csv(input_path)
+    src_header = table.header_rows
+    x_l, y_l, _, y_r = _stereo_lr(table, freq_tolerance).T
+    mic_diff = _match_diff(x_l, diff_curve, freq_tolerance)
+    missing = np.isnan(mic_diff)
+    comp_diff = np.where(missing, y_l - y_r, (y_l - y_r) + mic_diff)
+    return src_header, x_l, comp_diff, int(missing.sum())
+
+
+def _as_diff_curve(diff_lookup) -> tuple["np.ndarray", "np.ndarray"]:
+    """Accept a ``(frequencies, values)`` curve or a legacy ``{freq: value}`` lookup."""
+    if isinstance(diff_lookup, dict):
+        freqs = np.array(list(diff_lookup.keys()), dtype=float)
+        values = np.array(list(diff_lookup.values()), dtype=float)
+        valid = ~np.isnan(values)
+        order = np.argsort(freqs[valid], kind="stable")
+        return freqs[valid][order], values[valid][order]
+    return diff_lookup
 
 
 def extract_compensated_lr_diff(
@@ -1031,7 +1694,7 @@ def extract_compensated_lr_diff(
     diff_path: str,
     output_path: str,
     freq_tolerance: float = 1e-3,
-    diff_lookup: Optional[dict[float, float]] = None,
+    diff_lookup: Optional[Union[tuple["np.ndarray", "np.ndarray"], dict[float, float]]] = None,
 ) -> str:
     """
     Compute the L-R difference of a stereo RMS measurement after compensating the
@@ -1049,9 +1712,11 @@ def extract_compensated_lr_diff(
         input_path:     Stereo AP measurement CSV (``X,Y,X,Y``).
         diff_path:      Mono AP CSV with the mic L-R difference (dB).
         output_path:    Destination CSV path.
-        freq_tolerance: Allowed Hz mismatch between the input L and R frequency columns.
-        diff_lookup:    Optional pre-loaded diff lookup (use to avoid re-reading the
-                        diff CSV when processing multiple inputs).
+        freq_tolerance: Allowed Hz mismatch between the input L and R frequency columns,
+                        and between the input and diff frequency grids.
+        diff_lookup:    Optional pre-loaded diff curve from ``_load_diff_curve`` (or a
+                        ``{freq: value}`` dict) to avoid re-reading the diff CSV when
+                        processing multiple inputs.
 
     Returns:
         The actual written path.
@@ -1064,21 +1729,13 @@ def extract_compensated_lr_diff(
     if diff_lookup is None:
         if not diff_path or not os.path.isfile(diff_path):
             raise FileNotFoundError(f"Diff CSV not found: {diff_path}")
-        diff_lookup = _load_diff_lookup(diff_path)
+        diff_lookup = _load_diff_curve(diff_path)
 
-    with open(input_path, "r", newline="", encoding="utf-8-sig") as f:
-        in_rows = list(csv.reader(f))
-    if len(in_rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError(f"Input CSV has no data rows after the header: {input_path}")
-
-    in_data = in_rows[_AP_NUM_HEADER_ROWS:]
-    if not in_data or len(in_data[0]) < 4:
-        raise ValueError(
-            f"Input CSV is not stereo (expected at least 4 columns: X,Y,X,Y): {input_path}"
-        )
+    src_header, freqs, comp_diff, missing = _compensated_lr_diff(
+        input_path, _as_diff_curve(diff_lookup), freq_tolerance
+    )
 
     # Derive the measurement name and X-unit from the source header where possible.
-    src_header = in_rows[:_AP_NUM_HEADER_ROWS]
     measurement = src_header[0][0] if src_header and src_header[0] else "Measurement"
     x_unit = "Hz"
     if len(src_header) > 3 and len(src_header[3]) > 0 and src_header[3][0].strip():
@@ -1091,29 +1748,7 @@ def extract_compensated_lr_diff(
         [x_unit, "dB"],
     ]
 
-    out_data: list[list[str]] = []
-    missing = 0
-    for row in in_data:
-        if not row or not row[0].strip():
-            continue
-        try:
-            x_l = float(row[0])
-            y_l = float(row[1])
-            x_r = float(row[2])
-            y_r = float(row[3])
-        except (ValueError, IndexError):
-            continue
-        if abs(x_l - x_r) > freq_tolerance:
-            raise ValueError(
-                f"Left/right frequency mismatch in input at {x_l} Hz vs {x_r} Hz."
-            )
-        mic_diff = diff_lookup.get(round(x_l, 3))
-        if mic_diff is None or math.isnan(mic_diff):
-            missing += 1
-            comp_diff = y_l - y_r
-        else:
-            comp_diff = (y_l - y_r) + mic_diff
-        out_data.append([f"{x_l:.10g}", f"{comp_diff:.10g}"])
+    out_data = np.column_stack((freqs, comp_diff))
 
     if missing:
         logger.warning(
@@ -1127,7 +1762,7 @@ def extract_compensated_lr_diff(
     if parent:
         os.makedirs(parent, exist_ok=True)
 
-    written_path = _write_rows_with_fallback(output_path, out_header + out_data)
+    written_path = write_ap_csv(output_path, out_data, header_rows=out_header, precision=10)
     logger.info(
         "extract_compensated_lr_diff: wrote %d rows from %s to %s",
         len(out_data), input_path, written_path,
@@ -1135,56 +1770,6 @@ def extract_compensated_lr_diff(
     return written_path
 
 
-def _compute_compensated_lr_diff_rows(
-    input_path: str,
-    diff_lookup: dict[float, float],
-    freq_tolerance: float = 1e-3,
-) -> tuple[list[list[str]], list[str], int]:
-    """Return ``(rows, src_header, missing)`` where ``rows`` is a list of ``[X, Y]``
-    strings holding the compensated L-R difference for one stereo input CSV.
-    """
-    if not input_path or not os.path.isfile(input_path):
-        raise FileNotFoundError(f"Input CSV not found: {input_path}")
-
-    with open(input_path, "r", newline="", encoding="utf-8-sig") as f:
-        in_rows = list(csv.reader(f))
-    if len(in_rows) <= _AP_NUM_HEADER_ROWS:
-        raise ValueError(f"Input CSV has no data rows after the header: {input_path}")
-
-    src_header = in_rows[:_AP_NUM_HEADER_ROWS]
-    in_data = in_rows[_AP_NUM_HEADER_ROWS:]
-    if not in_data or len(in_data[0]) < 4:
-        raise ValueError(
-            f"Input CSV is not stereo (expected at least 4 columns: X,Y,X,Y): {input_path}"
-        )
-
-    out_rows: list[list[str]] = []
-    missing = 0
-    for row in in_data:
-        if not row or not row[0].strip():
-            continue
-        try:
-            x_l = float(row[0])
-            y_l = float(row[1])
-            x_r = float(row[2])
-            y_r = float(row[3])
-        except (ValueError, IndexError):
-            continue
-        if abs(x_l - x_r) > freq_tolerance:
-            raise ValueError(
-                f"Left/right frequency mismatch in {input_path} at {x_l} Hz vs {x_r} Hz."
-            )
-        mic_diff = diff_lookup.get(round(x_l, 3))
-        if mic_diff is None or math.isnan(mic_diff):
-            missing += 1
-            comp_diff = y_l - y_r
-        else:
-            comp_diff = (y_l - y_r) + mic_diff
-        out_rows.append([f"{x_l:.10g}", f"{comp_diff:.10g}"])
-
-    return out_rows, src_header, missing
-
-
 def extract_compensated_lr_diff_combined(
     diff_path: str,
     input1_path: str,
@@ -1203,23 +1788,20 @@ def extract_compensated_lr_diff_combined(
     if not output_path:
         raise ValueError("output_path must be provided")
 
-    lookup = _load_diff_lookup(diff_path)
-    rows1, src_header, missing1 = _compute_compensated_lr_diff_rows(
-        input1_path, lookup, freq_tolerance
-    )
-    rows2, _, missing2 = _compute_compensated_lr_diff_rows(
-        input2_path, lookup, freq_tolerance
-    )
+    curve = _load_diff_curve(diff_path)
+    src_header, freqs1, diff1, missing1 = _compensated_lr_diff(input1_path, curve, freq_tolerance)
+    _, freqs2, diff2, missing2 = _compensated_lr_diff(input2_path, curve, freq_tolerance)
 
-    if len(rows1) != len(rows2):
+    if len(freqs1) != len(freqs2):
         raise ValueError(
-            f"Input row counts differ ({len(rows1)} vs {len(rows2)}); cannot combine."
+            f"Input row counts differ ({len(freqs1)} vs {len(freqs2)}); cannot combine."
+        )
+    mismatch = np.flatnonzero(np.abs(freqs1 - freqs2) > freq_tolerance)
+    if mismatch.size:
+        i = int(mismatch[0])
+        raise ValueError(
+            f"Frequency mismatch between inputs at row {i}: {freqs1[i]:.10g} vs {freqs2[i]:.10g}."
         )
-    for i, (r1, r2) in enumerate(zip(rows1, rows2)):
-        if abs(float(r1[0]) - float(r2[0])) > freq_tolerance:
-            raise ValueError(
-                f"Frequency mismatch between inputs at row {i}: {r1[0]} vs {r2[0]}."
-            )
 
     x_unit = "Hz"
     if len(src_header) > 3 and len(src_header[3]) > 0 and src_header[3][0].strip():
@@ -1232,7 +1814,7 @@ def extract_compensated_lr_diff_combined(
         [x_unit, "dB", x_unit, "dB"],
     ]
 
-    combined: list[list[str]] = [r1 + r2 for r1, r2 in zip(rows1, rows2)]
+    combined = np.column_stack((freqs1, diff1, freqs2, diff2))
 
     if missing1 or missing2:
         logger.warning(
@@ -1244,7 +1826,7 @@ def extract_compensated_lr_diff_combined(
     if parent:
         os.makedirs(parent, exist_ok=True)
 
-    written_path = _write_rows_with_fallback(output_path, out_header + combined)
+    written_path = write_ap_csv(output_path, combined, header_rows=out_header, precision=10)
     logger.info(
         "extract_compensated_lr_diff_combined: wrote %d rows to %s",
         len(combined), written_path,
@@ -1287,7 +1869,7 @@ def extract_compensated_lr_diff_pair(
     """
     if not diff_path or not os.path.isfile(diff_path):
         raise FileNotFoundError(f"Diff CSV not found: {diff_path}")
-    lookup = _load_diff_lookup(diff_path)
+    lookup = _load_diff_curve(diff_path)
     out1 = extract_compensated_lr_diff(
         input_path=input1_path, diff_path=diff_path,
         output_path=_resolve_lr_diff_output(output1_path, input1_path),
@@ -6,11 +6,112 @@ from .measurement_parser import MeasurementParser
 CALIBRATION_LOGGER = logging.getLogger("GainCalibration")
 CALIBRATION_LOGGER.setLevel(logging.INFO)
 
+
+def _load_channel(file_path: str, label: str) -> tuple:
+    """
+    Parse a measurement and return Ch1 as (frequencies, levels, order) sorted by frequency.
+
+    *order* maps each sorted position to its row in the file (None if the file
+    was already ascending), so ties can still be resolved in file order.
+    """
+    data = MeasurementParser.parse_measurement_csv(file_path, as_arrays=True)
+    if len(data["channels"]) > 1:
+        CALIBRATION_LOGGER.warning("%s file contains %d channels. Using Channel 1 only.",
+                                   label, len(data["channels"]))
+    channel = data["channels"]["Ch1"]
+    freqs = np.asarray(channel["frequencies"], dtype=float)
+    levels = np.asarray(channel["levels"], dtype=float)
+    order = None
+    if np.any(freqs[1:] < freqs[:-1]):
+        order = np.argsort(freqs, kind="stable")
+        freqs, levels = freqs[order], levels[order]
+    return freqs, levels, order
+
+
+def _nearest_bins(grid: np.ndarray, targets: np.ndarray, order: np.ndarray = None) -> np.ndarray:
+    """
+    Index of the closest grid point for every target (grid sorted ascending).
+
+    Same choice as ``np.abs(freqs - f).argmin()`` on the file's rows: of
+    repeated or equidistant frequencies, the one that comes first in the file.
+    *order* is the stable sort order from _load_channel; without it the grid
+    is the file order, so a tie goes to the lower bin.
+    """
+    if len(grid) == 1:
+        return np.zeros(len(targets), dtype=np.intp)
+    right = np.clip(np.searchsorted(grid, targets, side="left"), 1, len(grid) - 1)
+    left = right - 1
+    # First of each run of repeated frequencies; the stable sort keeps it first in the file too.
+    left = np.searchsorted(grid, grid[left], side="left")
+    d_left = targets - grid[left]
+    d_right = grid[right] - targets
+    prefer_left = d_left < d_right
+    if order is None:
+        prefer_left |= d_left == d_right
+    else:
+        prefer_left |= (d_left == d_right) & (order[left] < order[right])
+    return np.where(prefer_left, left, right)
+
+
+def _levels_at(grid: np.ndarray, levels: np.ndarray, targets: np.ndarray, fraction=None, order=None) -> tuple:
+    """
+    Level and nearest bin frequency at each target.
+
+    With *fraction*, the level is the 1/fraction-octave band average around the
+    target (in linear pressure, like octave smoothing); bands without a grid
+    point fall back to the nearest bin.
+    """
+    nearest = _nearest_bins(grid, targets, order)
+    values = levels[nearest]
+    if fraction:
+        half_width = 2.0 ** (1.0 / (2.0 * fraction))
+        lo = np.searchsorted(grid, targets / half_width, side="left")
+        hi = np.searchsorted(grid, targets * half_width, side="right")
+        prefix = np.concatenate(([0.0], np.cumsum(10.0 ** (levels / 20.0))))
+        in_band = hi > lo
+        band_mean = (prefix[hi[in_band]] - prefix[lo[in_band]]) / (hi[in_band] - lo[in_band])
+        values = values.copy()
+        values[in_band] = 20.0 * np.log10(band_mean)
+    return values, grid[nearest]
+
+
+def _check_weights(weights, count: int):
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (count,) or np.any(weights < 0) or not weights.sum() > 0:
+        raise ValueError("weights must give one non-negative value per frequency with a positive sum.")
+    return weights
+
+
+def _gain_result(frequencies, input_at: tuple, target_at: tuple, weights) -> dict:
+    input_levels, input_freqs = input_at
+    target_levels, target_freqs = target_at
+    gain_differences = target_levels - input_levels
+    calibration_results = {
+        freq: {
+            "gain_difference_db": float(gain_diff),
+            "actual_input_freq": float(input_freq),
+            "actual_target_freq": float(target_freq),
+        }
+        for freq, gain_diff, input_freq, target_freq in zip(
+            frequencies, gain_differences, input_freqs, target_freqs
+        )
+    }
+    # Average gain difference, limited to +/- 2.0 and rounded to two decimals
+    mean = np.mean(gain_differences) if weights is None else np.average(gain_differences, weights=weights)
+    return {
+        "frequency_results": calibration_results,
+        "average_gain_db": float(np.clip(np.round(mean, 2), -2.0, 2.0)),
+    }
+
+
 class GainCalibration:
     """Handles gain calibration calculations between input and target measurements."""
 
     @staticmethod
-    def calculate_gain_difference(input_file: str, target_file: str, frequencies: list) -> dict:
+    def calculate_gain_difference(input_file: str, target_file: str, frequencies: list,
+                                  fraction: int = None, weights: list = None) -> dict:
         """
         Calculates gain differences between input and target measurements at specified frequencies.
 
@@ -18,6 +119,9 @@ class GainCalibration:
             input_file (str): Path to input measurement CSV
             target_file (str): Path to target/reference measurement CSV
             frequencies (list): List of frequencies to analyze
+            fraction (int, optional): Compare 1/fraction-octave band averages around
+                each frequency instead of the nearest bins
+            weights (list, optional): Weight per frequency for the average
 
         Returns:
             dict: Results containing per-frequency and average gain differences
@@ -25,57 +129,61 @@ class GainCalibration:
         CALIBRATION_LOGGER.info("Starting gain calibration calculation")
         
         try:
-            # Parse both measurement files
-            input_data = MeasurementParser.parse_measurement_csv(input_file)
-            target_data = MeasurementParser.parse_measurement_csv(target_file)
-            
-            # Warn if multiple channels found
-            if len(input_data["channels"]) > 1:
-                CALIBRATION_LOGGER.warning("Input file contains %d channels. Using Channel 1 only.", 
-                                         len(input_data["channels"]))
-            if len(target_data["channels"]) > 1:
-                CALIBRATION_LOGGER.warning("Target file contains %d channels. Using Channel 1 only.", 
-                                         len(target_data["channels"]))
-            
-            # Extract Channel 1 data
-            input_ch = input_data["channels"]["Ch1"]
-            target_ch = target_data["channels"]["Ch1"]
-            
-            input_freqs = np.array(input_ch["frequencies"])
-            input_levels = np.array(input_ch["levels"])
-            target_freqs = np.array(target_ch["frequencies"])
-            target_levels = np.array(target_ch["levels"])
-            
-            calibration_results = {}
-            gain_differences = []
-            
-            # Calculate gain difference for each requested frequency
-            for freq in frequencies:
-                # Find closest frequency bins
-                input_idx = np.abs(input_freqs - freq).argmin()
-                target_idx = np.abs(target_freqs - freq).argmin()
-                
-                # Get actual frequencies and levels
-                actual_input_freq = input_freqs[input_idx]
-                actual_target_freq = target_freqs[target_idx]
-                gain_diff = target_levels[target_idx] - input_levels[input_idx]
-                gain_differences.append(gain_diff)
-                
-                calibration_results[freq] = {
-                    "gain_difference_db": float(gain_diff),
-                    "actual_input_freq": float(actual_input_freq),
-                    "actual_target_freq": float(actual_target_freq)
-                }
-            
-            # Calculate average gain difference, limit to +/- 2.0 and round to two decimals
-            average_gain = float(np.clip(np.round(np.mean(gain_differences), 2), -2.0, 2.0))
-            
+            targets = np.asarray(frequencies, dtype=float)
+            weights = _check_weights(weights, len(targets))
+            input_freqs, input_levels, input_order = _load_channel(input_file, "Input")
+            target_freqs, target_levels, target_order = _load_channel(target_file, "Target")
+
+            result = _gain_result(
+                frequencies,
+                _levels_at(input_freqs, input_levels, targets, fraction, input_order),
+                _levels_at(target_freqs, target_levels, targets, fraction, target_order),
+                weights,
+            )
             CALIBRATION_LOGGER.info("Gain calibration completed successfully")
-            return {
-                "frequency_results": calibration_results,
-                "average_gain_db": average_gain
-            }
+            return result
             
         except Exception as e:
             CALIBRATION_LOGGER.error("Gain calibration failed: %s", str(e))
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def calculate_gain_differences(input_files: list, target_file: str, frequencies: list,
+                                   fraction: int = None, weights: list = None) -> dict:
+        """
+        Calibrates many input measurements against one target in a single call.
+
+        The target is parsed and evaluated once; each input costs one parse and
+        one ``searchsorted``. Useful to scan a station's measurement history for
+        drift.
+
+        Args:
+            input_files (list): Paths to input measurement CSVs
+            target_file (str): Path to target/reference measurement CSV
+            frequencies (list): List of frequencies to analyze
+            fraction (int, optional): Band averaging as in calculate_gain_difference
+            weights (list, optional): Weight per frequency for the average
+
+        Returns:
+            dict: ``{input path: result}`` in input order; the result is the
+            calculate_gain_difference dict, or ``{"error": "..."}`` for a file
+            that could not be calibrated.
+        """
+        targets = np.asarray(frequencies, dtype=float)
+        weights = _check_weights(weights, len(targets))
+        target_freqs, target_levels, target_order = _load_channel(target_file, "Target")
+        target_at = _levels_at(target_freqs, target_levels, targets, fraction, target_order)
+
+        results = {}
+        for input_file in input_files:
+            try:
+                input_freqs, input_levels, input_order = _load_channel(input_file, "Input")
+                results[input_file] = _gain_result(
+                    frequencies, _levels_at(input_freqs, input_levels, targets, fraction, input_order),
+                    target_at, weights,
+                )
+            except Exception as e:
+                CALIBRATION_LOGGER.error("Gain calibration failed for %s: %s", input_file, e)
+                results[input_file] = {"error": f"{type(e).__name__}: {e}"}
+        CALIBRATION_LOGGER.info("Batch gain calibration completed: %d file(s)", len(results))
+        return results
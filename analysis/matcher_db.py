@@ -0,0 +1,228 @@
+"""
+matcher_db.py
+
+Storage format of the matcher SQLite database (Matching_App/Data/db/matcher.db):
+schema, level/frequency encoding and the migration from the JSON TEXT layout.
+The workstation upload path and the Matching App (app/database.py) both use
+this module, so there is one definition of the format.
+
+Schema (PRAGMA user_version = SCHEMA_VERSION)
+---------------------------------------------
+frequency_vectors:
+    id INTEGER PRIMARY KEY AUTOINCREMENT
+    n_points INTEGER NOT NULL
+    frequencies BLOB NOT NULL       -- little-endian float64
+
+drivers:
+    serial TEXT PRIMARY KEY
+    side TEXT NOT NULL
+    levels BLOB NOT NULL            -- little-endian float32, one per frequency
+    freq_id INTEGER                 -- frequency_vectors.id, NULL if unknown
+    status, partner, loaded_at, matched_at as before
+
+driver_levels_raw (optional, see upload_measurement --keep-raw-levels):
+    serial TEXT PRIMARY KEY
+    frequencies BLOB NOT NULL       -- float64
+    levels BLOB NOT NULL            -- float32
+
+Databases written before version 1 store levels and the single frequency
+vector (table ``frequency_vector``, id = 1) as JSON TEXT. They are migrated on
+first connection through ensure_schema, by the workstation upload or the
+Matching App's init_db, whichever opens them first.
+"""
+
+import json
+import logging
+import sqlite3
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+LEVELS_DTYPE = np.dtype("<f4")
+FREQS_DTYPE = np.dtype("<f8")
+
+_CREATE_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS frequency_vectors (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        n_points    INTEGER NOT NULL,
+        frequencies BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drivers (
+        serial      TEXT PRIMARY KEY,
+        side        TEXT NOT NULL,
+        levels      BLOB NOT NULL,
+        freq_id     INTEGER REFERENCES frequency_vectors(id),
+        status      TEXT NOT NULL DEFAULT 'unmatched',
+        partner     TEXT,
+        loaded_at   TEXT NOT NULL,
+        matched_at  TEXT
+    )
+    """,
+)
+
+_CREATE_RAW_TABLE = """
+    CREATE TABLE IF NOT EXISTS driver_levels_raw (
+        serial      TEXT PRIMARY KEY,
+        frequencies BLOB NOT NULL,
+        levels      BLOB NOT NULL
+    )
+"""
+
+
+def encode_levels(levels) -> bytes:
+    """Levels (dB) as a float32 BLOB."""
+    return np.asarray(levels, dtype=LEVELS_DTYPE).tobytes()
+
+
+def encode_frequencies(frequencies) -> bytes:
+    """Frequencies (Hz) as a float64 BLOB."""
+    return np.asarray(frequencies, dtype=FREQS_DTYPE).tobytes()
+
+
+def decode_levels(value) -> np.ndarray:
+    """Stored levels as a float64 array; accepts a BLOB or legacy JSON TEXT."""
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=LEVELS_DTYPE).astype(np.float64)
+    return np.asarray(json.loads(value) if value else [], dtype=np.float64)
+
+
+def decode_frequencies(value) -> np.ndarray:
+    """Stored frequencies as a float64 array; accepts a BLOB or legacy JSON TEXT."""
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=FREQS_DTYPE).copy()
+    return np.asarray(json.loads(value) if value else [], dtype=np.float64)
+
+
+def _table_exists(con: sqlite3.Connection, name: str) -> bool:
+    return con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def frequency_vector_id(cur: sqlite3.Cursor, frequencies) -> int:
+    """Return the id of *frequencies* in frequency_vectors, inserting it if new."""
+    blob = encode_frequencies(frequencies)
+    row = cur.execute("SELECT id FROM frequency_vectors WHERE frequencies = ?", (blob,)).fetchone()
+    if row is not None:
+        return row[0]
+    cur.execute(
+        "INSERT INTO frequency_vectors (n_points, frequencies) VALUES (?, ?)",
+        (len(blob) // FREQS_DTYPE.itemsize, blob),
+    )
+    return cur.lastrowid
+
+
+def first_frequency_vector(cur: sqlite3.Cursor, n_points: int = None):
+    """The oldest stored frequency vector (with *n_points* points, if given) as an array, or None."""
+    if n_points is None:
+        row = cur.execute("SELECT frequencies FROM frequency_vectors ORDER BY id LIMIT 1").fetchone()
+    else:
+        row = cur.execute(
+            "SELECT frequencies FROM frequency_vectors WHERE n_points = ? ORDER BY id LIMIT 1",
+            (n_points,),
+        ).fetchone()
+    return decode_frequencies(row[0]) if row else None
+
+
+def _migrate(con: sqlite3.Connection) -> bool:
+    """Convert a JSON TEXT database to the BLOB layout; True if anything was converted."""
+    if _table_exists(con, "frequency_vectors") or not _table_exists(con, "drivers"):
+        return False
+
+    con.execute(_CREATE_STATEMENTS[0])
+    legacy_freqs = None
+    if _table_exists(con, "frequency_vector"):
+        row = con.execute("SELECT frequencies FROM frequency_vector WHERE id = 1").fetchone()
+        if row is not None:
+            legacy_freqs = decode_frequencies(row[0])
+            con.execute(
+                "INSERT INTO frequency_vectors (id, n_points, frequencies) VALUES (1, ?, ?)",
+                (len(legacy_freqs), encode_frequencies(legacy_freqs)),
+            )
+        con.execute("DROP TABLE frequency_vector")
+
+    # Drivers whose level count does not match the old single vector never had a valid axis
+    con.execute("ALTER TABLE drivers RENAME TO drivers_json")
+    con.execute(_CREATE_STATEMENTS[1])
+    rows = con.execute(
+        "SELECT serial, side, levels, status, partner, loaded_at, matched_at FROM drivers_json"
+    ).fetchall()
+    con.executemany(
+        "INSERT INTO drivers (serial, side, levels, freq_id, status, partner, loaded_at, matched_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (serial, side, encode_levels(levels),
+             1 if legacy_freqs is not None and len(levels) == len(legacy_freqs) else None,
+             status, partner, loaded_at, matched_at)
+            for serial, side, levels, status, partner, loaded_at, matched_at in (
+                (r[0], r[1], decode_levels(r[2]), *r[3:]) for r in rows
+            )
+        ],
+    )
+    con.execute("DROP TABLE drivers_json")
+
+    if _table_exists(con, "driver_levels_raw"):
+        con.execute("ALTER TABLE driver_levels_raw RENAME TO driver_levels_raw_json")
+        con.execute(_CREATE_RAW_TABLE)
+        con.executemany(
+            "INSERT INTO driver_levels_raw (serial, frequencies, levels) VALUES (?, ?, ?)",
+            [
+                (serial, encode_frequencies(decode_frequencies(freqs)), encode_levels(decode_levels(levels)))
+                for serial, freqs, levels in con.execute(
+                    "SELECT serial, frequencies, levels FROM driver_levels_raw_json"
+                ).fetchall()
+            ],
+        )
+        con.execute("DROP TABLE driver_levels_raw_json")
+    logger.info("Matcher DB: converted %d driver rows to float32 BLOB levels", len(rows))
+    return True
+
+
+def ensure_schema(con: sqlite3.Connection) -> None:
+    """
+    Create the matcher tables, migrating a JSON TEXT database first.
+
+    PRAGMA user_version makes this a single cheap read once the DB is up to
+    date. The migration runs in one BEGIN IMMEDIATE transaction, so a station
+    that opens the DB at the same time waits and then finds it migrated. The
+    file is vacuumed afterwards to give the freed pages back.
+    """
+    if con.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    migrated = False
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        if con.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            con.rollback()
+            return
+        migrated = _migrate(con)
+        for statement in _CREATE_STATEMENTS:
+            con.execute(statement)
+        con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    if migrated:
+        con.execute("VACUUM")
+
+
+def write_raw_levels(cur: sqlite3.Cursor, rows) -> None:
+    """Keep full-resolution curves in driver_levels_raw; *rows* are (serial, frequencies, levels)."""
+    cur.execute(_CREATE_RAW_TABLE)
+    cur.executemany(
+        "INSERT OR REPLACE INTO driver_levels_raw (serial, frequencies, levels) VALUES (?, ?, ?)",
+        [(serial, encode_frequencies(freqs), encode_levels(levels)) for serial, freqs, levels in rows],
+    )
+
+
+def delete_raw_levels(cur: sqlite3.Cursor, serials) -> None:
+    """Drop stale full-resolution curves of *serials*, if the side table exists."""
+    if _table_exists(cur.connection, "driver_levels_raw"):
+        cur.executemany("DELETE FROM driver_levels_raw WHERE serial = ?", [(serial,) for serial in serials])
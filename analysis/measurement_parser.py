@@ -1,7 +1,9 @@
 import logging
-import csv
+from typing import Optional
+
 import numpy as np
-import math
+
+from .csv_processing import read_ap_csv, read_ap_csv_chunks
 
 # Configure local logger
 PARSER_LOGGER = logging.getLogger("MeasurementParser")
@@ -11,12 +13,19 @@ class MeasurementParser:
     """Handles CSV measurement file parsing."""
     
     @staticmethod
-    def parse_measurement_csv(file_path: str):
+    def parse_measurement_csv(file_path: str, chunk_rows: Optional[int] = None, as_arrays: bool = False):
         """
         Parses a measurement CSV file with dynamic channel count.
 
         Args:
             file_path (str): Path to the measurement CSV file.
+            chunk_rows (int, optional): Read the file in blocks of this many rows
+                instead of all at once; the result is the same, but the raw text
+                is never held in memory as a whole.
+            as_arrays (bool): Return 'frequencies' and 'levels' as float64 NumPy
+                arrays instead of lists. Callers that compute on or store the
+                data skip the list round trip; convert with ``.tolist()`` where
+                the data is serialised.
 
         Returns:
             dict: {
@@ -30,22 +39,16 @@ class MeasurementParser:
         PARSER_LOGGER.info("Starting to parse measurement file: %s", file_path)
         
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = [l.strip() for l in f if l.strip()]
-
-            # Find units row (containing 'Hz' and 'dB')
-            units_idx = None
-            for i, line in enumerate(lines):
-                if "Hz" in line and "dB" in line:
-                    units_idx = i
-                    break
-            if units_idx is None:
-                PARSER_LOGGER.error("No units header (Hz,dB...) found")
-                raise ValueError("No units header (Hz,dB...) found")
+            # Header ends at the units row (containing 'Hz' and 'dB')
+            if chunk_rows is None:
+                table = read_ap_csv(file_path, header_rows=None)
+                header_rows, blocks = table.header_rows, [table.data]
+            else:
+                header_rows, chunks = read_ap_csv_chunks(file_path, header_rows=None, chunk_rows=chunk_rows)
+                blocks = list(chunks)
 
             # Extract units columns
-            units_tokens = [t for t in lines[units_idx].split(",") if t]
-            data_lines = lines[units_idx + 1:]
+            units_tokens = [t for t in header_rows[-1] if t]
 
             def _unit_for_pair(pair_index):
                 try:
@@ -53,23 +56,11 @@ class MeasurementParser:
                 except IndexError:
                     return "dB"
 
-            # Parse data rows
-            rows = []
-            reader = csv.reader(data_lines)
-            for row in reader:
-                row = [c.strip() for c in row if c.strip() != ""]
-                if not row:
-                    continue
-                rows.append(row)
-
-            if not rows:
-                PARSER_LOGGER.error("No data lines found")
-                raise ValueError("No data lines found")
-
-            # Validate column count
-            col_count = len(rows[0])
-            if any(len(r) != col_count for r in rows):
-                rows = [r for r in rows if len(r) == col_count]
+            # Drop empty columns, then any row that is not complete
+            non_empty = np.zeros(blocks[0].shape[1], dtype=bool)
+            for block in blocks:
+                non_empty |= ~np.isnan(block).all(axis=0)
+            col_count = int(np.count_nonzero(non_empty))
 
             if col_count % 2 != 0:
                 PARSER_LOGGER.error("Expected even column count, found: %d", col_count)
@@ -78,40 +69,31 @@ class MeasurementParser:
             channel_count = col_count // 2
             PARSER_LOGGER.info("Found %d channels in measurement file", channel_count)
 
-            channels = {}
-            
-            # Convert to numeric arrays
-            cols_numeric = []
-            for r in rows:
-                numeric = []
-                for c in r:
-                    try:
-                        numeric.append(float(c))
-                    except ValueError:
-                        numeric.append(math.nan)
-                cols_numeric.append(numeric)
-
-            arr = np.array(cols_numeric, dtype=float)
-            mask_valid = ~np.isnan(arr).any(axis=1)
-            arr = arr[mask_valid]
+            complete = []
+            for block in blocks:
+                arr = block[:, non_empty]
+                complete.append(arr[~np.isnan(arr).any(axis=1)])
+            arr = complete[0] if len(complete) == 1 else np.concatenate(complete)
+            data_points = arr.shape[0]
+            total_rows = sum(len(block) for block in blocks)
 
+            channels = {}
             for ch_index in range(channel_count):
-                freq_col = arr[:, 2 * ch_index]
-                level_col = arr[:, 2 * ch_index + 1]
-                ch_name = f"Ch{ch_index + 1}"
-                channels[ch_name] = {
-                    "frequencies": freq_col.tolist(),
-                    "levels": level_col.tolist(),
+                freq_col = np.ascontiguousarray(arr[:, 2 * ch_index])
+                level_col = np.ascontiguousarray(arr[:, 2 * ch_index + 1])
+                channels[f"Ch{ch_index + 1}"] = {
+                    "frequencies": freq_col if as_arrays else freq_col.tolist(),
+                    "levels": level_col if as_arrays else level_col.tolist(),
                     "unit": _unit_for_pair(ch_index),
-                    "data_points": int(len(freq_col))
+                    "data_points": int(data_points),
                 }
 
-            PARSER_LOGGER.info("Successfully parsed measurement file with %d data points", len(rows))
+            PARSER_LOGGER.info("Successfully parsed measurement file with %d data points", total_rows)
             return {
                 "channels": channels,
-                "data_points": int(arr.shape[0])
+                "data_points": int(data_points)
             }
             
         except Exception as e:
             PARSER_LOGGER.error("Failed to parse measurement file: %s", str(e))
-            raise
\ No newline at end of file
+            raise
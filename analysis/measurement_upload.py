@@ -1,21 +1,33 @@
 import json
 import logging
 import math
+import re
 import sqlite3
 import time
 from datetime import datetime
 from pathlib import Path
+import numpy as np
+
+from . import matcher_db
 from .measurement_parser import MeasurementParser
 
 # Configure local logger
 UPLOAD_LOGGER = logging.getLogger("MeasurementUpload")
 UPLOAD_LOGGER.setLevel(logging.INFO)
 
+# IA/IB serial in a measurement file name (bulk upload)
+_SERIAL_PATTERN = r"I[AB][0-9A-Za-z]+"
+
+
+def _as_list(values):
+    """Channel data as a plain list for JSON; prepare_upload(as_arrays=True) keeps NumPy arrays."""
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
 class MeasurementUpload:
     """Handles measurement data upload preparation."""
 
     @staticmethod
-    def prepare_upload(measurement_path: str, serial_number: str, workstation_id: str):
+    def prepare_upload(measurement_path: str, serial_number: str, workstation_id: str, as_arrays: bool = False):
         """
         Prepares measurement data for upload to service.
 
@@ -23,6 +35,9 @@ class MeasurementUpload:
             measurement_path (str): Path to measurement CSV file
             serial_number (str): Device serial number
             workstation_id (str): Workstation identifier
+            as_arrays (bool): Keep channel frequencies/levels as NumPy arrays
+                (see MeasurementParser.parse_measurement_csv). The local writers
+                accept both; anything that JSON-encodes the dict itself needs lists.
 
         Returns:
             dict: Formatted data ready for service upload
@@ -31,7 +46,7 @@ class MeasurementUpload:
         
         try:
             # Parse measurement data
-            measurement_data = MeasurementParser.parse_measurement_csv(measurement_path)
+            measurement_data = MeasurementParser.parse_measurement_csv(measurement_path, as_arrays=as_arrays)
             
             # Format for upload
             upload_data = {
@@ -69,6 +84,10 @@ class MeasurementUpload:
 
             # Inner parsed data has the channels
             measurement_data = upload_data.get("measurement_data", {})
+            for ch_data in measurement_data.get("channels", {}).values():
+                for key in ("frequencies", "levels"):
+                    if key in ch_data:
+                        ch_data[key] = _as_list(ch_data[key])
 
             # Load existing JSON or create base structure
             if json_file.exists():
@@ -160,104 +179,170 @@ class MeasurementUpload:
             return {"error": str(e)}
 
     @staticmethod
-    def _resample_log(freqs: list, levels: list, n: int = 300) -> tuple:
-        """Resample linearly-spaced (freqs, levels) to n log-spaced points.
+    def _resample_log(freqs, levels, n: int = 300, grid=None) -> tuple:
+        """Resample (freqs, levels) to n log-spaced points.
 
         AP sweeps often use linear frequency spacing with thousands of points.
         Storing and displaying them on a log scale causes visual clutter at high
         frequencies.  Resampling to log-spaced points gives uniform density
         across the audible range and reduces DB storage by ~95%.
+
+        Levels are interpolated linearly in frequency (``np.interp``). Pass
+        *grid* to resample onto an existing frequency vector instead; it must
+        lie within the sweep (see ``_covers``), since np.interp holds the end
+        values outside it. Curves with fewer than n points are resampled too,
+        so every stored curve of one DB sits on a log grid.
+
+        Returns:
+            (frequencies, levels) as float64 arrays; the input unchanged if it
+            has fewer than 2 points.
         """
-        if len(freqs) < 2 or len(freqs) <= n:
+        freqs = np.asarray(freqs, dtype=float)
+        levels = np.asarray(levels, dtype=float)
+        if len(freqs) < 2:
             return freqs, levels
-        f_min = max(freqs[0], 1e-6)
-        f_max = freqs[-1]
-        log_min = math.log10(f_min)
-        log_max = math.log10(f_max)
-        step = (log_max - log_min) / (n - 1)
-        targets = [10 ** (log_min + i * step) for i in range(n)]
-        out_f, out_l = [], []
-        j = 0
-        src_len = len(freqs)
-        for tf in targets:
-            while j < src_len - 2 and freqs[j + 1] < tf:
-                j += 1
-            x0, x1 = freqs[j], freqs[j + 1]
-            y0, y1 = levels[j], levels[j + 1]
-            lv = y0 if x1 == x0 else y0 + (y1 - y0) * (tf - x0) / (x1 - x0)
-            out_f.append(tf)
-            out_l.append(lv)
-        return out_f, out_l
+        if np.any(freqs[1:] < freqs[:-1]):
+            order = np.argsort(freqs, kind="stable")
+            freqs, levels = freqs[order], levels[order]
+        if grid is None:
+            log_min = math.log10(max(freqs[0], 1e-6))
+            log_max = math.log10(freqs[-1])
+            grid = 10.0 ** np.linspace(log_min, log_max, n)
+        grid = np.asarray(grid, dtype=float)
+        return grid, np.interp(grid, freqs, levels)
+
+    @staticmethod
+    def _covers(freqs, grid, rel_tol: float = 1e-6) -> bool:
+        """True if the sweep *freqs* spans *grid* (up to float rounding of the end points)."""
+        return (min(freqs) <= grid[0] * (1 + rel_tol)) and (max(freqs) >= grid[-1] * (1 - rel_tol))
 
     @staticmethod
-    def write_measurement_local_db(upload_data: dict, serial_number: str, db_path: str) -> dict:
+    def _ingest_settings(db_file: Path, resample_points, keep_raw) -> tuple:
+        """
+        (resample_points, keep_raw) for a matcher DB.
+
+        Explicit arguments win; otherwise the Matching App settings.json next to
+        the DB (one DB per product) supplies ``resample_points`` and
+        ``keep_raw_levels``.
+        """
+        settings = {}
+        settings_path = db_file.parent / "settings.json"
+        if (resample_points is None or keep_raw is None) and settings_path.is_file():
+            with settings_path.open("r", encoding="utf-8") as f:
+                settings = json.load(f)
+        if resample_points is None:
+            resample_points = settings.get("resample_points") or 0
+        if keep_raw is None:
+            keep_raw = bool(settings.get("keep_raw_levels", False))
+        return int(resample_points), keep_raw
+
+    @staticmethod
+    def _matching_side(serial_number: str):
+        """'left' for IA serials, 'right' for IB serials, None outside the matching pool."""
+        if serial_number.startswith("IA"):
+            return "left"
+        if serial_number.startswith("IB"):
+            return "right"
+        return None
+
+    @staticmethod
+    def _ch1_curve(upload_data: dict):
+        """(frequencies, levels) of Ch1 as lists, or None if there are no levels."""
+        measurement_data = upload_data.get("measurement_data", {})
+        channels = measurement_data.get("channels", {}) if isinstance(measurement_data, dict) else {}
+        ch1 = channels.get("Ch1", {})
+        levels = _as_list(ch1.get("levels"))
+        if not isinstance(levels, list) or not levels:
+            return None
+        return _as_list(ch1.get("frequencies")), levels
+
+    @staticmethod
+    def _stored_curve(cur, serial_number: str, freqs, levels, resample_points: int, grids: dict) -> tuple:
+        """
+        (levels BLOB, freq_id) to store for one Ch1 curve.
+
+        *grids* caches the resampling grid per point count for one transaction,
+        so the first resampled curve defines it for the ones after it. A curve
+        that does not span that grid is resampled over its own range instead
+        and stored under a frequency vector of its own.
+        """
+        if resample_points and freqs is not None and len(freqs) == len(levels) and len(freqs) >= 2:
+            if resample_points not in grids:
+                # Reuse the DB grid once one exists, so every driver is on the same points
+                grids[resample_points] = matcher_db.first_frequency_vector(cur, resample_points)
+            grid = grids[resample_points]
+            if grid is not None and not MeasurementUpload._covers(freqs, grid):
+                UPLOAD_LOGGER.warning(
+                    "%s spans %.1f-%.1f Hz, less than the DB grid (%.1f-%.1f Hz); stored on its own grid",
+                    serial_number, min(freqs), max(freqs), grid[0], grid[-1],
+                )
+                freqs, levels = MeasurementUpload._resample_log(freqs, levels, resample_points)
+            else:
+                freqs, levels = MeasurementUpload._resample_log(freqs, levels, resample_points, grid)
+                grids[resample_points] = freqs
+        freq_id = None
+        if freqs is not None and len(freqs) == len(levels):
+            freq_id = matcher_db.frequency_vector_id(cur, freqs)
+        else:
+            UPLOAD_LOGGER.warning(
+                "No frequency vector matching %d levels for %s; stored without one",
+                len(levels), serial_number,
+            )
+        return matcher_db.encode_levels(levels), freq_id
+
+    @staticmethod
+    def _connect_matcher_db(db_file: Path) -> sqlite3.Connection:
+        con = sqlite3.connect(str(db_file))
+        con.execute("PRAGMA journal_mode=DELETE")
+        con.execute("PRAGMA busy_timeout=5000")
+        # Ensure matcher schema exists for standalone local usage.
+        matcher_db.ensure_schema(con)
+        return con
+
+    @staticmethod
+    def write_measurement_local_db(upload_data: dict, serial_number: str, db_path: str,
+                                   resample_points: int = None, keep_raw: bool = None) -> dict:
         """
         Writes a prepared measurement directly into the local matcher SQLite database.
 
         Existing rows are updated when status is 'unmatched' or 'matched'.
         Paired rows are rejected and must be unpaired first.
+
+        With ``resample_points`` (or ``resample_points`` in the DB's settings.json)
+        Ch1 levels are resampled to that many log-spaced points before they are
+        stored. The first such upload defines the DB frequency vector; later
+        uploads are resampled onto it so all drivers stay comparable. With
+        ``keep_raw`` the full-resolution curve is kept in ``driver_levels_raw``.
         """
         try:
             db_file = Path(db_path)
             db_file.parent.mkdir(parents=True, exist_ok=True)
+            resample_points, keep_raw = MeasurementUpload._ingest_settings(db_file, resample_points, keep_raw)
 
-            measurement_data = upload_data.get("measurement_data", {})
-            channels = measurement_data.get("channels", {}) if isinstance(measurement_data, dict) else {}
-            ch1 = channels.get("Ch1", {})
-            levels = ch1.get("levels")
-            freqs = ch1.get("frequencies")
-
-            if not isinstance(levels, list) or not levels:
+            curve = MeasurementUpload._ch1_curve(upload_data)
+            if curve is None:
                 return {"error": "No Ch1 levels found in measurement data"}
+            raw_freqs, raw_levels = curve
 
-            if serial_number.startswith("IA"):
-                side = "left"
-            elif serial_number.startswith("IB"):
-                side = "right"
-            else:
+            side = MeasurementUpload._matching_side(serial_number)
+            if side is None:
                 return {"error": f"Unsupported serial prefix for matching pool: {serial_number}"}
 
-            con = sqlite3.connect(str(db_file))
+            con = MeasurementUpload._connect_matcher_db(db_file)
             cur = con.cursor()
-            cur.execute("PRAGMA journal_mode=DELETE")
-            cur.execute("PRAGMA busy_timeout=5000")
-
-            # Ensure matcher schema exists for standalone local usage.
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS frequency_vector (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    frequencies TEXT NOT NULL
-                )
-            """)
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS drivers (
-                    serial      TEXT PRIMARY KEY,
-                    side        TEXT NOT NULL,
-                    levels      TEXT NOT NULL,
-                    status      TEXT NOT NULL DEFAULT 'unmatched',
-                    partner     TEXT,
-                    loaded_at   TEXT NOT NULL,
-                    matched_at  TEXT
-                )
-            """)
-
-            freqs = ch1.get("frequencies")
-            if isinstance(freqs, list) and freqs:
-                cur.execute("SELECT id FROM frequency_vector WHERE id = 1")
-                if cur.fetchone() is None:
-                    cur.execute(
-                        "INSERT INTO frequency_vector (id, frequencies) VALUES (1, ?)",
-                        (json.dumps(freqs),),
-                    )
 
+            levels_blob, freq_id = MeasurementUpload._stored_curve(
+                cur, serial_number, raw_freqs, raw_levels, resample_points, {},
+            )
             now = datetime.now().isoformat()
             cur.execute("SELECT status, partner FROM drivers WHERE serial = ?", (serial_number,))
             row = cur.fetchone()
 
             if row is None:
                 cur.execute(
-                    "INSERT INTO drivers (serial, side, levels, status, loaded_at) VALUES (?, ?, ?, 'unmatched', ?)",
-                    (serial_number, side, json.dumps(levels), now),
+                    "INSERT INTO drivers (serial, side, levels, freq_id, status, loaded_at) "
+                    "VALUES (?, ?, ?, ?, 'unmatched', ?)",
+                    (serial_number, side, levels_blob, freq_id, now),
                 )
                 operation = "inserted"
             else:
@@ -293,11 +378,17 @@ class MeasurementUpload:
                     }
 
                 cur.execute(
-                    "UPDATE drivers SET side = ?, levels = ?, loaded_at = ? WHERE serial = ?",
-                    (side, json.dumps(levels), now, serial_number),
+                    "UPDATE drivers SET side = ?, levels = ?, freq_id = ?, loaded_at = ? WHERE serial = ?",
+                    (side, levels_blob, freq_id, now, serial_number),
                 )
                 operation = "updated"
 
+            if keep_raw:
+                matcher_db.write_raw_levels(cur, [(serial_number, raw_freqs or [], raw_levels)])
+            else:
+                # Drop a stale full-resolution copy from an earlier upload
+                matcher_db.delete_raw_levels(cur, [serial_number])
+
             con.commit()
             con.close()
 
@@ -317,4 +408,147 @@ class MeasurementUpload:
 
         except (sqlite3.Error, OSError, KeyError, ValueError, TypeError) as e:
             UPLOAD_LOGGER.error("Failed to write measurement to local DB: %s", str(e))
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    @staticmethod
+    def write_measurements_local_db(measurements, db_path: str,
+                                    resample_points: int = None, keep_raw: bool = None) -> dict:
+        """
+        Writes many prepared measurements into the local matcher DB in one transaction.
+
+        Same rules as write_measurement_local_db: only IA/IB serials, 'matched'
+        rows (and their partners) are reset to 'unmatched', 'paired' and other
+        rows are left untouched. Rows are written with executemany and committed
+        once, so re-importing thousands of drivers costs one fsync instead of
+        one per driver.
+
+        Args:
+            measurements: Iterable of (serial_number, upload_data) pairs. A serial
+                that appears more than once keeps its last measurement.
+            db_path: Matcher DB path.
+            resample_points, keep_raw: As for write_measurement_local_db.
+
+        Returns:
+            dict: 'status', 'inserted' and 'updated' (serial lists), 'skipped'
+            ([(serial, reason)] for rows not written) and 'db_file'; or 'error'
+            when the transaction failed, in which case nothing was written.
+        """
+        db_file = Path(db_path)
+        con = None
+        try:
+            db_file.parent.mkdir(parents=True, exist_ok=True)
+            resample_points, keep_raw = MeasurementUpload._ingest_settings(db_file, resample_points, keep_raw)
+
+            skipped, latest = [], {}
+            for serial_number, upload_data in measurements:
+                if MeasurementUpload._matching_side(serial_number) is None:
+                    skipped.append((serial_number, "unsupported serial prefix"))
+                    continue
+                latest.pop(serial_number, None)
+                latest[serial_number] = upload_data
+
+            start = time.perf_counter()
+            con = MeasurementUpload._connect_matcher_db(db_file)
+            con.execute("BEGIN IMMEDIATE")
+            cur = con.cursor()
+            existing = {serial: (status, partner)
+                        for serial, status, partner in cur.execute("SELECT serial, status, partner FROM drivers")}
+
+            now = datetime.now().isoformat()
+            grids, inserts, updates, resets, raw_rows = {}, [], [], set(), []
+            for serial_number, upload_data in latest.items():
+                curve = MeasurementUpload._ch1_curve(upload_data)
+                if curve is None:
+                    skipped.append((serial_number, "no Ch1 levels"))
+                    continue
+                status, partner = existing.get(serial_number, (None, None))
+                if status not in (None, "unmatched", "matched"):
+                    skipped.append((serial_number, f"status {status}"))
+                    continue
+
+                levels_blob, freq_id = MeasurementUpload._stored_curve(
+                    cur, serial_number, curve[0], curve[1], resample_points, grids,
+                )
+                side = MeasurementUpload._matching_side(serial_number)
+                if status is None:
+                    inserts.append((serial_number, side, levels_blob, freq_id, now))
+                else:
+                    updates.append((side, levels_blob, freq_id, now, serial_number))
+                if status == "matched":
+                    # Matched is transient in this workflow: reset the affected pair back to unmatched.
+                    resets.update(s for s in (serial_number, partner) if s)
+                raw_rows.append((serial_number, curve[0] or [], curve[1]))
+
+            cur.executemany(
+                "UPDATE drivers SET status='unmatched', partner=NULL, matched_at=NULL WHERE serial = ?",
+                [(serial,) for serial in sorted(resets)],
+            )
+            cur.executemany(
+                "INSERT INTO drivers (serial, side, levels, freq_id, status, loaded_at) "
+                "VALUES (?, ?, ?, ?, 'unmatched', ?)",
+                inserts,
+            )
+            cur.executemany(
+                "UPDATE drivers SET side = ?, levels = ?, freq_id = ?, loaded_at = ? WHERE serial = ?",
+                updates,
+            )
+            if keep_raw:
+                matcher_db.write_raw_levels(cur, raw_rows)
+            else:
+                matcher_db.delete_raw_levels(cur, [row[0] for row in raw_rows])
+            con.commit()
+
+            UPLOAD_LOGGER.info(
+                "Bulk write to local DB: %d inserted, %d updated, %d skipped in %.2f s, db=%s",
+                len(inserts), len(updates), len(skipped), time.perf_counter() - start, db_file,
+            )
+            return {
+                "status": "success",
+                "inserted": [row[0] for row in inserts],
+                "updated": [row[-1] for row in updates],
+                "skipped": skipped,
+                "db_file": str(db_file.resolve()),
+            }
+
+        except (sqlite3.Error, OSError, KeyError, ValueError, TypeError) as e:
+            if con is not None:
+                con.rollback()
+            UPLOAD_LOGGER.error("Failed to bulk write measurements to local DB: %s", str(e))
+            return {"error": str(e)}
+        finally:
+            if con is not None:
+                con.close()
+
+    @staticmethod
+    def upload_measurements_local_db(measurement_paths, db_path: str, workstation_id: str,
+                                     serial_pattern: str = _SERIAL_PATTERN,
+                                     resample_points: int = None, keep_raw: bool = None) -> dict:
+        """
+        Parses measurement CSVs and writes them with write_measurements_local_db.
+
+        The serial number of each file is the first match of *serial_pattern*
+        in its file name (default: an IA/IB serial), else the file stem.
+
+        Returns:
+            dict: As write_measurements_local_db, plus 'failed' ([(path, error)]
+            for files that could not be parsed; the others are still written).
+        """
+        measurements, failed = [], []
+        for path in measurement_paths:
+            serial_number = MeasurementUpload.serial_from_filename(path, serial_pattern)
+            try:
+                measurements.append((serial_number, MeasurementUpload.prepare_upload(
+                    path, serial_number, workstation_id, as_arrays=True,
+                )))
+            except Exception as e:
+                failed.append((path, f"{type(e).__name__}: {e}"))
+        result = MeasurementUpload.write_measurements_local_db(measurements, db_path, resample_points, keep_raw)
+        result["failed"] = failed
+        return result
+
+    @staticmethod
+    def serial_from_filename(path: str, serial_pattern: str = _SERIAL_PATTERN) -> str:
+        """First match of *serial_pattern* in the file name of *path*, else its stem."""
+        stem = Path(path).stem
+        match = re.search(serial_pattern, stem) if serial_pattern else None
+        return match.group(0) if match else stem
@@ -0,0 +1,110 @@
+"""
+parse_cache.py
+
+Opt-in on-disk cache of parsed AP CSV files, used by ``read_ap_csv``.
+
+In one EOL sequence the same AP export is parsed by several workstation
+commands, each in a fresh process. With ``ADAM_CSV_CACHE_DIR`` set, the first
+parse stores the header rows and the float block as an uncompressed ``.npz``
+in that directory; later parses of the same file load it instead of parsing
+the text again.
+
+An entry is named after the absolute source path and holds the source size,
+mtime and a BLAKE2b hash of its bytes. The bytes are always read and hashed
+before an entry is used, so an export that APx overwrites in place (even with
+the same size and mtime) is re-parsed and its entry replaced.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "ADAM_CSV_CACHE_DIR"
+# 2: headers decoded strictly (UTF-8, then cp1252/latin-1) instead of dropping bad bytes
+_CACHE_VERSION = 2
+
+
+def cache_dir() -> Optional[str]:
+    """Return the configured cache directory, or None when caching is off."""
+    configured = os.getenv(CACHE_DIR_ENV_VAR, "").strip()
+    return configured or None
+
+
+def content_hash(raw: bytes) -> str:
+    """Hash of the source bytes stored with every entry."""
+    return hashlib.blake2b(raw, digest_size=20).hexdigest()
+
+
+def _entry_path(directory: str, source_path: str) -> str:
+    source = os.path.normcase(os.path.abspath(source_path))
+    digest = hashlib.blake2b(source.encode("utf-8"), digest_size=10).hexdigest()
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(directory, f"{stem}-{digest}.npz")
+
+
+def _identity(source_path: str, stat: os.stat_result, raw_hash: str, options: str) -> dict:
+    return {
+        "version": _CACHE_VERSION,
+        "path": os.path.abspath(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": raw_hash,
+        "options": options,
+    }
+
+
+def load(source_path: str, stat: os.stat_result, raw_hash: str, options: str):
+    """
+    Return the cached ``(header_rows, data)`` for a source file, or None.
+
+    ``stat`` and ``raw_hash`` describe the bytes the caller just read;
+    ``options`` encodes the reader arguments that shape the result.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    entry = _entry_path(directory, source_path)
+    if not os.path.isfile(entry):
+        return None
+    try:
+        with np.load(entry, allow_pickle=False) as cached:
+            if json.loads(str(cached["identity"])) != _identity(source_path, stat, raw_hash, options):
+                return None
+            return json.loads(str(cached["header"])), cached["data"]
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        logger.warning("Ignoring unreadable parse cache entry %s: %s", entry, e)
+        return None
+
+
+def store(source_path: str, stat: os.stat_result, raw_hash: str, options: str, header_rows, data) -> None:
+    """Write the parse result for a source file. Failures are logged, never raised."""
+    directory = cache_dir()
+    if directory is None:
+        return
+    entry = _entry_path(directory, source_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    identity=np.array(json.dumps(_identity(source_path, stat, raw_hash, options))),
+                    header=np.array(json.dumps(header_rows)),
+                    data=np.ascontiguousarray(data, dtype=float),
+                )
+            # Readers in other processes only ever see a complete entry
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Could not write parse cache entry %s: %s", entry, e)
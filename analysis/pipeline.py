@@ -0,0 +1,162 @@
+"""
+pipeline.py
+
+In-process runner for chains of csv_processing steps.
+
+Post-processing on a station is usually split → smooth → merge → filter
+reference → compensate, each step a separate ``adam_workstation.py`` call that
+re-reads the CSV the previous one wrote. A pipeline runs the same chain in one
+process: every step passes parsed tables (:class:`APCsvData`) through the
+in-memory table functions of csv_processing (``split_table``, ``merge_tables``,
+...) and only ``write`` steps touch the disk.
+
+A pipeline is a list of steps, given as a dict or a JSON file::
+
+    {
+      "steps": [
+        {"op": "read",   "path": "meas_ch1.csv", "as": "ch1"},
+        {"op": "read",   "path": "meas_ch2.csv", "as": "ch2"},
+        {"op": "merge",  "inputs": ["ch1", "ch2"], "as": "meas"},
+        {"op": "smooth", "input": "meas", "fraction": 3, "as": "meas"},
+        {"op": "write",  "input": "meas.H2", "path": "out/meas_H2.csv"}
+      ]
+    }
+
+``split`` and ``merge`` produce a group of tables, one per metric (F, H2, H3,
+Total). ``"meas.H2"`` names one member, ``"meas"`` the whole group; ``smooth``
+and ``write`` apply to every member of a group, and a group ``write`` path
+must contain ``{metric}``. Relative paths are resolved against ``base_dir``
+(by default the directory of the JSON file).
+"""
+
+import json
+import logging
+import os
+from typing import Optional, Union
+
+from .csv_processing import (
+    APCsvData,
+    compensate_lr_table,
+    filter_reference_table,
+    merge_tables,
+    read_ap_csv,
+    smooth_table,
+    split_table,
+    write_ap_csv,
+)
+
+logger = logging.getLogger(__name__)
+
+Value = Union[APCsvData, dict[str, APCsvData]]
+
+
+class Pipeline:
+    """Runs a list of step dicts against an in-memory namespace of tables."""
+
+    def __init__(self, steps: list[dict], base_dir: Optional[str] = None):
+        if not isinstance(steps, list) or not steps:
+            raise ValueError("A pipeline needs a non-empty 'steps' list.")
+        self.steps = steps
+        self.base_dir = base_dir or os.getcwd()
+        self.values: dict[str, Value] = {}
+        self.written: dict[str, str] = {}
+
+    @classmethod
+    def from_file(cls, spec_path: str) -> "Pipeline":
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        return cls(spec.get("steps"), base_dir=os.path.dirname(os.path.abspath(spec_path)))
+
+    def _path(self, path: str) -> str:
+        return path if os.path.isabs(path) else os.path.join(self.base_dir, path)
+
+    def _get(self, name: str) -> Value:
+        if name in self.values:
+            return self.values[name]
+        group, _, member = name.rpartition(".")
+        value = self.values.get(group)
+        if isinstance(value, dict) and member in value:
+            return value[member]
+        raise ValueError(f"Unknown pipeline value: {name!r}")
+
+    def _table(self, name: str) -> APCsvData:
+        value = self._get(name)
+        if isinstance(value, dict):
+            raise ValueError(f"{name!r} is a group of {sorted(value)}; name one member, e.g. '{name}.H2'.")
+        return value
+
+    def run(self) -> dict[str, str]:
+        """Execute all steps; return ``{written name: path}`` for every ``write`` step."""
+        for index, step in enumerate(self.steps, start=1):
+            op = step.get("op")
+            handler = getattr(self, f"_op_{op}", None)
+            if handler is None:
+                raise ValueError(f"Pipeline step {index}: unknown op {op!r}")
+            try:
+                result = handler(step)
+                if result is not None:
+                    self.values[step["as"]] = result
+            except KeyError as e:
+                raise ValueError(f"Pipeline step {index} ({op}): missing field {e}") from e
+            except ValueError as e:
+                raise ValueError(f"Pipeline step {index} ({op}): {e}") from e
+            logger.info("Pipeline step %d (%s) done", index, op)
+        return self.written
+
+    def _op_read(self, step: dict) -> APCsvData:
+        return read_ap_csv(self._path(step["path"]), header_rows=step.get("header_rows", 4))
+
+    def _op_split(self, step: dict) -> dict[str, APCsvData]:
+        return split_table(self._table(step["input"]))
+
+    def _op_merge(self, step: dict) -> dict[str, APCsvData]:
+        return merge_tables([self._table(name) for name in step["inputs"]])
+
+    def _op_smooth(self, step: dict) -> Value:
+        value = self._get(step["input"])
+        if isinstance(value, dict):
+            return {metric: smooth_table(table, step["fraction"]) for metric, table in value.items()}
+        return smooth_table(value, step["fraction"])
+
+    def _op_filter_reference(self, step: dict) -> APCsvData:
+        return filter_reference_table(self._table(step["reference"]), self._table(step["limits"]))
+
+    def _op_compensate_lr_diff(self, step: dict) -> APCsvData:
+        return compensate_lr_table(
+            self._table(step["input"]), self._table(step["diff"]), step.get("freq_tolerance", 1e-3)
+        )
+
+    def _op_write(self, step: dict) -> None:
+        name, path, precision = step["input"], step["path"], step.get("precision")
+        value = self._get(name)
+        members = value.items() if isinstance(value, dict) else [(None, value)]
+        if isinstance(value, dict) and "{metric}" not in path:
+            raise ValueError(f"Writing group {name!r} needs '{{metric}}' in the path.")
+        for metric, table in members:
+            output_path = self._path(path.format(metric=metric) if metric else path)
+            parent = os.path.dirname(output_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            written_name = f"{name}.{metric}" if metric else name
+            self.written[written_name] = write_ap_csv(
+                output_path, table.data, header_rows=table.header_rows, precision=precision
+            )
+
+
+def run_pipeline(spec: Union[str, dict], base_dir: Optional[str] = None) -> dict[str, str]:
+    """
+    Run a pipeline from a JSON file path or a ``{"steps": [...]}`` dict.
+
+    Returns:
+        ``{name: written path}`` for every ``write`` step.
+
+    Raises:
+        ValueError: On an unknown op, a missing field or value, or any step error.
+    """
+    if isinstance(spec, str):
+        pipeline = Pipeline.from_file(spec)
+        if base_dir:
+            pipeline.base_dir = base_dir
+    else:
+        pipeline = Pipeline(spec.get("steps"), base_dir=base_dir)
+    return pipeline.run()
@@ -0,0 +1,222 @@
+"""
+smoothing.py
+
+Fractional-octave smoothing kernel shared by csv_processing and DataTools.
+
+The window for a point at frequency f covers [f / hw, f * hw] with
+hw = 2^(1 / (2 * fraction)), bounds inclusive. Window limits are found with
+``searchsorted`` on the sorted frequency grid and every window mean comes from
+a prefix sum, so smoothing n points is O(n log n) instead of O(n^2). Window
+indices are cached per (frequency grid, fraction) because the same grid is
+usually smoothed for many columns and many files.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+_WINDOW_CACHE_SIZE = 32
+
+_window_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_window_cache_lock = threading.Lock()
+
+
+def _grid_key(frequencies: np.ndarray, fraction: float) -> tuple:
+    digest = hashlib.blake2b(frequencies.tobytes(), digest_size=16).digest()
+    return (float(fraction), frequencies.shape[0], digest)
+
+
+def octave_window_bounds(frequencies, fraction: float) -> tuple:
+    """
+    Return the smoothing windows for a frequency grid.
+
+    Args:
+        frequencies: 1-D frequency grid in Hz, in any order.
+        fraction:    Octave fraction denominator (3 → 1/3 octave).
+
+    Returns:
+        (order, lo, hi): ``order`` sorts the grid ascending (None if it
+        already is); point ``order[i]`` averages the sorted points
+        ``lo[i]:hi[i]``. Arrays are shared with the cache — do not modify.
+    """
+    freqs = np.ascontiguousarray(frequencies, dtype=float)
+    key = _grid_key(freqs, fraction)
+    with _window_cache_lock:
+        cached = _window_cache.get(key)
+        if cached is not None:
+            _window_cache.move_to_end(key)
+            return cached
+
+    if np.isnan(freqs).any() or np.any(freqs[1:] < freqs[:-1]):
+        order = np.argsort(freqs, kind="stable")
+        sorted_freqs = freqs[order]
+    else:
+        order = None
+        sorted_freqs = freqs
+
+    half_width = 2.0 ** (1.0 / (2.0 * fraction))
+    lo = np.searchsorted(sorted_freqs, sorted_freqs / half_width, side="left")
+    hi = np.searchsorted(sorted_freqs, sorted_freqs * half_width, side="right")
+    # NaN / non-positive frequencies have no valid window; they keep their own value.
+    empty = ~(hi > lo) | np.isnan(sorted_freqs)
+    if empty.any():
+        idx = np.flatnonzero(empty)
+        lo[idx] = idx
+        hi[idx] = idx + 1
+
+    bounds = (order, lo, hi)
+    for array in bounds:
+        if array is not None:
+            array.setflags(write=False)
+    with _window_cache_lock:
+        _window_cache[key] = bounds
+        while len(_window_cache) > _WINDOW_CACHE_SIZE:
+            _window_cache.popitem(last=False)
+    return bounds
+
+
+def clear_window_cache() -> None:
+    """Drop all cached smoothing windows."""
+    with _window_cache_lock:
+        _window_cache.clear()
+
+
+def octave_smooth_matrix(frequencies, values, fraction: float) -> np.ndarray:
+    """
+    Fractional-octave moving average of one or more columns.
+
+    Each output point is the arithmetic mean of the input points whose
+    frequency lies inside its window. Averaging happens in whatever domain
+    *values* is in — convert dB to linear first if that is what you need.
+
+    Args:
+        frequencies: 1-D frequency grid in Hz (length n, any order).
+        values:      Array of shape (n,) or (n, columns) on that grid.
+        fraction:    Octave fraction denominator (3 → 1/3 octave).
+
+    Returns:
+        Smoothed float array with the shape of *values*. A window holding
+        NaN or inf yields the same result as ``np.mean`` over that window.
+
+    Raises:
+        ValueError: If the shapes do not match or fraction <= 0.
+    """
+    freqs = np.asarray(frequencies, dtype=float)
+    data = np.asarray(values, dtype=float)
+    if freqs.ndim != 1 or data.ndim not in (1, 2) or data.shape[0] != freqs.shape[0]:
+        raise ValueError("values must have shape (n,) or (n, columns) for n frequencies.")
+    if fraction <= 0:
+        raise ValueError("fraction must be > 0.")
+    if freqs.size == 0:
+        return data.copy()
+
+    order, lo, hi = octave_window_bounds(freqs, fraction)
+    sorted_data = data[order] if order is not None else data
+
+    finite = np.isfinite(sorted_data)
+    clean = np.where(finite, sorted_data, 0.0)
+    tail_shape = (1,) + clean.shape[1:]
+    prefix = np.concatenate((np.zeros(tail_shape), np.cumsum(clean, axis=0)))
+    counts = (hi - lo).astype(float)
+    if clean.ndim == 2:
+        counts = counts[:, None]
+    smoothed = (prefix[hi] - prefix[lo]) / counts
+
+    if not finite.all():
+        # Windows touching NaN / inf are rare; average those directly so the
+        # result propagates exactly as np.mean would.
+        bad_prefix = np.concatenate((np.zeros(tail_shape, dtype=np.int64),
+                                     np.cumsum(~finite, axis=0)))
+        bad = (bad_prefix[hi] - bad_prefix[lo]) > 0
+        for point in np.unique(np.nonzero(bad)[0]):
+            smoothed[point] = sorted_data[lo[point]:hi[point]].mean(axis=0)
+
+    if order is None:
+        return smoothed
+    result = np.empty_like(smoothed)
+    result[order] = smoothed
+    return result
+
+
+class StreamingOctaveSmoother:
+    """
+    :func:`octave_smooth_matrix` for one ascending sweep that arrives in chunks.
+
+    ``feed`` returns the smoothed values of every point whose window is now
+    complete (the sweep has passed ``f * hw``); ``finish`` returns the rest.
+    Only points that can still fall inside a pending window are kept, so
+    memory is bounded by one chunk plus the widest window. The prefix sum is
+    carried across chunks, which makes every value bit-identical to smoothing
+    the whole sweep at once.
+    """
+
+    def __init__(self, fraction: float):
+        if fraction <= 0:
+            raise ValueError("fraction must be > 0.")
+        self.half_width = 2.0 ** (1.0 / (2.0 * fraction))
+        self._freqs = np.empty(0)
+        self._values = np.empty(0)
+        self._prefix = np.zeros(1)
+        self._bad_prefix = np.zeros(1, dtype=np.int64)
+        self._pending = 0  # buffer index of the first point not yet returned
+
+    def feed(self, frequencies, values) -> np.ndarray:
+        """
+        Add the next points of the sweep.
+
+        Raises:
+            ValueError: If frequencies are not positive and ascending across
+                        all chunks, or the shapes do not match.
+        """
+        freqs = np.asarray(frequencies, dtype=float)
+        data = np.asarray(values, dtype=float)
+        if freqs.ndim != 1 or freqs.shape != data.shape:
+            raise ValueError("frequencies and values must be 1-D arrays of the same length.")
+        if freqs.size:
+            previous = self._freqs[-1:] if self._freqs.size else freqs[:0]
+            joined = np.concatenate((previous, freqs))
+            if not (freqs[0] > 0) or np.any(joined[1:] < joined[:-1]) or np.isnan(freqs).any():
+                raise ValueError("Streaming smoothing needs positive, ascending frequencies.")
+
+        finite = np.isfinite(data)
+        self._freqs = np.concatenate((self._freqs, freqs))
+        self._values = np.concatenate((self._values, data))
+        # cumsum([carry, x0, x1, ...]) adds in the same order as one cumsum over the whole sweep
+        self._prefix = np.concatenate(
+            (self._prefix[:-1], np.cumsum(np.concatenate((self._prefix[-1:], np.where(finite, data, 0.0)))))
+        )
+        self._bad_prefix = np.concatenate(
+            (self._bad_prefix[:-1], np.cumsum(np.concatenate((self._bad_prefix[-1:], ~finite))))
+        )
+        return self._emit(final=False)
+
+    def finish(self) -> np.ndarray:
+        """Return the smoothed values of all points not returned yet."""
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> np.ndarray:
+        freqs, start = self._freqs, self._pending
+        if not freqs.size:
+            return np.empty(0)
+        # Later points are >= freqs[-1], so a window ending below it is complete
+        stop = len(freqs) if final else start + int(np.count_nonzero(freqs[start:] * self.half_width < freqs[-1]))
+
+        points = freqs[start:stop]
+        lo = np.searchsorted(freqs, points / self.half_width, side="left")
+        hi = np.searchsorted(freqs, points * self.half_width, side="right")
+        smoothed = (self._prefix[hi] - self._prefix[lo]) / (hi - lo).astype(float)
+        bad = (self._bad_prefix[hi] - self._bad_prefix[lo]) > 0
+        for point in np.flatnonzero(bad):
+            smoothed[point] = self._values[lo[point]:hi[point]].mean()
+
+        # Drop points below the window of the next (or any later) point
+        next_freq = freqs[stop] if stop < len(freqs) else freqs[-1]
+        keep_from = min(stop, int(np.searchsorted(freqs, next_freq / self.half_width, side="left")))
+        self._freqs = freqs[keep_from:]
+        self._values = self._values[keep_from:]
+        self._prefix = self._prefix[keep_from:]
+        self._bad_prefix = self._bad_prefix[keep_from:]
+        self._pending = stop - keep_from
+        return smoothed
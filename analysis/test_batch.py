@@ -0,0 +1,80 @@
+"""
+test_batch.py
+
+Tests for batch mode of the per-file CSV commands (analysis.batch).
+
+Run:
+    pytest analysis/test_batch.py -v
+"""
+
+import csv
+import math
+import os
+import sys
+
+import numpy as np
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import csv_processing as cp
+from analysis.batch import expand_inputs, is_batch_input, per_file_name, run_batch
+
+_HEADER = [["RMS Level"], ["L", "", "R", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"]]
+
+
+def _write_measurement(path, offset):
+    freqs = np.geomspace(20.0, 20000.0, 40).tolist()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerows(_HEADER)
+        writer.writerows([repr(f), repr(90.0 + offset + math.sin(i)), repr(f), repr(89.0 + math.cos(i))]
+                         for i, f in enumerate(freqs))
+    return str(path)
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_expand_inputs_and_names(tmp_path):
+    for name in ("b.csv", "a.csv", "notes.txt"):
+        (tmp_path / name).write_text("x", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.csv").write_text("x", encoding="utf-8")
+
+    assert is_batch_input(str(tmp_path)) and is_batch_input(str(tmp_path / "*.csv"))
+    assert not is_batch_input(str(tmp_path / "a.csv"))
+    assert [os.path.basename(p) for p in expand_inputs(str(tmp_path))] == ["a.csv", "b.csv"]
+    assert [os.path.basename(p) for p in expand_inputs(str(tmp_path / "**" / "*.csv"))] == ["a.csv", "b.csv", "c.csv"]
+
+    assert per_file_name("{stem}_cols.csv", "/data/m1.csv") == "m1_cols.csv"
+    assert per_file_name("cols.csv", "/data/m1.csv") == "m1_cols.csv"
+    assert per_file_name(None, "/data/m1.csv") is None
+
+
+def test_run_batch_matches_single_file_calls(tmp_path):
+    inputs = [_write_measurement(tmp_path / f"m{i}.csv", i) for i in range(4)]
+    jobs = [(path, {"input_path": path, "fraction": 3, "output_dir": str(tmp_path / "batch")}) for path in inputs]
+    progress = []
+
+    result = run_batch("octave_smooth_ap_csv", jobs, workers=2, progress=lambda done, total: progress.append(done))
+
+    assert not result.failed and [path for path, _ in result.succeeded] == inputs
+    assert progress[-1] == 4
+    for path, output in result.succeeded:
+        expected = cp.octave_smooth_ap_csv(path, 3, output_dir=str(tmp_path / "single"))
+        assert _read_bytes(output) == _read_bytes(expected)
+
+
+def test_run_batch_records_failures(tmp_path):
+    good = _write_measurement(tmp_path / "good.csv", 0)
+    missing = str(tmp_path / "missing.csv")
+    jobs = [(path, {"input_path": path, "fraction": 3}) for path in (good, missing)]
+
+    result = run_batch("octave_smooth_ap_csv", jobs, workers=1)
+
+    assert [path for path, _ in result.succeeded] == [good]
+    assert result.failed[0][0] == missing and result.failed[0][1].startswith("FileNotFoundError")
+    assert "2 file(s): 1 ok, 1 failed" in result.summary()
@@ -0,0 +1,399 @@
+"""
+test_csv_processing.py
+
+Tests for the AP CSV helpers in analysis.csv_processing.
+
+Run:
+    pytest analysis/test_csv_processing.py -v
+"""
+
+import csv
+import math
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import csv_processing as cp
+from analysis.measurement_parser import MeasurementParser
+
+_AP_HEADER = [
+    ["Acoustic Response"],
+    ["Left-Left(F)", "", "Left-Left(H2)", "", "Left-Left(H3)", "", "Left-Left(Total)", ""],
+    ["X", "Y"] * 4,
+    ["Hz", "dBSPL", "Hz", "dBSPL", "Hz", "%", "Hz", "%"],
+]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def _distortion_rows(points=40):
+    freqs = np.geomspace(20.0, 20000.0, points).tolist()
+    rows = []
+    for i, f in enumerate(freqs):
+        rows.append([repr(f), repr(90.0 + math.sin(i)), repr(f), repr(50.0 + i * 0.1),
+                     repr(f), repr(0.1 * i), repr(f), repr(0.2 * i)])
+    return rows
+
+
+def test_read_ap_csv_columns_and_metadata(tmp_path):
+    rows = _distortion_rows()
+    path = _write_csv(tmp_path / "dist.csv", _AP_HEADER + rows)
+
+    table = cp.read_ap_csv(path)
+
+    assert table.data.shape == (40, 8)
+    assert table.data.dtype == np.float64
+    assert table.title == "Acoustic Response"
+    assert table.curve_names == ["Left-Left(F)", "Left-Left(H2)", "Left-Left(H3)", "Left-Left(Total)"]
+    assert table.num_channels == 1
+    assert table.units[:2] == ["Hz", "dBSPL"]
+    assert table.column_names[2] == "Left-Left(H2) X"
+    assert table.metric_columns("H3") == [4, 5]
+    np.testing.assert_array_equal(table["Left-Left(F) Y"], [float(r[1]) for r in rows])
+    x, y = table.pair(3)
+    assert x[-1] == float(rows[-1][6]) and y[-1] == float(rows[-1][7])
+
+
+def test_read_ap_csv_ragged_rows_and_text(tmp_path):
+    rows = [["100", "1.5", "100", "2.5"], ["200", "", "200", "oops"], ["300", "3.5"]]
+    path = _write_csv(tmp_path / "ragged.csv", _AP_HEADER + rows)
+
+    table = cp.read_ap_csv(path, keep_text=True)
+
+    expected = [[100, 1.5, 100, 2.5], [200, np.nan, 200, np.nan], [300, 3.5, np.nan, np.nan]]
+    np.testing.assert_array_equal(table.data, expected)
+    assert table.text_rows == rows
+
+
+def test_read_ap_csv_detects_units_row(tmp_path):
+    path = _write_csv(tmp_path / "meas.csv", [
+        ["Frequency Response"], [], ["Ch1", "", "Ch2", ""], ["Hz", "dBSPL", "Hz", "dBSPL"],
+        ["20", "80", "20", "81"], ["40", "82", "40", "83"],
+    ])
+
+    table = cp.read_ap_csv(path, header_rows=None)
+
+    assert table.header_rows[-1] == ["Hz", "dBSPL", "Hz", "dBSPL"]
+    assert table.data.shape == (2, 4)
+
+
+def test_read_ap_csv_without_data_raises(tmp_path):
+    path = _write_csv(tmp_path / "empty.csv", _AP_HEADER)
+    with pytest.raises(ValueError):
+        cp.read_ap_csv(path)
+
+
+@pytest.mark.parametrize("encoding, label", [("cp1252", "Phase (°)"), ("cp1252", "THD (µV)"), ("latin-1", "X\x81")])
+def test_read_ap_csv_legacy_encodings_keep_header(tmp_path, monkeypatch, encoding, label):
+    header = [["Acoustic Response"], [label, ""], ["X", "Y"], ["Hz", "dBSPL"]]
+    path = tmp_path / "legacy.csv"
+    with open(path, "w", newline="", encoding=encoding) as f:
+        csv.writer(f).writerows(header + [["20", "80"], ["40", "82"]])
+
+    chunk_header, blocks = cp.read_ap_csv_chunks(str(path), chunk_rows=1)
+    assert chunk_header == header
+    np.testing.assert_array_equal(np.vstack(list(blocks)), [[20, 80], [40, 82]])
+    assert cp.read_ap_csv(str(path)).header_rows == header
+    monkeypatch.setenv("ADAM_CSV_CACHE_DIR", str(tmp_path / "cache"))
+    cp.read_ap_csv(str(path))
+    assert cp.read_ap_csv(str(path)).header_rows == header  # served from the cache
+
+
+def test_octave_smooth_ap_csv_keeps_layout(tmp_path):
+    rows = _distortion_rows()
+    rows[5][1] = ""
+    path = _write_csv(tmp_path / "dist.csv", _AP_HEADER + rows)
+
+    out = cp.octave_smooth_ap_csv(path, fraction=3)
+
+    with open(out, newline="", encoding="utf-8") as f:
+        written = list(csv.reader(f))
+    assert written[:4] == _AP_HEADER
+    assert [r[0] for r in written[4:]] == [r[0] for r in rows]
+    assert written[9][1] == ""
+
+    freqs = [float(r[0]) for i, r in enumerate(rows) if i != 5]
+    levels = [float(r[1]) for i, r in enumerate(rows) if i != 5]
+    expected = cp.octave_smooth(freqs, levels, 3)
+    got = [float(r[1]) for i, r in enumerate(written[4:]) if i != 5]
+    assert got == expected
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 6, 1000])
+def test_streaming_smooth_and_parse_match_in_memory(tmp_path, chunk_rows):
+    rows = _distortion_rows(60)
+    rows[5][1] = ""
+    rows[30] = rows[30][:4]
+    path = _write_csv(tmp_path / "dist.csv", _AP_HEADER + rows)
+
+    expected = cp.octave_smooth_ap_csv(path, 6, output_filename="mem.csv")
+    streamed = cp.octave_smooth_ap_csv(path, 6, output_filename="stream.csv", chunk_rows=chunk_rows)
+
+    assert _read_bytes(streamed) == _read_bytes(expected)
+    assert MeasurementParser.parse_measurement_csv(path, chunk_rows=chunk_rows) == \
+        MeasurementParser.parse_measurement_csv(path)
+
+
+def test_smooth_ap_data_blocks_and_threads_match_per_column(monkeypatch):
+    rng = np.random.default_rng(0)
+    freqs = np.geomspace(20.0, 20000.0, 300)
+    data = np.empty((300, 12))
+    data[:, 0::2] = freqs[:, None]
+    data[:, 2] = np.geomspace(25.0, 18000.0, 300)  # column on its own grid
+    data[:, 1::2] = 90.0 + rng.normal(0.0, 3.0, (300, 6))
+    data[7, 5] = np.nan
+    data[290:, 8] = np.nan
+
+    expected = data.copy()
+    for col in range(1, 12, 2):
+        valid = ~(np.isnan(data[:, col - 1]) | np.isnan(data[:, col]))
+        expected[:, col] = np.nan
+        expected[valid, col] = cp.octave_smooth(data[valid, col - 1].tolist(), data[valid, col].tolist(), 6)
+
+    assert np.array_equal(cp._smooth_ap_data(data, 6, workers=1), expected, equal_nan=True)
+    monkeypatch.setattr(cp, "_PARALLEL_SMOOTH_MIN_CELLS", 100)
+    assert np.array_equal(cp._smooth_ap_data(data, 6, workers=3), expected, equal_nan=True)
+
+
+def test_measurement_parser_uses_reader(tmp_path):
+    path = _write_csv(tmp_path / "meas.csv", [
+        ["Frequency Response"], ["Ch1", "", "Ch2", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"],
+        ["20", "80", "20", "81", ""], ["40", "82", "40", "83", ""], ["80", "84", "", "", ""],
+    ])
+
+    parsed = MeasurementParser.parse_measurement_csv(path)
+
+    assert parsed["data_points"] == 2
+    assert parsed["channels"]["Ch2"] == {
+        "frequencies": [20.0, 40.0], "levels": [81.0, 83.0], "unit": "dBSPL", "data_points": 2,
+    }
+
+
+def test_write_ap_csv_matches_csv_writer(tmp_path):
+    data = np.array([[20.0, 0.1 + 0.2, 1e-7], [40.0, np.nan, -np.inf], [1e16, -0.0, 123456.789]])
+    expected = tmp_path / "expected.csv"
+    _write_csv(expected, _AP_HEADER + [["" if v != v else repr(v) for v in row] for row in data.tolist()])
+
+    written = cp.write_ap_csv(str(tmp_path / "out.csv"), data, header_rows=_AP_HEADER)
+
+    assert _read_bytes(written) == _read_bytes(expected)
+
+
+def test_write_ap_csv_precision_and_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(cp, "_WRITE_CHUNK_CELLS", 4)
+    data = np.array([[17.3611111111111, 80.123456789123], [100.0, np.nan], [1000.0, -3.0]])
+
+    written = cp.write_ap_csv(str(tmp_path / "out.csv"), data, precision=6)
+
+    assert _read_rows(written) == [["17.3611", "80.1235"], ["100", ""], ["1000", "-3"]]
+    with pytest.raises(ValueError):
+        cp.write_ap_csv(str(tmp_path / "bad.csv"), data[0])
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("fraction", [None, 3])
+def test_split_matches_extract_then_smooth(tmp_path, fraction):
+    header = [_AP_HEADER[0] + ["extra"], _AP_HEADER[1] * 2, _AP_HEADER[2] * 2, _AP_HEADER[3] * 2]
+    rows = [r + r for r in _distortion_rows()]
+    rows[3][3] = ""
+    rows[-1] = rows[-1][:8]
+    path = _write_csv(tmp_path / "dist.csv", header + rows)
+
+    result = cp.split_ap_distortion_csv(path, output_dir=str(tmp_path / "split"), fraction=fraction)
+
+    # Reference: the previous per-metric extract (+ smooth in place) flow
+    ref_dir = str(tmp_path / "ref")
+    for metric, written in result.items():
+        metric_index = cp._AP_DISTORTION_METRICS.index(metric)
+        columns = []
+        for ch in range(2):
+            base = ch * 8 + metric_index * 2
+            columns.extend([base, base + 1])
+        expected = cp.extract_csv_columns(path, columns, f"dist_{metric}.csv", ref_dir)
+        if fraction is not None:
+            expected = cp.octave_smooth_ap_csv(expected, fraction, f"dist_{metric}.csv", ref_dir)
+        assert _read_bytes(written) == _read_bytes(expected), metric
+
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_merge_pairs_aligned_inputs_line_by_line(tmp_path):
+    left = _write_csv(tmp_path / "meas_ch1.csv", _AP_HEADER + _distortion_rows())
+    right = _write_csv(tmp_path / "meas_ch2.csv", _AP_HEADER + _distortion_rows())
+
+    result = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "out"))
+
+    assert os.path.basename(result["H2"]) == "meas_H2.csv"
+    merged = _read_rows(result["H2"])
+    rows = _distortion_rows()
+    assert merged[1] == ["Left-Left(H2)", "", "Left-Left(H2)", ""]
+    assert merged[4:] == [r[2:4] + r[2:4] for r in rows]
+
+
+def test_merge_aligns_on_frequency(tmp_path):
+    rows_a = [["100", "1", "100", "1", "100", "1", "100", "1"],
+              ["200", "2", "200", "2", "200", "2", "200", "2"],
+              ["400", "4", "400", "4", "400", "4", "400", "4"]]
+    rows_b = [["100.0", "5", "100", "5", "100", "5", "100", "5"],
+              ["300", "7", "300", "7", "300", "7", "300", "7"],
+              ["400", "8", "400", "8", "400", "8", "400", "8"]]
+    a = _write_csv(tmp_path / "a.csv", _AP_HEADER + rows_a)
+    b = _write_csv(tmp_path / "b.csv", _AP_HEADER + rows_b)
+
+    result = cp.merge_ap_distortion_csvs([a, b], output_dir=str(tmp_path / "out"), output_prefix="ab")
+
+    # Cells are written by write_ap_csv, like every numeric output
+    assert _read_rows(result["F"])[4:] == [
+        ["100.0", "1.0", "100.0", "5.0"],
+        ["200.0", "2.0", "", ""],
+        ["", "", "300.0", "7.0"],
+        ["400.0", "4.0", "400.0", "8.0"],
+    ]
+
+
+def test_merge_smoothed_matches_smoothing_merged_file(tmp_path):
+    left = _write_csv(tmp_path / "meas_ch1.csv", _AP_HEADER + _distortion_rows())
+    right = _write_csv(tmp_path / "meas_ch2.csv", _AP_HEADER + _distortion_rows()[:-3])
+
+    plain = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "plain"))
+    smoothed = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "smooth"), fraction=6)
+
+    for metric, path in smoothed.items():
+        expected = cp.octave_smooth_ap_csv(plain[metric], 6, output_dir=str(tmp_path / "ref"))
+        assert _read_bytes(path) == _read_bytes(expected), metric
+
+
+def test_merge_smoothed_streams_without_full_block(tmp_path, monkeypatch):
+    points = 20000
+    left = _write_csv(tmp_path / "meas_ch1.csv", _AP_HEADER + _distortion_rows(points))
+    right = _write_csv(tmp_path / "meas_ch2.csv", _AP_HEADER + _distortion_rows(points))
+    plain = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "plain"))
+    expected = {metric: cp.octave_smooth_ap_csv(path, 3, output_dir=str(tmp_path / "ref"))
+                for metric, path in plain.items()}
+
+    monkeypatch.setattr(cp, "_MERGE_CHUNK_ROWS", 256)
+    monkeypatch.setattr(cp, "_smooth_ap_data", None)  # the in-memory path must not run
+    tracemalloc.start()
+    try:
+        smoothed = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "smooth"), fraction=3)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    for metric, path in smoothed.items():
+        assert _read_bytes(path) == _read_bytes(expected[metric]), metric
+    # All four merged metric blocks as float64 would be points * 16 columns * 8 bytes
+    assert peak < points * 16 * 8
+
+
+def test_merge_smoothed_descending_sweep_falls_back_to_memory(tmp_path):
+    rows = _distortion_rows()[::-1]
+    left = _write_csv(tmp_path / "meas_ch1.csv", _AP_HEADER + rows)
+    right = _write_csv(tmp_path / "meas_ch2.csv", _AP_HEADER + rows)
+
+    plain = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "plain"))
+    smoothed = cp.merge_ap_distortion_csvs([left, right], output_dir=str(tmp_path / "smooth"), fraction=3)
+
+    assert sorted(os.listdir(tmp_path / "smooth")) == sorted(os.path.basename(p) for p in smoothed.values())
+    for metric, path in smoothed.items():
+        expected = cp.octave_smooth_ap_csv(plain[metric], 3, output_dir=str(tmp_path / "ref"))
+        assert _read_bytes(path) == _read_bytes(expected), metric
+
+
+def test_filter_reference_by_limits_interpolates_and_offsets(tmp_path):
+    ref_header = [["Reference"], ["L", "", "R", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"]]
+    ref_rows = [["50", "80", "50", "81"], ["100", "90", "100", ""], ["1000", "100", "1000", "101"],
+                ["10000", "95", "10000", "96"]]
+    limits = [["Limits"], ["Upper"], ["X", "Y"], ["Hz", "%"], ["100", "10"], ["500", "20"], ["1000", ""],
+              ["10000", "-100"]]
+    reference = _write_csv(tmp_path / "ref.csv", ref_header + ref_rows)
+    limits_path = _write_csv(tmp_path / "limits.csv", limits)
+
+    out = cp.filter_reference_by_limits(reference, limits_path, output_dir=str(tmp_path / "out"))
+
+    written = _read_rows(out)
+    assert written[:4] == ref_header
+    # 50 Hz is outside the limits range; 500 Hz is interpolated from the reference.
+    assert [r[0] for r in written[4:]] == ["100.0", "500.0", "1000.0", "10000.0"]
+    ref_500 = np.interp(np.log10(500), np.log10([50, 100, 1000, 10000]), [80, 90, 100, 95])
+    limit_1000 = np.interp(np.log10(1000), np.log10([100, 500, 10000]), [10, 20, -100])
+    assert written[4] == ["100.0", str(90 + 20 * math.log10(1.1)), "100.0", ""]
+    assert written[5][1] == str(ref_500 + 20 * math.log10(1.2))
+    assert written[6][3] == str(101 + 20 * math.log10(1 + limit_1000 / 100))
+    assert written[7][1] == "-inf"
+
+
+def test_apply_limits_offset_mixed_units_match_scalar_formulas():
+    ref = np.array([[90.0, 1.5], [80.0, 2.0], [70.0, 0.5], [60.0, 3.0]])
+
+    percent = np.array([10.0, -150.0, np.nan, 0.0])
+    got = cp._apply_limits_offset(ref, percent, "dBSPL", "%")
+    assert got[0].tolist() == [90.0 + 20 * math.log10(1.1), 1.5 + 20 * math.log10(1.1)]
+    assert np.isneginf(got[1]).all() and np.isnan(got[2]).all()
+    assert got[3].tolist() == ref[3].tolist()
+
+    db = np.array([6.0, -20.0, np.nan, 1e5])
+    got = cp._apply_limits_offset(ref, db, "%", "dB")
+    np.testing.assert_allclose(got[:2], ref[:2] * np.array([[10 ** (6 / 20)], [0.1]]), rtol=1e-15)
+    assert got[2:].tolist() == ref[2:].tolist()  # unconvertible offsets keep the reference
+
+
+_STEREO_HEADER = [["RMS Level"], ["Left", "", "Right", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"]]
+_DIFF_HEADER = [["Mic Diff"], ["L-R"], ["X", "Y"], ["Hz", "dB"]]
+
+
+def test_compensate_lr_diff_matches_within_tolerance_and_interpolates(tmp_path):
+    stereo = _write_csv(tmp_path / "rms.csv", _STEREO_HEADER + [
+        ["17.3611111111111", "80", "17.3611111111111", "78"],
+        ["100", "90", "100", "91"],
+        ["1000", "85", "1000", "84"],
+        ["20000", "70", "20000", "70"],
+    ])
+    # Diff exported with fewer digits, a gap at 100 Hz and nothing above 10 kHz.
+    diff = _write_csv(tmp_path / "diff.csv", _DIFF_HEADER + [
+        ["17.36111111", "2"], ["50", "1"], ["200", "3"], ["1000", "-1"], ["10000", "0"],
+    ])
+
+    written = _read_rows(cp.compensate_lr_diff(stereo, diff, str(tmp_path / "out.csv")))
+
+    assert written[:4] == _STEREO_HEADER
+    diff_100 = np.interp(np.log10(100), np.log10([50, 200]), [1, 3])
+    assert written[4] == ["17.36111111", "81", "17.36111111", "77"]
+    assert written[5] == ["100", f"{90 + 0.5 * diff_100:.10g}", "100", f"{91 - 0.5 * diff_100:.10g}"]
+    assert written[6] == ["1000", "84.5", "1000", "84.5"]
+    assert written[7] == ["20000", "70", "20000", "70"]
+
+
+def test_extract_compensated_lr_diff_combined(tmp_path):
+    rows = [["100", "90", "100", "89"], ["1000", "85", "1000", "86"]]
+    a = _write_csv(tmp_path / "a.csv", _STEREO_HEADER + rows)
+    b = _write_csv(tmp_path / "b.csv", _STEREO_HEADER + [r[2:] + r[:2] for r in rows])
+    diff = _write_csv(tmp_path / "diff.csv", _DIFF_HEADER + [["100.0004", "0.5"], ["1000", "-1"]])
+
+    written = _read_rows(cp.extract_compensated_lr_diff_combined(diff, a, b, str(tmp_path / "out.csv")))
+
+    assert written[4:] == [["100", "1.5", "100", "-0.5"], ["1000", "-2", "1000", "0"]]
+
+
+def test_compensate_lr_diff_rejects_lr_frequency_mismatch(tmp_path):
+    stereo = _write_csv(tmp_path / "rms.csv", _STEREO_HEADER + [["100", "90", "101", "91"]])
+    diff = _write_csv(tmp_path / "diff.csv", _DIFF_HEADER + [["100", "1"]])
+    with pytest.raises(ValueError, match="frequency mismatch"):
+        cp.compensate_lr_diff(stereo, diff, str(tmp_path / "out.csv"))
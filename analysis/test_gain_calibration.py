@@ -0,0 +1,87 @@
+"""
+test_gain_calibration.py
+
+Tests for analysis.gain_calibration.
+
+Run:
+    pytest analysis/test_gain_calibration.py -v
+"""
+
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis.gain_calibration import GainCalibration, _nearest_bins
+
+
+def _write_measurement(path, freqs, levels):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerows([["RMS Level"], ["Ch1", ""], ["X", "Y"], ["Hz", "dBSPL"]])
+        writer.writerows(zip(freqs, levels))
+    return str(path)
+
+
+def test_nearest_bins_match_argmin():
+    grid = np.array([10.0, 20.0, 20.0, 30.0, 50.0])
+    targets = np.array([0.0, 15.0, 20.0, 24.9, 25.0, 40.0, 45.0, 1e6])
+
+    expected = [np.abs(grid - f).argmin() for f in targets]
+
+    assert _nearest_bins(grid, targets).tolist() == expected
+    assert _nearest_bins(grid[:1], targets).tolist() == [0] * len(targets)
+
+
+def test_descending_sweep_tie_takes_first_row_in_file(tmp_path):
+    freqs = np.array([50.0, 40.0, 30.0, 20.0, 20.0, 10.0])
+    levels = np.array([85.0, 86.0, 87.0, 88.0, 89.0, 90.0])
+    target = _write_measurement(tmp_path / "target.csv", freqs[::-1], np.full(len(freqs), 90.0))
+    sweep = _write_measurement(tmp_path / "descending.csv", freqs, levels)
+    frequencies = [25.0, 35.0, 20.0, 15.0]
+
+    result = GainCalibration.calculate_gain_difference(sweep, target, frequencies)
+
+    for f in frequencies:
+        row = np.abs(freqs - f).argmin()
+        assert result["frequency_results"][f]["actual_input_freq"] == freqs[row]
+        assert result["frequency_results"][f]["gain_difference_db"] == 90.0 - levels[row]
+
+
+def test_batch_matches_single_calls_and_records_errors(tmp_path):
+    freqs = np.geomspace(20.0, 20000.0, 200)
+    target = _write_measurement(tmp_path / "target.csv", freqs, 90.0 + np.sin(freqs / 1000.0))
+    inputs = [
+        _write_measurement(tmp_path / f"in{i}.csv", freqs[::2], 89.0 + 0.1 * i + np.cos(freqs[::2] / 700.0))
+        for i in range(3)
+    ]
+    missing = str(tmp_path / "missing.csv")
+    frequencies = [100.0, 1000.0, 5000.0]
+
+    results = GainCalibration.calculate_gain_differences(inputs + [missing], target, frequencies)
+
+    assert list(results) == inputs + [missing]
+    for path in inputs:
+        assert results[path] == GainCalibration.calculate_gain_difference(path, target, frequencies)
+    assert results[missing]["error"].startswith("FileNotFoundError")
+
+
+def test_band_average_and_weights(tmp_path):
+    freqs = np.geomspace(20.0, 20000.0, 300)
+    levels = np.where(np.arange(300) % 2 == 0, 80.0, 86.0)
+    flat = _write_measurement(tmp_path / "flat.csv", freqs, np.full(300, 83.0))
+    comb = _write_measurement(tmp_path / "comb.csv", freqs, levels)
+
+    band = GainCalibration.calculate_gain_difference(flat, comb, [1000.0], fraction=3)
+    expected_db = 20.0 * np.log10(np.mean(10.0 ** (levels[np.abs(np.log2(freqs / 1000.0)) <= 1 / 6] / 20.0)))
+    assert band["frequency_results"][1000.0]["gain_difference_db"] == pytest.approx(expected_db - 83.0)
+
+    weighted = GainCalibration.calculate_gain_difference(flat, comb, [freqs[100], freqs[101]], weights=[3, 1])
+    assert weighted["average_gain_db"] == pytest.approx(round((3 * -3.0 + 1 * 3.0) / 4, 2))
+    with pytest.raises(ValueError):
+        GainCalibration.calculate_gain_difference(flat, comb, [100.0], weights=[1, 2])
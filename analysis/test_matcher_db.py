@@ -0,0 +1,169 @@
+"""
+test_matcher_db.py
+
+Tests for the matcher DB storage format and migration (analysis.matcher_db).
+
+Run:
+    pytest analysis/test_matcher_db.py -v
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import matcher_db
+from analysis.measurement_upload import MeasurementUpload
+
+
+def _legacy_db(path, freqs, drivers):
+    """Write a version 0 (JSON TEXT) matcher DB."""
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE frequency_vector (id INTEGER PRIMARY KEY CHECK (id = 1), frequencies TEXT NOT NULL)")
+    con.execute("""
+        CREATE TABLE drivers (serial TEXT PRIMARY KEY, side TEXT NOT NULL, levels TEXT NOT NULL,
+                              status TEXT NOT NULL DEFAULT 'unmatched', partner TEXT,
+                              loaded_at TEXT NOT NULL, matched_at TEXT)
+    """)
+    con.execute("CREATE TABLE driver_levels_raw (serial TEXT PRIMARY KEY, frequencies TEXT NOT NULL, levels TEXT NOT NULL)")
+    con.execute("INSERT INTO frequency_vector VALUES (1, ?)", (json.dumps(freqs),))
+    for serial, levels, status, partner in drivers:
+        con.execute(
+            "INSERT INTO drivers (serial, side, levels, status, partner, loaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (serial, "left" if serial.startswith("IA") else "right", json.dumps(levels), status, partner, "t0"),
+        )
+    con.execute("INSERT INTO driver_levels_raw VALUES ('IA1', ?, ?)", (json.dumps(freqs), json.dumps([1.0, 2.0, 3.0])))
+    con.commit()
+    con.close()
+
+
+def test_migration_converts_json_levels(tmp_path):
+    db_path = str(tmp_path / "matcher.db")
+    freqs = [20.0, 1000.0, 20000.0]
+    _legacy_db(db_path, freqs, [
+        ("IA1", [80.1, 81.25, 79.9], "matched", "IB1"),
+        ("IB1", [80.0, 81.0, 80.0], "matched", "IA1"),
+        ("IB2", [70.0, 71.0], "unmatched", None),  # never matched the stored vector
+    ])
+
+    con = sqlite3.connect(db_path)
+    matcher_db.ensure_schema(con)
+    matcher_db.ensure_schema(con)  # second call is a no-op
+
+    assert con.execute("PRAGMA user_version").fetchone()[0] == matcher_db.SCHEMA_VERSION
+    assert con.execute("SELECT name FROM sqlite_master WHERE name = 'frequency_vector'").fetchone() is None
+    assert matcher_db.first_frequency_vector(con.cursor()).tolist() == freqs
+    rows = {r[0]: r[1:] for r in con.execute("SELECT serial, levels, freq_id, status, partner FROM drivers")}
+    assert rows["IA1"][1:] == (1, "matched", "IB1") and rows["IB2"][1] is None
+    np.testing.assert_array_equal(matcher_db.decode_levels(rows["IA1"][0]),
+                                  np.float32([80.1, 81.25, 79.9]).astype(np.float64))
+    raw_freqs, raw_levels = con.execute("SELECT frequencies, levels FROM driver_levels_raw").fetchone()
+    assert matcher_db.decode_frequencies(raw_freqs).tolist() == freqs
+    assert matcher_db.decode_levels(raw_levels).tolist() == [1.0, 2.0, 3.0]
+    con.close()
+
+
+def test_upload_migrates_legacy_db_and_shares_vectors(tmp_path):
+    db_path = str(tmp_path / "matcher.db")
+    freqs = np.geomspace(20.0, 20000.0, 50)
+    _legacy_db(db_path, freqs.tolist(), [("IA1", [80.0] * 50, "unmatched", None)])
+
+    def upload(serial, f):
+        data = {"measurement_data": {"channels": {"Ch1": {"frequencies": f, "levels": 80.0 + np.log10(f)}}}}
+        assert MeasurementUpload.write_measurement_local_db(data, serial, db_path)["status"] == "success"
+
+    upload("IB1", freqs)
+    upload("IB2", freqs[:40])
+
+    con = sqlite3.connect(db_path)
+    freq_ids = dict(con.execute("SELECT serial, freq_id FROM drivers"))
+    assert freq_ids == {"IA1": 1, "IB1": 1, "IB2": 2}
+    assert [r[0] for r in con.execute("SELECT n_points FROM frequency_vectors ORDER BY id")] == [50, 40]
+    levels = con.execute("SELECT levels FROM drivers WHERE serial = 'IB1'").fetchone()[0]
+    assert isinstance(levels, bytes) and len(levels) == 50 * 4
+    np.testing.assert_allclose(matcher_db.decode_levels(levels), 80.0 + np.log10(freqs), atol=1e-5)
+    con.close()
+
+
+def test_bulk_upload_matches_single_writes(tmp_path):
+    freqs = np.geomspace(20.0, 20000.0, 30)
+    measurements = [
+        (serial, {"measurement_data": {"channels": {"Ch1": {"frequencies": freqs, "levels": 80.0 + i + np.log10(freqs)}}}})
+        for i, serial in enumerate(["IA1", "IB1", "IA2", "IB2", "XX9", "IA1"])
+    ]
+    dbs = {}
+    for mode in ("single", "bulk"):
+        db_path = str(tmp_path / f"{mode}.db")
+        _legacy_db(db_path, freqs.tolist(), [
+            ("IA1", [70.0] * 30, "matched", "IB7"),
+            ("IB7", [70.0] * 30, "matched", "IA1"),
+            ("IB2", [70.0] * 30, "paired", "IA8"),
+        ])
+        if mode == "single":
+            for serial, data in measurements:
+                MeasurementUpload.write_measurement_local_db(data, serial, db_path)
+        else:
+            result = MeasurementUpload.write_measurements_local_db(measurements, db_path)
+            assert result["inserted"] == ["IB1", "IA2"] and result["updated"] == ["IA1"]
+            assert result["skipped"] == [("XX9", "unsupported serial prefix"), ("IB2", "status paired")]
+        con = sqlite3.connect(db_path)
+        dbs[mode] = con.execute(
+            "SELECT serial, side, levels, freq_id, status, partner, matched_at FROM drivers ORDER BY serial"
+        ).fetchall()
+        con.close()
+
+    assert dbs["bulk"] == dbs["single"]
+    assert MeasurementUpload.serial_from_filename("/data/Matching_RMS_IB00123.csv") == "IB00123"
+    assert MeasurementUpload.serial_from_filename("/data/unit7.csv") == "unit7"
+
+
+def test_matching_app_init_db_migrates_like_workstation(tmp_path, monkeypatch):
+    sys.path.insert(0, os.path.join(os.path.dirname(_HERE), "Matching_App"))
+    from app import database
+
+    freqs = [20.0, 1000.0, 20000.0]
+    drivers = [
+        ("IA1", [80.1, 81.25, 79.9], "matched", "IB1"),
+        ("IB1", [80.0, 81.0, 80.0], "matched", "IA1"),
+        ("IB2", [70.0, 71.0], "unmatched", None),
+    ]
+    dumps = {}
+    for mode in ("workstation", "app"):
+        db_dir = tmp_path / mode
+        db_dir.mkdir()
+        db_path = str(db_dir / "matcher.db")
+        _legacy_db(db_path, freqs, drivers)
+        if mode == "workstation":
+            con = sqlite3.connect(db_path)
+            matcher_db.ensure_schema(con)
+            con.close()
+        else:
+            monkeypatch.setattr(database, "_DB_DIR", str(db_dir))
+            monkeypatch.setattr(database, "DB_PATH", db_path)
+            database.init_db()
+        con = sqlite3.connect(db_path)
+        dumps[mode] = {
+            "user_version": con.execute("PRAGMA user_version").fetchone()[0],
+            "schema": con.execute(
+                "SELECT name, sql FROM sqlite_master WHERE name IN "
+                "('frequency_vectors', 'drivers', 'driver_levels_raw') ORDER BY name"
+            ).fetchall(),
+            "vectors": con.execute("SELECT * FROM frequency_vectors ORDER BY id").fetchall(),
+            "drivers": con.execute("SELECT * FROM drivers ORDER BY serial").fetchall(),
+            "raw": con.execute("SELECT * FROM driver_levels_raw ORDER BY serial").fetchall(),
+        }
+        con.close()
+
+    assert dumps["app"] == dumps["workstation"]
+    assert len(dumps["app"]["schema"]) == 3 and dumps["app"]["raw"][0][0] == "IA1"
+
+    # The matcher groups by freq_id; IB2 never had a valid axis
+    _left, right = database.get_unmatched_drivers()
+    assert [(serial, freq_id) for serial, _levels, freq_id in right] == [("IB2", None)]
+    assert database.get_frequency_vector_by_id(1) == freqs
+    assert database.get_frequency_vector_by_id(2) is None
@@ -0,0 +1,91 @@
+"""
+test_measurement_upload.py
+
+Tests for writing parsed measurements to the matcher DB (analysis.measurement_upload).
+
+Run:
+    pytest analysis/test_measurement_upload.py -v
+"""
+
+import csv
+import json
+import math
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import matcher_db
+from analysis.measurement_parser import MeasurementParser
+from analysis.measurement_upload import MeasurementUpload
+
+
+def _write_measurement(path, freqs, levels):
+    """Mono AP frequency response CSV (Ch1)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([["Frequency Response"], ["Ch1", ""], ["X", "Y"], ["Hz", "dBSPL"]]
+                                + [[repr(x), repr(y)] for x, y in zip(freqs, levels)])
+    return str(path)
+
+
+def test_upload_with_arrays_writes_same_db_rows(tmp_path):
+    freqs = np.geomspace(20.0, 20000.0, 50).tolist()
+    path = _write_measurement(tmp_path / "meas.csv", freqs, [80.0 + i / 7.0 for i in range(50)])
+
+    parsed = MeasurementParser.parse_measurement_csv(path, as_arrays=True)
+    assert isinstance(parsed["channels"]["Ch1"]["levels"], np.ndarray)
+    assert parsed["channels"]["Ch1"]["levels"].tolist() == \
+        MeasurementParser.parse_measurement_csv(path)["channels"]["Ch1"]["levels"]
+
+    rows = []
+    for as_arrays in (False, True):
+        db_path = str(tmp_path / f"matcher_{as_arrays}.db")
+        upload = MeasurementUpload.prepare_upload(path, "IA0001", "ws", as_arrays=as_arrays)
+        assert MeasurementUpload.write_measurement_local_db(upload, "IA0001", db_path)["status"] == "success"
+        con = sqlite3.connect(db_path)
+        rows.append((con.execute("SELECT levels FROM drivers").fetchall(),
+                     con.execute("SELECT frequencies FROM frequency_vectors").fetchall()))
+        con.close()
+    assert rows[0] == rows[1]
+
+
+def test_upload_resamples_onto_db_grid_and_keeps_raw(tmp_path):
+    def measurement(name, freqs):
+        path = _write_measurement(tmp_path / name, freqs, [80.0 + math.log10(f) for f in freqs])
+        return MeasurementUpload.prepare_upload(path, "IA0001", "ws", as_arrays=True)
+
+    db_path = str(tmp_path / "matcher.db")
+    (tmp_path / "settings.json").write_text(json.dumps({"resample_points": 50}), encoding="utf-8")
+    uploads = [
+        ("IA0001", measurement("a.csv", np.linspace(20.0, 20000.0, 2000).tolist()), True),
+        ("IB0001", measurement("b.csv", np.linspace(20.0, 19000.0, 2000).tolist()), False),  # stops short
+        ("IB0002", measurement("c.csv", np.geomspace(10.0, 22000.0, 30).tolist()), False),  # fewer points
+    ]
+    for serial, upload, keep_raw in uploads:
+        result = MeasurementUpload.write_measurement_local_db(upload, serial, db_path, keep_raw=keep_raw)
+        assert result["status"] == "success"
+
+    con = sqlite3.connect(db_path)
+    grids = {i: matcher_db.decode_frequencies(f) for i, f in con.execute("SELECT id, frequencies FROM frequency_vectors")}
+    drivers = {serial: (matcher_db.decode_levels(lv), freq_id)
+               for serial, lv, freq_id in con.execute("SELECT serial, levels, freq_id FROM drivers")}
+    raw = con.execute("SELECT serial, levels FROM driver_levels_raw").fetchall()
+    con.close()
+
+    grid = grids[drivers["IA0001"][1]]
+    assert len(grid) == 50 and grid[0] == pytest.approx(20.0) and grid[-1] == pytest.approx(20000.0)
+    assert np.allclose(np.diff(np.log10(grid)), np.log10(1000.0) / 49)
+    assert drivers["IA0001"][0][10] == pytest.approx(80.0 + math.log10(grid[10]), abs=1e-3)
+    # A shorter curve is resampled onto the same grid
+    assert drivers["IB0002"][1] == drivers["IA0001"][1]
+    np.testing.assert_allclose(drivers["IB0002"][0], 80.0 + np.log10(grid), atol=0.05)
+    # A sweep that stops short gets its own grid instead of held end values
+    own = grids[drivers["IB0001"][1]]
+    assert drivers["IB0001"][1] != drivers["IA0001"][1]
+    assert len(own) == 50 and own[-1] == pytest.approx(19000.0)
+    assert [serial for serial, _ in raw] == ["IA0001"] and len(matcher_db.decode_levels(raw[0][1])) == 2000
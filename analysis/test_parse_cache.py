@@ -0,0 +1,93 @@
+"""
+test_parse_cache.py
+
+Tests for the opt-in parsed-CSV cache (analysis.parse_cache) behind read_ap_csv.
+
+Run:
+    pytest analysis/test_parse_cache.py -v
+"""
+
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import csv_processing as cp
+from analysis import parse_cache
+
+_HEADER = [["Acoustic Response"], ["Left", "", "Right", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"]]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setenv(parse_cache.CACHE_DIR_ENV_VAR, str(directory))
+    return directory
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    real_loadtxt = np.loadtxt
+
+    def _loadtxt(*args, **kwargs):
+        calls.append(1)
+        return real_loadtxt(*args, **kwargs)
+
+    monkeypatch.setattr(cp.np, "loadtxt", _loadtxt)
+    return calls
+
+
+def test_repeat_read_is_served_from_cache(tmp_path, cache, monkeypatch):
+    path = _write_csv(tmp_path / "meas.csv", _HEADER + [["20", "80", "20", "81"], ["40", "82", "40", ""]])
+    parses = _count_parses(monkeypatch)
+
+    first = cp.read_ap_csv(path)
+    second = cp.read_ap_csv(path)
+
+    assert len(parses) == 1
+    assert len(os.listdir(cache)) == 1
+    assert second.header_rows == first.header_rows == _HEADER
+    np.testing.assert_array_equal(second.data, first.data)
+
+
+def test_overwrite_with_same_size_and_mtime_invalidates(tmp_path, cache):
+    path = _write_csv(tmp_path / "meas.csv", _HEADER + [["20", "80", "20", "81"]])
+    stat = os.stat(path)
+    assert cp.read_ap_csv(path).data[0, 1] == 80.0
+
+    _write_csv(path, _HEADER + [["20", "90", "20", "81"]])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cp.read_ap_csv(path).data[0, 1] == 90.0
+    assert cp.read_ap_csv(path).data[0, 1] == 90.0
+
+
+def test_reader_options_and_keep_text_bypass(tmp_path, cache, monkeypatch):
+    path = _write_csv(tmp_path / "meas.csv", _HEADER + [["20", "80", "20", "81"]])
+    parses = _count_parses(monkeypatch)
+
+    cp.read_ap_csv(path)
+    assert cp.read_ap_csv(path, header_rows=3).data.shape == (2, 4)
+    assert cp.read_ap_csv(path, keep_text=True).text_rows == [["20", "80", "20", "81"]]
+
+    assert len(parses) == 3
+
+
+def test_unreadable_entry_is_ignored(tmp_path, cache):
+    path = _write_csv(tmp_path / "meas.csv", _HEADER + [["20", "80", "20", "81"]])
+    cp.read_ap_csv(path)
+    (entry,) = os.listdir(cache)
+    (cache / entry).write_bytes(b"not an npz")
+
+    assert cp.read_ap_csv(path).data[0, 3] == 81.0
@@ -0,0 +1,126 @@
+"""
+test_pipeline.py
+
+Tests for the in-process analysis pipeline (analysis.pipeline). Every step
+must write the same bytes as the corresponding csv_processing command.
+
+Run:
+    pytest analysis/test_pipeline.py -v
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import csv_processing as cp
+from analysis.pipeline import run_pipeline
+
+_DIST_HEADER = [
+    ["Acoustic Response"],
+    ["Left-Left(F)", "", "Left-Left(H2)", "", "Left-Left(H3)", "", "Left-Left(Total)", ""],
+    ["X", "Y"] * 4,
+    ["Hz", "dBSPL", "Hz", "dBSPL", "Hz", "%", "Hz", "%"],
+]
+_STEREO_HEADER = [["Reference"], ["L", "", "R", ""], ["X", "Y", "X", "Y"], ["Hz", "dBSPL", "Hz", "dBSPL"]]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _distortion_rows(points, offset=0.0):
+    rows = []
+    for i, f in enumerate(np.geomspace(20.0, 20000.0, points).tolist()):
+        rows.append([repr(f), repr(90.0 + math.sin(i) + offset), repr(f), repr(50.0 + i * 0.1),
+                     repr(f), repr(0.1 * i), repr(f), repr(0.2 * i + offset)])
+    return rows
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    freqs = np.geomspace(20.0, 20000.0, 60).tolist()
+    return {
+        "a": _write_csv(tmp_path / "meas_ch1.csv", _DIST_HEADER + _distortion_rows(60)),
+        "b": _write_csv(tmp_path / "meas_ch2.csv", _DIST_HEADER + _distortion_rows(57, offset=1.0)),
+        "ref": _write_csv(tmp_path / "ref.csv", _STEREO_HEADER + [
+            [repr(f), repr(85.0 + math.cos(i)), repr(f), repr(84.0 + math.sin(i))] for i, f in enumerate(freqs)
+        ]),
+        "limits": _write_csv(tmp_path / "limits.csv", [["Limits"], ["Upper"], ["X", "Y"], ["Hz", "dB"]] + [
+            [repr(f), repr(3.0 + i * 0.01)] for i, f in enumerate(freqs[5:50:3])
+        ]),
+        "diff": _write_csv(tmp_path / "diff.csv", [["Diff"], ["L-R"], ["X", "Y"], ["Hz", "dB"]] + [
+            [f"{f:.10g}", repr(0.3 * math.sin(i))] for i, f in enumerate(freqs[::2])
+        ]),
+    }
+
+
+def test_pipeline_matches_commands(tmp_path, inputs):
+    spec = {"steps": [
+        {"op": "read", "path": "meas_ch1.csv", "as": "a"},
+        {"op": "read", "path": "meas_ch2.csv", "as": "b"},
+        {"op": "split", "input": "a", "as": "parts"},
+        {"op": "smooth", "input": "parts", "fraction": 6, "as": "parts"},
+        {"op": "write", "input": "parts", "path": "out/split_{metric}.csv"},
+        {"op": "merge", "inputs": ["a", "b"], "as": "merged"},
+        {"op": "write", "input": "merged", "path": "out/plain_{metric}.csv"},
+        {"op": "split", "input": "b", "as": "raw"},
+        {"op": "write", "input": "raw.H3", "path": "out/raw_H3.csv"},
+        {"op": "smooth", "input": "merged.H2", "fraction": 3, "as": "h2"},
+        {"op": "write", "input": "h2", "path": "out/merged_H2.csv"},
+        {"op": "read", "path": "ref.csv", "as": "ref"},
+        {"op": "read", "path": "limits.csv", "as": "limits"},
+        {"op": "filter_reference", "reference": "ref", "limits": "limits", "as": "upper"},
+        {"op": "write", "input": "upper", "path": "out/upper.csv"},
+        {"op": "read", "path": "diff.csv", "as": "diff"},
+        {"op": "compensate_lr_diff", "input": "ref", "diff": "diff", "as": "comp"},
+        {"op": "write", "input": "comp", "path": "out/comp.csv", "precision": 10},
+    ]}
+    spec_path = tmp_path / "pipeline.json"
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+
+    written = run_pipeline(str(spec_path))
+
+    assert sorted(written) == ["comp", "h2", "merged.F", "merged.H2", "merged.H3", "merged.Total",
+                               "parts.F", "parts.H2", "parts.H3", "parts.Total", "raw.H3", "upper"]
+    split = cp.split_ap_distortion_csv(inputs["a"], output_dir=str(tmp_path / "cmd"), fraction=6)
+    for metric, path in split.items():
+        assert _read_bytes(written[f"parts.{metric}"]) == _read_bytes(path), metric
+    merged = cp.merge_ap_distortion_csvs([inputs["a"], inputs["b"]], output_dir=str(tmp_path / "cmd"), fraction=3)
+    assert _read_bytes(written["h2"]) == _read_bytes(merged["H2"])
+    merged = cp.merge_ap_distortion_csvs([inputs["a"], inputs["b"]], output_dir=str(tmp_path / "plain"))
+    for metric, path in merged.items():
+        assert _read_bytes(written[f"merged.{metric}"]) == _read_bytes(path), metric
+    raw = cp.split_ap_distortion_csv(inputs["b"], output_dir=str(tmp_path / "plain"))
+    assert _read_bytes(written["raw.H3"]) == _read_bytes(raw["H3"])
+    upper = cp.filter_reference_by_limits(inputs["ref"], inputs["limits"], output_dir=str(tmp_path / "cmd"))
+    assert _read_bytes(written["upper"]) == _read_bytes(upper)
+    comp = cp.compensate_lr_diff(inputs["ref"], inputs["diff"], str(tmp_path / "cmd" / "comp.csv"))
+    assert _read_bytes(written["comp"]) == _read_bytes(comp)
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([{"op": "explode"}], "unknown op"),
+    ([{"op": "read", "path": "meas_ch1.csv"}], "missing field 'as'"),
+    ([{"op": "smooth", "input": "nope", "fraction": 3, "as": "x"}], "Unknown pipeline value"),
+    ([{"op": "read", "path": "meas_ch1.csv", "as": "a"}, {"op": "split", "input": "a", "as": "p"},
+      {"op": "write", "input": "p", "path": "p.csv"}], "{metric}"),
+])
+def test_pipeline_errors_name_the_step(tmp_path, inputs, steps, message):
+    with pytest.raises(ValueError, match="Pipeline step") as excinfo:
+        run_pipeline({"steps": steps}, base_dir=str(tmp_path))
+    assert message in str(excinfo.value)
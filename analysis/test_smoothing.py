@@ -0,0 +1,139 @@
+"""
+test_smoothing.py
+
+Tests for the shared fractional-octave smoothing kernel (analysis.smoothing).
+
+The kernel must match the direct per-window average it replaces, both the
+dBSPL variant in csv_processing.octave_smooth and the plain mean used by the
+DataTools measurements viewer.
+
+Run:
+    pytest analysis/test_smoothing.py -v
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from analysis import smoothing
+from analysis.csv_processing import octave_smooth
+
+
+def _reference_octave_smooth(frequencies, values_db, fraction):
+    """The direct O(n^2) dBSPL smoothing octave_smooth used before the kernel."""
+    linear = [10.0 ** (db / 20.0) for db in values_db]
+    half_width = 2.0 ** (1.0 / (2.0 * fraction))
+    out = []
+    for freq in frequencies:
+        window = [lin for f, lin in zip(frequencies, linear) if freq / half_width <= f <= freq * half_width]
+        out.append(20.0 * math.log10(sum(window) / len(window)))
+    return out
+
+
+def _reference_mean_smooth(freqs, values, n):
+    """The direct mask-and-mean smoothing of the DataTools viewer."""
+    half_width = 2.0 ** (1.0 / (2.0 * n))
+    result = np.empty_like(values, dtype=float)
+    for i, f in enumerate(freqs):
+        mask = (freqs >= f / half_width) & (freqs <= f * half_width)
+        result[i] = float(np.mean(values[mask])) if mask.any() else float(values[i])
+    return result
+
+
+def _sweep(points, seed=0):
+    rng = np.random.default_rng(seed)
+    freqs = np.geomspace(20.0, 20000.0, points)
+    levels = 90.0 + 6.0 * np.sin(np.log(freqs) * 3.0) + rng.normal(0.0, 1.5, points)
+    return freqs, levels
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    smoothing.clear_window_cache()
+    yield
+    smoothing.clear_window_cache()
+
+
+@pytest.mark.parametrize("fraction", [1, 3, 6, 12, 24])
+def test_octave_smooth_matches_direct_average(fraction):
+    freqs, levels = _sweep(600)
+    expected = _reference_octave_smooth(freqs.tolist(), levels.tolist(), fraction)
+
+    result = octave_smooth(freqs.tolist(), levels.tolist(), fraction)
+
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+
+
+def test_matrix_matches_per_column_mean():
+    freqs, levels = _sweep(400)
+    matrix = np.column_stack([levels, levels - 20.0, np.abs(levels - 90.0)])
+
+    result = smoothing.octave_smooth_matrix(freqs, matrix, 3)
+
+    assert result.shape == matrix.shape
+    for col in range(matrix.shape[1]):
+        np.testing.assert_allclose(result[:, col], _reference_mean_smooth(freqs, matrix[:, col], 3),
+                                   rtol=1e-12, atol=1e-12)
+
+
+def test_unsorted_grid_with_duplicates():
+    freqs, levels = _sweep(300, seed=1)
+    freqs = np.concatenate([freqs, freqs[::7]])
+    levels = np.concatenate([levels, levels[::7] + 1.0])
+    perm = np.random.default_rng(2).permutation(freqs.size)
+    freqs, levels = freqs[perm], levels[perm]
+
+    result = smoothing.octave_smooth_matrix(freqs, levels, 6)
+
+    np.testing.assert_allclose(result, _reference_mean_smooth(freqs, levels, 6), rtol=1e-12, atol=1e-12)
+
+
+def test_non_finite_values_match_np_mean():
+    freqs, levels = _sweep(200, seed=3)
+    levels[50] = np.nan
+    levels[150] = np.inf
+    freqs[10] = np.nan
+
+    result = smoothing.octave_smooth_matrix(freqs, levels, 3)
+    expected = _reference_mean_smooth(freqs, levels, 3)
+
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_array_equal(np.isinf(result), np.isinf(expected))
+    finite = np.isfinite(expected)
+    np.testing.assert_allclose(result[finite], expected[finite], rtol=1e-12)
+
+
+def test_window_indices_are_cached_per_grid_and_fraction():
+    freqs, _ = _sweep(100)
+
+    first = smoothing.octave_window_bounds(freqs, 3)
+    assert smoothing.octave_window_bounds(freqs.copy(), 3) is first
+    assert smoothing.octave_window_bounds(freqs, 6) is not first
+    assert smoothing.octave_window_bounds(freqs * 1.001, 3) is not first
+
+
+def test_shape_mismatch_raises():
+    with pytest.raises(ValueError):
+        smoothing.octave_smooth_matrix([100.0, 200.0], [1.0, 2.0, 3.0], 3)
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1000])
+def test_streaming_smoother_is_bit_identical(chunk):
+    freqs, levels = _sweep(400, seed=5)
+    freqs = np.sort(np.concatenate((freqs, freqs[::37])))
+    values = np.concatenate((levels, levels[:len(freqs) - len(levels)]))
+    values[20] = np.inf
+
+    smoother = smoothing.StreamingOctaveSmoother(3)
+    parts = [smoother.feed(freqs[i:i + chunk], values[i:i + chunk]) for i in range(0, len(freqs), chunk)]
+    result = np.concatenate(parts + [smoother.finish()])
+
+    np.testing.assert_array_equal(result, smoothing.octave_smooth_matrix(freqs, values, 3))
+    with pytest.raises(ValueError):
+        smoother.feed([10.0], [1.0])
@@ -78,7 +78,9 @@ def build_workstation_parser():
         "extract_csv_columns",
         help="Extract selected CSV columns (from row 2 onward) into a new CSV file",
     )
-    parser_extract_csv.add_argument("input_path", type=str, help="Path to the source CSV file")
+    parser_extract_csv.add_argument(
+        "input_path", type=str, help="Path to the source CSV file, or a glob/directory for batch mode"
+    )
     parser_extract_csv.add_argument(
         "columns",
         type=int,
@@ -93,11 +95,20 @@ def build_workstation_parser():
         help="Output directory (defaults to input file directory)",
     )
     parser_extract_csv.add_argument("--server", action="store_true", help="Run extraction via ADAM service")
+    parser_extract_csv.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        dest="workers",
+        help="Worker processes when input_path is a glob or directory (default: CPU count)",
+    )
     parser_split_ap = subparsers.add_parser(
         "split_ap_distortion_csv",
         help="Split an AP Level & Distortion CSV into per-metric files (F, H2, H3, Total)",
     )
-    parser_split_ap.add_argument("input_path", type=str, help="Path to the source AP measurement CSV file")
+    parser_split_ap.add_argument(
+        "input_path", type=str, help="Path to the source AP measurement CSV file, or a glob/directory"
+    )
     parser_split_ap.add_argument(
         "--output-dir",
         dest="output_dir",
@@ -118,11 +129,18 @@ def build_workstation_parser():
         help="Base name for output files (default: input file stem)",
     )
     parser_split_ap.add_argument("--server", action="store_true", help="Run via ADAM service")
+    parser_split_ap.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        dest="workers",
+        help="Worker processes when input_path is a glob or directory (default: CPU count)",
+    )
     parser_smooth = subparsers.add_parser(
         "octave_smooth_ap_csv",
         help="Apply 1/n-octave smoothing to all Y columns of an AP measurement CSV",
     )
-    parser_smooth.add_argument("input_path", type=str, help="Path to the source AP CSV file")
+    parser_smooth.add_argument("input_path", type=str, help="Path to the source AP CSV file, or a glob/directory")
     parser_smooth.add_argument(
         "--fraction",
         type=int,
@@ -143,6 +161,20 @@ def build_workstation_parser():
         help="Output directory (defaults to input file directory)",
     )
     parser_smooth.add_argument("--server", action="store_true", help="Run via ADAM service")
+    parser_smooth.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        dest="chunk_rows",
+        help="Stream the file in blocks of this many rows (bounded memory, identical output)",
+    )
+    parser_smooth.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        dest="workers",
+        help="Worker processes when input_path is a glob or directory (default: CPU count)",
+    )
     parser_merge_ap = subparsers.add_parser(
         "merge_ap_distortion_csvs",
         help="Merge two or more AP Level & Distortion CSV files into per-metric combined files (F, H2, H3, Total)",
@@ -173,6 +205,17 @@ def build_workstation_parser():
         help="Base name for output files (default: longest common prefix of input file stems)",
     )
     parser_merge_ap.add_argument("--server", action="store_true", help="Run via ADAM service")
+    parser_pipeline = subparsers.add_parser(
+        "run_analysis_pipeline",
+        help="Run a JSON chain of CSV steps (split, smooth, merge, filter, compensate) in one process",
+    )
+    parser_pipeline.add_argument("spec_path", type=str, help="Path to the pipeline JSON file")
+    parser_pipeline.add_argument(
+        "--base-dir",
+        dest="base_dir",
+        default=None,
+        help="Directory relative step paths resolve against (default: directory of the JSON file)",
+    )
     parser_set_channel = subparsers.add_parser("set_channel", help="Set the channel (1 or 2).")
     parser_set_channel.add_argument("channel", type=int, choices=[1, 2], help="Channel to set (1 or 2).")
     subparsers.add_parser("open_box", help="Open the box.")
@@ -211,6 +254,30 @@ def build_workstation_parser():
     upload_measurement_parser.add_argument("--db-path", type=str,
         default="Matching_App/Data/db/matcher.db",
         help="Local matcher DB path used with --write-db (default: Matching_App/Data/db/matcher.db)")
+    upload_measurement_parser.add_argument("--resample-points", dest="resample_points", type=int, default=None,
+        help="Store Ch1 levels resampled to N log-spaced points; 0 keeps full resolution "
+             "(default: resample_points in settings.json next to the DB, else 0)")
+    upload_measurement_parser.add_argument("--keep-raw-levels", dest="keep_raw_levels",
+        action=argparse.BooleanOptionalAction, default=None,
+        help="Also keep the full-resolution curve in driver_levels_raw "
+             "(default: keep_raw_levels in settings.json next to the DB, else off)")
+
+    upload_measurements_parser = subparsers.add_parser("upload_measurements",
+        help="Bulk-write measurement CSVs (files, globs or directories) to the local matcher DB in one transaction")
+    upload_measurements_parser.add_argument("input_paths", type=str, nargs="+",
+        help="Measurement CSV files, globs or directories")
+    upload_measurements_parser.add_argument("--db-path", type=str,
+        default="Matching_App/Data/db/matcher.db",
+        help="Local matcher DB path (default: Matching_App/Data/db/matcher.db)")
+    upload_measurements_parser.add_argument("--serial-pattern", dest="serial_pattern", type=str,
+        default=r"I[AB][0-9A-Za-z]+",
+        help="Regex for the serial number in each file name; the file stem is used when it does not match "
+             "(default: an IA/IB serial)")
+    upload_measurements_parser.add_argument("--resample-points", dest="resample_points", type=int, default=None,
+        help="As for upload_measurement")
+    upload_measurements_parser.add_argument("--keep-raw-levels", dest="keep_raw_levels",
+        action=argparse.BooleanOptionalAction, default=None,
+        help="As for upload_measurement")
 
     # NEU: Parser für Gain Calibration
     calibrate_parser = subparsers.add_parser("calibrate_gain",
@@ -221,6 +288,23 @@ def build_workstation_parser():
         help="Path to target measurement CSV file")
     calibrate_parser.add_argument("--frequencies", "-f", type=float, nargs="+", required=True,
         help="List of frequencies (in Hz) to calculate calibration factors for")
+    calibrate_parser.add_argument("--fraction", type=int, default=None,
+        help="Compare 1/n-octave band averages around each frequency instead of the nearest bins")
+    calibrate_parser.add_argument("--weights", type=float, nargs="+", default=None,
+        help="Weight per frequency for the average offset (same count as --frequencies)")
+
+    calibrate_batch_parser = subparsers.add_parser("calibrate_gain_batch",
+        help="Calculate the gain offset of many measurements (glob or directory) against one target")
+    calibrate_batch_parser.add_argument("input_path", type=str,
+        help="Glob or directory of input measurement CSV files")
+    calibrate_batch_parser.add_argument("target_file", type=str,
+        help="Path to target measurement CSV file")
+    calibrate_batch_parser.add_argument("--frequencies", "-f", type=float, nargs="+", required=True,
+        help="List of frequencies (in Hz) to calculate calibration factors for")
+    calibrate_batch_parser.add_argument("--fraction", type=int, default=None,
+        help="Compare 1/n-octave band averages around each frequency instead of the nearest bins")
+    calibrate_batch_parser.add_argument("--weights", type=float, nargs="+", default=None,
+        help="Weight per frequency for the average offset (same count as --frequencies)")
 
     # NEU: Parser für Bass Management
     get_bass_parser = subparsers.add_parser("get_bass_management",
@@ -469,11 +553,13 @@ def build_workstation_parser():
     compensate_parser = subparsers.add_parser("compensate_lr_diff",
         help="Apply L/R compensation: L+=0.5*diff, R-=0.5*diff (stereo RMS CSV + mono diff CSV)")
     compensate_parser.add_argument("input_path", type=str,
-        help="Path to the stereo RMS measurement CSV (AP format, 4 header rows, X,Y,X,Y)")
+        help="Path to the stereo RMS measurement CSV (AP format, 4 header rows, X,Y,X,Y), or a glob/directory")
     compensate_parser.add_argument("diff_path", type=str,
         help="Path to the mono L-R diff CSV (AP format, 4 header rows, X,Y in dB)")
     compensate_parser.add_argument("output_path", type=str,
-        help="Path where the compensated CSV is written")
+        help="Path where the compensated CSV is written (batch: directory, or a path containing {stem})")
+    compensate_parser.add_argument("--workers", type=int, default=None, dest="workers",
+        help="Worker processes when input_path is a glob or directory (default: CPU count)")
 
     # Per-measurement compensated L-R difference (two inputs, two outputs)
     comp_pair_parser = subparsers.add_parser("extract_compensated_lr_diff_pair",
@@ -528,7 +614,7 @@ def build_workstation_parser():
     provision_mac_parser.add_argument("port", type=int, nargs="?", default=None,
         help="OCA device port (optional)")
     provision_mac_parser.add_argument("--arp-delay", dest="arp_delay", type=float, default=None,
-        help="Override ARP flush delay in seconds (default: 3.0). Use 0 to stress-test OCA read-back.")
+        help="Override the MAC read-back ceiling in seconds (default: 3.0). Use 0 to stress-test OCA read-back.")
 
     init_mac_db_parser = subparsers.add_parser("init_mac_db",
         help="Initialise the MAC address provisioning database (run once during setup)")
@@ -545,6 +631,11 @@ def build_workstation_parser():
     get_mac_pool_status_parser = subparsers.add_parser("get_mac_pool_status",
         help="Show current MAC pool status (total / assigned / remaining)")
 
+    release_mac_lease_parser = subparsers.add_parser("release_mac_lease",
+        help="Return a workstation's unissued leased MACs to the pool (e.g. retired station)")
+    release_mac_lease_parser.add_argument("workstation_id", type=str,
+        help="Workstation ID (hostname) holding the lease")
+
     export_mac_log_parser = subparsers.add_parser("export_mac_log",
         help="Export MAC provisioning log (SN <-> MAC assignments) to a CSV file")
     export_mac_log_parser.add_argument("output_path", type=str,
@@ -0,0 +1,8 @@
+"""Keep OCADevice timing records from tests out of the user profile and the repository."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_timing_log(tmp_path, monkeypatch):
+    monkeypatch.setenv("ADAM_OCA_TIMING_LOG", str(tmp_path / "oca_timing.jsonl"))
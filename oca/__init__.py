@@ -6,5 +6,6 @@ Handles network-based communication with OCA devices using OCP1 protocol.
 """
 
 from .oca_device import OCADevice
+from .oca_simulator import OCADeviceSimulator
 
-__all__ = ["OCADevice"]
\ No newline at end of file
+__all__ = ["OCADevice", "OCADeviceSimulator"]
\ No newline at end of file
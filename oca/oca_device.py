@@ -1,12 +1,25 @@
 import logging
+import os
 import re
-from oca_tools.oca_utilities import OCP1ToolWrapper
+import threading
+import time
 from services.workstation_logger import WorkstationLogger
+from .oca_timing import TimedWrapper, get_default_recorder, timed_operation
+
+try:
+    from oca_tools.oca_utilities import OCP1ToolWrapper
+except ImportError:  # adam-audio-tools not installed, e.g. Linux CI against the simulator
+    OCP1ToolWrapper = None
+
+# "host:port" of a running oca.oca_simulator; routes every OCADevice call there.
+SIMULATOR_ENV_VAR = "ADAM_OCA_SIMULATOR"
+
 
 class OCADevice:
     """OCA Device Network Interface for ADAM Audio production."""
 
-    def __init__(self, target, port=50001, timeout=5, workstation_id=None, service_host=None, service_port=65432):
+    def __init__(self, target, port=50001, timeout=5, workstation_id=None, service_host=None, service_port=65432,
+                 wrapper_factory=None, timing_recorder=None):
         self.target = target  # Name or IP
         self.port = port
         self.timeout = timeout
@@ -14,12 +27,51 @@ class OCADevice:
         self.workstation_id = workstation_id
         self.service_host = service_host
         self.service_port = service_port
+        # Callable(target_ip, port) -> wrapper; None selects OCP1ToolWrapper or the simulator.
+        self.wrapper_factory = wrapper_factory
+        # OCATimingRecorder for per-call latency records; None uses oca_timing's default.
+        self.timing_recorder = timing_recorder
+        # Timing record of the call in progress, per thread (see oca_timing.timed_operation).
+        self._timing_state = threading.local()
+
+    @property
+    def _active_timing(self):
+        return getattr(self._timing_state, "timing", None)
+
+    @_active_timing.setter
+    def _active_timing(self, timing):
+        self._timing_state.timing = timing
+
+    def _get_timing_recorder(self):
+        if self.timing_recorder is not None:
+            return self.timing_recorder
+        return get_default_recorder()
+
+    def _resolve_wrapper_factory(self):
+        if self.wrapper_factory is not None:
+            return self.wrapper_factory
+        simulator_address = os.getenv(SIMULATOR_ENV_VAR)
+        if simulator_address:
+            from .oca_simulator import simulator_wrapper_factory
+            return simulator_wrapper_factory(simulator_address)
+        if OCP1ToolWrapper is None:
+            raise RuntimeError(
+                f"oca_tools is not installed; install adam-audio-tools or set {SIMULATOR_ENV_VAR}"
+            )
+        return OCP1ToolWrapper
 
     def _get_wrapper(self):
+        start = time.perf_counter()
+        factory = self._resolve_wrapper_factory()
         if self._is_ip(self.target):
-            return OCP1ToolWrapper(target_ip=self.target, port=self.port)
+            wrapper = factory(target_ip=self.target, port=self.port)
         else:
-            return OCP1ToolWrapper(target_ip=None, port=None)
+            wrapper = factory(target_ip=None, port=None)
+        timing = self._active_timing
+        if timing is None:
+            return wrapper
+        timing.add_phase("wrapper_init", time.perf_counter() - start)
+        return TimedWrapper(wrapper, timing)
 
     def _is_ip(self, value):
         if not isinstance(value, str):
@@ -36,6 +88,7 @@ class OCADevice:
 
     def _log_to_service(self, task, result):
         if self.workstation_id and self.service_host:
+            start = time.perf_counter()
             WorkstationLogger.send_log_to_service(
                 workstation_id=self.workstation_id,
                 log_data={
@@ -46,7 +99,10 @@ class OCADevice:
                 service_host=self.service_host,
                 service_port=self.service_port
             )
+            if self._active_timing is not None:
+                self._active_timing.add_phase("service_log", time.perf_counter() - start)
 
+    @timed_operation
     def discover(self, timeout=1):
         try:
             wrapper = self._get_wrapper()
@@ -59,6 +115,7 @@ class OCADevice:
             self.logger.error(error_msg)
             raise
 
+    @timed_operation
     def get_gain_calibration(self):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -66,6 +123,7 @@ class OCADevice:
         self._log_to_service("get_gain_calibration", result)
         return result
 
+    @timed_operation
     def set_gain_calibration(self, value):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -74,6 +132,7 @@ class OCADevice:
         self._log_to_service("set_gain_calibration", result)
         return result
 
+    @timed_operation
     def get_mode(self):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -81,6 +140,7 @@ class OCADevice:
         self._log_to_service("get_mode", result)
         return result
 
+    @timed_operation
     def set_mode(self, mode):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -89,6 +149,7 @@ class OCADevice:
         self._log_to_service("set_mode", result)
         return result
 
+    @timed_operation
     def get_audio_input(self):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -96,6 +157,7 @@ class OCADevice:
         self._log_to_service("get_audio_input", result)
         return result
 
+    @timed_operation
     def set_audio_input(self, position):
         """Set audio input mode.
         
@@ -111,6 +173,7 @@ class OCADevice:
         self._log_to_service("set_audio_input", result)
         return result
 
+    @timed_operation
     def get_bass_management(self):
         wrapper = self._get_wrapper()
         options = self._cli_options()
@@ -118,6 +181,7 @@ class OCADevice:
         self._log_to_service("get_bass_management", result)
         return result
 
+    @timed_operation
     def set_bass_management(self, position):
         """Set bass management mode.
 
@@ -134,6 +198,7 @@ class OCADevice:
         self._log_to_service("set_bass_management", result)
         return result
 
+    @timed_operation
     def get_bass_management_bypass(self):
         """Get bass management bypass state (enabled/disabled)."""
         wrapper = self._get_wrapper()
@@ -145,6 +210,7 @@ class OCADevice:
         self._log_to_service("get_bass_management_bypass", result)
         return result
 
+    @timed_operation
     def set_bass_management_bypass(self, state):
         """Set bass management bypass state.
 
@@ -163,6 +229,7 @@ class OCADevice:
         self._log_to_service("set_bass_management_bypass", result)
         return result
 
+    @timed_operation
     def get_gain(self):
         """Get current subwoofer gain level (-24 to 0 dB range)."""
         wrapper = self._get_wrapper()
@@ -171,6 +238,7 @@ class OCADevice:
         self._log_to_service("get_gain", result)
         return result
 
+    @timed_operation
     def set_gain(self, value):
         """Set subwoofer gain level.
         
@@ -184,6 +252,7 @@ class OCADevice:
         self._log_to_service("set_gain", result)
         return result
 
+    @timed_operation
     def get_phase_delay(self):
         """Get current phase delay setting."""
         wrapper = self._get_wrapper()
@@ -192,6 +261,7 @@ class OCADevice:
         self._log_to_service("get_phase_delay", result)
         return result
 
+    @timed_operation
     def set_phase_delay(self, position):
         """Set phase delay setting."""
         wrapper = self._get_wrapper()
@@ -201,6 +271,7 @@ class OCADevice:
         self._log_to_service("set_phase_delay", result)
         return result
 
+    @timed_operation
     def get_mute(self):
         """Get current mute state."""
         wrapper = self._get_wrapper()
@@ -209,6 +280,7 @@ class OCADevice:
         self._log_to_service("get_mute", result)
         return result
 
+    @timed_operation
     def set_mute(self, position):
         """Set mute state."""
         wrapper = self._get_wrapper()
@@ -218,6 +290,7 @@ class OCADevice:
         self._log_to_service("set_mute", result)
         return result
 
+    @timed_operation
     def get_mac_address(self):
         """Get the MAC address of the device."""
         wrapper = self._get_wrapper()
@@ -229,6 +302,7 @@ class OCADevice:
         self._log_to_service("get_mac_address", result)
         return result
 
+    @timed_operation
     def set_mac_address(self, mac_address):
         """Set the MAC address of the device.
 
@@ -245,6 +319,7 @@ class OCADevice:
         self._log_to_service("set_mac_address", result)
         return result
 
+    @timed_operation
     def get_serial_number(self):
         """Get the serial number of the device."""
         wrapper = self._get_wrapper()
@@ -256,6 +331,7 @@ class OCADevice:
         self._log_to_service("get_serial_number", result)
         return result
 
+    @timed_operation
     def set_serial_number(self, value):
         """Set the serial number of the device.
 
@@ -272,6 +348,7 @@ class OCADevice:
         self._log_to_service("set_serial_number", result)
         return result
 
+    @timed_operation
     def get_model_description(self):
         """Get model description (manufacturer, model name, firmware version)."""
         wrapper = self._get_wrapper()
@@ -286,12 +363,14 @@ class OCADevice:
         self._log_to_service("get_model_description", result)
         return result
 
+    @timed_operation
     def get_firmware_version(self):
         """Get the firmware version from the model description."""
         result = self.get_model_description()
         version = result.get("version")
         return {"version": version} if version is not None else result
 
+    @timed_operation
     def lock_factory_settings(self):
         """Lock factory settings on the device."""
         wrapper = self._get_wrapper()
@@ -300,6 +379,7 @@ class OCADevice:
         self._log_to_service("lock_factory_settings", result)
         return result
 
+    @timed_operation
     def unlock_factory_settings(self, signature):
         """Unlock factory settings on the device.
 
@@ -313,6 +393,7 @@ class OCADevice:
         self._log_to_service("unlock_factory_settings", result)
         return result
 
+    @timed_operation
     def update_firmware(self, firmware_image_path, timeout=60):
         """Flash a firmware image to the device.
 
@@ -0,0 +1,465 @@
+"""
+oca_simulator.py
+
+Local stand-in for an ADAM Audio sub speaking OCA, for benchmarks and tests.
+
+The simulator is a small TCP server on localhost that holds the property set
+``OCADevice`` reads and writes (mode, gain, calibration, mute, phase delay,
+audio input, bass management, MAC, serial, firmware, factory lock state).
+``SimulatorToolWrapper`` mirrors the ``OCP1ToolWrapper.run_cli_command`` API and
+returns the same parsed dicts the real wrapper produces, so ``OCADevice``,
+``init_sub`` and ``provision_mac`` run unchanged against it.
+
+Latency and failures can be injected per command to reproduce slow or flaky
+devices. A MAC write optionally renames the device to ``SubPro-<last 6 hex>``
+and makes it unreachable for a while, as newer firmware does.
+
+Usage (standalone, e.g. for adam_workstation.py subprocess runs):
+    python -m oca.oca_simulator --port 50001 --latency 0.05
+    set ADAM_OCA_SIMULATOR=127.0.0.1:50001
+
+Usage (in-process):
+    with OCADeviceSimulator(latency=0.01) as sim:
+        device = OCADevice(target=sim.name, wrapper_factory=sim.wrapper_factory)
+        device.get_mode()
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+
+logger = logging.getLogger("OCADeviceSimulator")
+
+# CLI exit code the real binary uses when a named target cannot be resolved.
+DEVICE_NOT_FOUND_EXIT_CODE = 100
+
+_DONE = {"success": True, "raw": "Done"}
+
+
+class SimulatedCommandError(Exception):
+    """Raised inside the simulator to emulate a non-zero CLI exit code."""
+
+    def __init__(self, message, exit_code=1):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class OCADeviceSimulator:
+    """Threaded localhost server emulating one OCA device."""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        name="SubPro-EF0000",
+        model="Sub8PRO",
+        serial="CI0000000",
+        mac="02:00:00:00:00:00",
+        firmware_version="1.0.0rc8",
+        latency=0.0,
+        jitter=0.0,
+        command_latency=None,
+        failure_rate=0.0,
+        rename_on_mac_change=True,
+        mac_change_downtime=0.0,
+        unlock_signature=None,
+        seed=None,
+    ):
+        """
+        Args:
+            host:                 Interface to bind (default: localhost only).
+            port:                 TCP port; 0 picks a free port.
+            name:                 mDNS-style device name used for ``--target``.
+            model:                Model name reported by ``model-description``.
+            serial:               Initial serial number.
+            mac:                  Initial MAC address.
+            firmware_version:     Initial firmware version string.
+            latency:              Base response latency in seconds for every command.
+            jitter:               Uniform random extra latency in seconds (0..jitter).
+            command_latency:      Per-command latency overrides, keyed by command path,
+                                  e.g. ``{"firmware update": 2.0}``.
+            failure_rate:         Probability (0..1) that any command fails.
+            rename_on_mac_change: Rename to ``SubPro-<last 6 hex>`` after a MAC write.
+            mac_change_downtime:  Seconds the device stays unreachable after a MAC write.
+            unlock_signature:     Required unlock signature; ``None`` accepts any value.
+            seed:                 Seed for latency jitter and random failures.
+        """
+        self.host = host
+        self.requested_port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.command_latency = dict(command_latency or {})
+        self.failure_rate = failure_rate
+        self.rename_on_mac_change = rename_on_mac_change
+        self.mac_change_downtime = mac_change_downtime
+        self.unlock_signature = unlock_signature
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._injected_failures = {}
+        self._unreachable_until = 0.0
+        self._server = None
+        self._thread = None
+
+        self.call_counts = {}
+        self.state = {
+            "name": name,
+            "manufacturer": "ADAM Audio",
+            "model": model,
+            "version": firmware_version,
+            "serial": serial,
+            "mac": mac.upper(),
+            "locked": True,
+            "mode": "internal-dsp",
+            "gain": 0.0,
+            "gain_calibration": 0.0,
+            "mute": "normal",
+            "phase_delay": "deg0",
+            "audio_input": "analogue-xlr",
+            "bass_management": "wide",
+            "bass_management_bypass": "disabled",
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start serving in a background thread. Returns self."""
+        simulator = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                response = simulator._handle_request(line)
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        class _Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = _Server((self.host, self.requested_port), _Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        logger.info("OCA simulator listening on %s:%d", self.host, self.port)
+        return self
+
+    def stop(self):
+        """Stop the server and wait for the serving thread to finish."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def port(self):
+        return self._server.server_address[1] if self._server else self.requested_port
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}"
+
+    @property
+    def name(self):
+        return self.state["name"]
+
+    def wrapper_factory(self, target_ip=None, port=None):
+        """Drop-in replacement for ``OCP1ToolWrapper(target_ip, port)``."""
+        return SimulatorToolWrapper(self.host, self.port, target_ip=target_ip, port=port)
+
+    # ------------------------------------------------------------------
+    # Failure / latency injection
+    # ------------------------------------------------------------------
+
+    def inject_failure(self, command, count=1, message="Simulated OCA failure", exit_code=1):
+        """Make the next *count* calls of *command* (e.g. ``"mode set"``) fail."""
+        with self._lock:
+            self._injected_failures[command] = [count, message, exit_code]
+
+    def set_unreachable(self, seconds):
+        """Reject every command (device not found) for the next *seconds*."""
+        with self._lock:
+            self._unreachable_until = time.monotonic() + seconds
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _handle_request(self, line):
+        try:
+            request = json.loads(line.decode("utf-8"))
+            path = [str(token) for token in request.get("command_path", [])]
+            options = request.get("options") or {}
+        except (ValueError, AttributeError) as exc:
+            return {"ok": False, "exit_code": 2, "error": f"Malformed request: {exc}"}
+
+        command = " ".join(path)
+        with self._lock:
+            self.call_counts[command] = self.call_counts.get(command, 0) + 1
+
+        time.sleep(self._latency_for(command))
+
+        try:
+            with self._lock:
+                self._check_failures(command, options)
+                result = self._dispatch(command, path, options)
+            return {"ok": True, "result": result}
+        except SimulatedCommandError as exc:
+            logger.debug("Simulated failure for %r: %s", command, exc)
+            return {"ok": False, "exit_code": exc.exit_code, "error": str(exc)}
+
+    def _latency_for(self, command):
+        latency = self.command_latency.get(command, self.latency)
+        if self.jitter:
+            latency += self._random.uniform(0.0, self.jitter)
+        return max(0.0, latency)
+
+    def _check_failures(self, command, options):
+        if command != "discover" and time.monotonic() < self._unreachable_until:
+            raise SimulatedCommandError("Device not found", DEVICE_NOT_FOUND_EXIT_CODE)
+
+        target = options.get("--target")
+        if target is not None and target != self.state["name"]:
+            raise SimulatedCommandError(
+                f"Device not found: {target}", DEVICE_NOT_FOUND_EXIT_CODE
+            )
+
+        injected = self._injected_failures.get(command)
+        if injected:
+            injected[0] -= 1
+            if injected[0] <= 0:
+                del self._injected_failures[command]
+            raise SimulatedCommandError(injected[1], injected[2])
+
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise SimulatedCommandError("Simulated random OCA failure")
+
+    def _require_unlocked(self):
+        if self.state["locked"]:
+            raise SimulatedCommandError("Factory settings are locked")
+
+    def _dispatch(self, command, path, options):
+        state = self.state
+        value = options.get("--value")
+        position = options.get("--position")
+
+        if command == "discover":
+            if time.monotonic() < self._unreachable_until:
+                return {"devices": [], "raw": ""}
+            return {
+                "devices": [{"name": state["name"], "ip": self.host, "port": str(self.port)}],
+                "raw": f"Discovered device: {state['name']} (tcp::{self.host}:{self.port})",
+            }
+
+        if command == "model-description get":
+            return {
+                "manufacturer": state["manufacturer"],
+                "model": state["model"],
+                "version": state["version"],
+                "raw": f"{state['manufacturer']} {state['model']} {state['version']}",
+            }
+
+        getters = {
+            "mode get": ("mode", "mode"),
+            "audio-input get": ("audio_input", "input_mode"),
+            "bass-management mode get": ("bass_management", "bass_management_mode"),
+            "bass-management bypass get": ("bass_management_bypass", "bypass_state"),
+            "gain get": ("gain", "gain"),
+            "phase-delay get": ("phase_delay", "phase_delay"),
+            "mute get": ("mute", "mute_state"),
+            "factory-settings get-mac-address": ("mac", "value"),
+            "factory-settings get-serial-number": ("serial", "value"),
+        }
+        if command in getters:
+            key, result_key = getters[command]
+            return {result_key: state[key], "raw": str(state[key])}
+
+        if command == "gain-calibration get":
+            return {
+                "calibration_values": [state["gain_calibration"]],
+                "raw": f"[Gain: {state['gain_calibration']:.2f} dB]",
+            }
+
+        setters = {
+            "mode set": ("mode", position),
+            "audio-input set": ("audio_input", position),
+            "bass-management mode set": ("bass_management", position),
+            "bass-management bypass set": ("bass_management_bypass", position),
+            "phase-delay set": ("phase_delay", position),
+            "mute set": ("mute", position),
+        }
+        if command in setters:
+            key, new_value = setters[command]
+            if new_value is None:
+                raise SimulatedCommandError(f"Missing --position for '{command}'", 2)
+            state[key] = str(new_value)
+            return dict(_DONE)
+
+        if command in ("gain set", "gain-calibration set"):
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise SimulatedCommandError(f"Invalid --value for '{command}': {value!r}", 2)
+            state["gain" if command == "gain set" else "gain_calibration"] = number
+            return dict(_DONE)
+
+        if command == "factory-settings set-serial-number":
+            self._require_unlocked()
+            state["serial"] = str(value)
+            return dict(_DONE)
+
+        if command == "factory-settings set-mac-address":
+            self._require_unlocked()
+            state["mac"] = str(value).strip().upper()
+            if self.rename_on_mac_change:
+                state["name"] = "SubPro-" + state["mac"].replace(":", "")[-6:]
+            if self.mac_change_downtime:
+                self._unreachable_until = time.monotonic() + self.mac_change_downtime
+            return dict(_DONE)
+
+        if command == "factory-settings unlock":
+            if self.unlock_signature is not None and value != self.unlock_signature:
+                raise SimulatedCommandError("Invalid unlock signature")
+            state["locked"] = False
+            return dict(_DONE)
+
+        if command == "factory-settings lock":
+            state["locked"] = True
+            return dict(_DONE)
+
+        if command == "firmware update":
+            image_path = str(options.get("--firmware-image-path", ""))
+            match = re.search(r"(\d+\.\d+\.\d+[0-9A-Za-z]*)", image_path)
+            if match:
+                state["version"] = match.group(1)
+            return dict(_DONE)
+
+        raise SimulatedCommandError(f"Unsupported command: '{command}'", 2)
+
+
+class SimulatorToolWrapper:
+    """Client with the ``OCP1ToolWrapper.run_cli_command`` signature.
+
+    One TCP connection per call, mirroring the one-subprocess-per-call model of
+    the real wrapper. ``last_timing`` holds the connect and round-trip seconds
+    of the most recent call (picked up by oca_timing).
+    """
+
+    def __init__(self, sim_host, sim_port, target_ip=None, port=None, timeout=30.0):
+        self.sim_host = sim_host
+        self.sim_port = int(sim_port)
+        self.target_ip = target_ip
+        self.port = port
+        self.timeout = timeout
+        self.last_timing = {}
+
+    @staticmethod
+    def _normalize_command_path(command=None, subcommand=None, command_path=None, extra_args=None):
+        if command_path is not None:
+            tokens = command_path.split() if isinstance(command_path, str) else list(command_path)
+        else:
+            tokens = [t for t in (command, subcommand) if t]
+        if extra_args:
+            tokens.extend(str(arg) for arg in extra_args)
+        return tokens
+
+    def run_cli_command(self, command=None, subcommand=None, options=None, extra_args=None, command_path=None):
+        path = self._normalize_command_path(command, subcommand, command_path, extra_args)
+        request = {
+            "command_path": path,
+            "options": dict(options or {}),
+            "target_ip": self.target_ip,
+            "port": self.port,
+        }
+        self.last_timing = {}
+        start = time.perf_counter()
+        with socket.create_connection((self.sim_host, self.sim_port), timeout=self.timeout) as sock:
+            connected = time.perf_counter()
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        self.last_timing = {"connect": connected - start, "round_trip": time.perf_counter() - connected}
+
+        if not line:
+            raise RuntimeError("Command failed (exit code 1): simulator closed the connection")
+        response = json.loads(line.decode("utf-8"))
+        if not response.get("ok"):
+            raise RuntimeError(
+                f"Command failed (exit code {response.get('exit_code', 1)}): {response.get('error', '')}"
+            )
+        return response["result"]
+
+
+def simulator_wrapper_factory(address):
+    """Return a wrapper factory bound to a running simulator at ``"host:port"``."""
+    sim_host, _, sim_port = address.rpartition(":")
+
+    def _factory(target_ip=None, port=None):
+        return SimulatorToolWrapper(sim_host or "127.0.0.1", sim_port, target_ip=target_ip, port=port)
+
+    return _factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OCA device simulator")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=50001, help="TCP port (default: 50001)")
+    parser.add_argument("--name", default="SubPro-EF0000", help="Device name used as OCA target")
+    parser.add_argument("--model", default="Sub8PRO", help="Model name (default: Sub8PRO)")
+    parser.add_argument("--serial", default="CI0000000", help="Initial serial number")
+    parser.add_argument("--mac", default="02:00:00:00:00:00", help="Initial MAC address")
+    parser.add_argument("--firmware-version", default="1.0.0rc8", help="Initial firmware version")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per command in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Random failure probability (0..1)")
+    parser.add_argument("--mac-change-downtime", type=float, default=0.0,
+                        help="Seconds the device is unreachable after a MAC write")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for jitter and failures")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    simulator = OCADeviceSimulator(
+        host=args.host,
+        port=args.port,
+        name=args.name,
+        model=args.model,
+        serial=args.serial,
+        mac=args.mac,
+        firmware_version=args.firmware_version,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        mac_change_downtime=args.mac_change_downtime,
+        seed=args.seed,
+    ).start()
+    print(f"OCA simulator '{simulator.name}' listening on {simulator.address}")
+    print(f"Set ADAM_OCA_SIMULATOR={simulator.address} to route OCADevice calls here.")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
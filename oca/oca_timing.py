@@ -0,0 +1,284 @@
+"""
+oca_timing.py
+
+Per-call latency instrumentation for OCADevice.
+
+Every public OCADevice method produces one structured timing record, broken
+down into phases:
+
+    wrapper_init   constructing the tool wrapper (cli_map.json load)
+    cli            run_cli_command: process spawn, name resolution and the
+                   network round trip of the external CLI binary
+    service_log    forwarding the task log to the ADAM service
+
+The external CLI binary does not report how its own time splits between
+spawn, mDNS resolution and the OCA round trip. Wrappers that do know (e.g. the
+local simulator) expose a ``last_timing`` dict, whose entries are added to the
+record as ``cli.<phase>`` sub-phases.
+
+Records are appended as JSON lines to one file per user, outside the repo
+(default ``%LOCALAPPDATA%/ADAM Audio/oca_timing/oca_timing.jsonl`` on Windows,
+``$XDG_STATE_HOME/adam-audio/oca_timing/oca_timing.jsonl`` elsewhere), so that
+timings from the many short adam_workstation.py processes accumulate in one
+place. Each record is a single append; several processes may write at once.
+The file is rolled over to ``.1`` ... ``.3`` only when a process opens it and
+finds it over the size limit, and skipped if another process holds it (Windows).
+``summarize`` reduces the records to count / p50 / p95 / max per command.
+
+Environment:
+    ADAM_OCA_TIMING=off       disable recording
+    ADAM_OCA_TIMING_LOG=path  write records to another file
+
+Usage:
+    python -m oca.oca_timing [--path <timing log>]
+"""
+
+import argparse
+import functools
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+TIMING_ENV_VAR = "ADAM_OCA_TIMING"
+TIMING_LOG_ENV_VAR = "ADAM_OCA_TIMING_LOG"
+
+
+def _default_timing_log():
+    """Per-user and outside the repo, so station runs leave no files in the checkout."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "ADAM Audio", "oca_timing", "oca_timing.jsonl")
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "adam-audio", "oca_timing", "oca_timing.jsonl")
+
+
+DEFAULT_TIMING_LOG = _default_timing_log()
+
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+logger = logging.getLogger(__name__)
+
+
+class OCATimingRecorder:
+    """Appends timing records to a JSON-lines file shared by all processes."""
+
+    def __init__(self, path=DEFAULT_TIMING_LOG, max_bytes=MAX_LOG_BYTES, backup_count=LOG_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _roll_over(self):
+        """Shift path -> path.1 -> ... when the file is over max_bytes (best effort)."""
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        except OSError:
+            # Missing file, or another process has it open (Windows): keep appending.
+            pass
+
+    def _get_file(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if self.backup_count > 0:
+                self._roll_over()
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def record(self, entry):
+        """Write one timing record. Failures are logged, never raised."""
+        try:
+            line = json.dumps(entry, separators=(",", ":")) + "\n"
+            with self._lock:
+                timing_file = self._get_file()
+                timing_file.write(line)
+                timing_file.flush()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Could not write OCA timing record: %s", exc)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_default_recorder = None
+
+
+def get_default_recorder():
+    """Return the process-wide recorder, or None when timing is disabled."""
+    global _default_recorder
+    if os.getenv(TIMING_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    path = os.getenv(TIMING_LOG_ENV_VAR) or DEFAULT_TIMING_LOG
+    if _default_recorder is None or _default_recorder.path != path:
+        _default_recorder = OCATimingRecorder(path)
+    return _default_recorder
+
+
+class CallTiming:
+    """Timing record under construction for one OCADevice call."""
+
+    def __init__(self, command, target):
+        self.command = command
+        self.target = target
+        self.phases = {}
+        self._start = time.perf_counter()
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self, error=None):
+        total = time.perf_counter() - self._start
+        return {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+            "command": self.command,
+            "target": self.target,
+            "ok": error is None,
+            "error": None if error is None else str(error),
+            "total_ms": round(total * 1000.0, 3),
+            "phases": {name: round(sec * 1000.0, 3) for name, sec in self.phases.items()},
+        }
+
+
+class TimedWrapper:
+    """Proxy around a tool wrapper that times ``run_cli_command`` as the ``cli`` phase."""
+
+    def __init__(self, wrapper, timing):
+        self._wrapper = wrapper
+        self._timing = timing
+
+    def run_cli_command(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._wrapper.run_cli_command(*args, **kwargs)
+        finally:
+            self._timing.add_phase("cli", time.perf_counter() - start)
+            sub_phases = getattr(self._wrapper, "last_timing", None)
+            if isinstance(sub_phases, dict):
+                for name, seconds in sub_phases.items():
+                    self._timing.add_phase(f"cli.{name}", seconds)
+
+    def __getattr__(self, name):
+        return getattr(self._wrapper, name)
+
+
+def timed_operation(method):
+    """Decorator for OCADevice methods: one timing record per outermost call.
+
+    Nested calls (e.g. get_firmware_version -> get_model_description) add
+    their phases to the outer record instead of producing their own. The
+    record in progress is per thread (OCADevice._active_timing), so concurrent
+    calls on one device from different threads each get their own record.
+    """
+
+    @functools.wraps(method)
+    def _wrapper(self, *args, **kwargs):
+        if getattr(self, "_active_timing", None) is not None:
+            return method(self, *args, **kwargs)
+
+        recorder = self._get_timing_recorder()
+        if recorder is None:
+            return method(self, *args, **kwargs)
+
+        timing = CallTiming(method.__name__, self.target)
+        self._active_timing = timing
+        error = None
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self._active_timing = None
+            recorder.record(timing.finish(error))
+
+    return _wrapper
+
+
+# ---------------------------------------------------------------------------
+# Summary
+# ---------------------------------------------------------------------------
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _timing_files(path):
+    # Rotated backups first (oldest .3 → .1), then the live file.
+    backups = sorted(glob.glob(f"{glob.escape(path)}.*"), reverse=True)
+    return [p for p in backups if p.rsplit(".", 1)[-1].isdigit()] + [path]
+
+
+def load_records(path=None):
+    """Read all timing records from the live file and its rotated backups."""
+    path = path or os.getenv(TIMING_LOG_ENV_VAR) or DEFAULT_TIMING_LOG
+    records = []
+    for file_path in _timing_files(path):
+        if not os.path.isfile(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def summarize(records):
+    """Return ``{command: {count, errors, p50_ms, p95_ms, max_ms, phases_p50_ms}}``."""
+    grouped = {}
+    for rec in records:
+        grouped.setdefault(rec.get("command", "?"), []).append(rec)
+
+    summary = {}
+    for command, recs in sorted(grouped.items()):
+        totals = sorted(r.get("total_ms", 0.0) for r in recs)
+        phase_values = {}
+        for r in recs:
+            for name, ms in (r.get("phases") or {}).items():
+                phase_values.setdefault(name, []).append(ms)
+        summary[command] = {
+            "count": len(recs),
+            "errors": sum(1 for r in recs if not r.get("ok", True)),
+            "p50_ms": _percentile(totals, 50),
+            "p95_ms": _percentile(totals, 95),
+            "max_ms": totals[-1],
+            "phases_p50_ms": {
+                name: _percentile(sorted(values), 50) for name, values in sorted(phase_values.items())
+            },
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise OCADevice timing records")
+    parser.add_argument("--path", default=None, help=f"Timing log (default: {DEFAULT_TIMING_LOG})")
+    args = parser.parse_args()
+    print(json.dumps(summarize(load_records(args.path)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+test_oca_simulator.py
+
+Tests for the local OCA device simulator and OCADevice running against it.
+
+No hardware and no oca_tools installation are required: every OCADevice is
+created with the simulator's wrapper factory.
+
+Run:
+    pytest oca/test_oca_simulator.py -v
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from oca.oca_device import SIMULATOR_ENV_VAR, OCADevice
+from oca.oca_simulator import OCADeviceSimulator
+
+DEFAULT_MAC = "02:00:00:00:00:00"
+
+
+@pytest.fixture
+def simulator():
+    sim = OCADeviceSimulator(mac=DEFAULT_MAC, seed=1).start()
+    yield sim
+    sim.stop()
+
+
+def _device(sim, target=None):
+    return OCADevice(target=target or sim.name, wrapper_factory=sim.wrapper_factory)
+
+
+class TestProperties:
+    def test_get_set_round_trip(self, simulator):
+        dev = _device(simulator)
+
+        assert dev.set_mode("backplate")["success"] is True
+        assert dev.get_mode()["mode"] == "backplate"
+
+        dev.set_gain(-12)
+        assert dev.get_gain()["gain"] == -12.0
+
+        dev.set_gain_calibration(1.5)
+        assert dev.get_gain_calibration()["calibration_values"] == [1.5]
+
+        dev.set_bass_management_bypass("enabled")
+        assert dev.get_bass_management_bypass()["bypass_state"] == "enabled"
+
+    def test_firmware_version_from_model_description(self, simulator):
+        dev = _device(simulator)
+        assert dev.get_firmware_version() == {"version": "1.0.0rc8"}
+        assert dev.get_model_description()["name"] == "Sub8PRO"
+
+    def test_discover_reports_current_name(self, simulator):
+        dev = _device(simulator, target=None)
+        dev.target = None
+        result = dev.discover(timeout=1)
+        assert result["devices"][0]["name"] == simulator.name
+
+    def test_env_var_routes_to_simulator(self, simulator, monkeypatch):
+        monkeypatch.setenv(SIMULATOR_ENV_VAR, simulator.address)
+        dev = OCADevice(target=simulator.name)
+        assert dev.get_serial_number()["value"] == "CI0000000"
+
+
+class TestFactorySettings:
+    def test_writes_require_unlock(self, simulator):
+        dev = _device(simulator)
+        with pytest.raises(RuntimeError, match="locked"):
+            dev.set_serial_number("CI1234567")
+
+        dev.unlock_factory_settings("sig")
+        dev.set_serial_number("CI1234567")
+        assert dev.get_serial_number()["value"] == "CI1234567"
+
+        dev.lock_factory_settings()
+        with pytest.raises(RuntimeError, match="locked"):
+            dev.set_serial_number("CI7654321")
+
+    def test_mac_write_renames_device(self, simulator):
+        dev = _device(simulator)
+        dev.unlock_factory_settings("sig")
+        dev.set_mac_address("02:aa:00:49:23:da")
+
+        assert simulator.name == "SubPro-4923DA"
+        with pytest.raises(RuntimeError, match="exit code 100"):
+            dev.get_mac_address()
+
+        dev.target = simulator.name
+        assert dev.get_mac_address()["value"] == "02:AA:00:49:23:DA"
+
+
+class TestInjection:
+    def test_injected_failure_is_consumed(self, simulator):
+        dev = _device(simulator)
+        simulator.inject_failure("mode get", count=2)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="Simulated OCA failure"):
+                dev.get_mode()
+        assert dev.get_mode()["mode"] == "internal-dsp"
+        assert simulator.call_counts["mode get"] == 3
+
+    def test_unreachable_window(self, simulator):
+        dev = _device(simulator)
+        simulator.set_unreachable(0.2)
+        with pytest.raises(RuntimeError, match="Device not found"):
+            dev.get_mode()
+        time.sleep(0.25)
+        assert dev.get_mode()["mode"] == "internal-dsp"
+
+    def test_command_latency(self):
+        with OCADeviceSimulator(command_latency={"gain get": 0.1}) as sim:
+            dev = _device(sim)
+            start = time.perf_counter()
+            dev.get_gain()
+            assert time.perf_counter() - start >= 0.1
@@ -0,0 +1,157 @@
+"""
+test_oca_timing.py
+
+Tests for per-call OCADevice timing records and their per-command summary.
+
+Run:
+    pytest oca/test_oca_timing.py -v
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_HERE))
+
+from oca.oca_device import OCADevice
+from oca.oca_simulator import OCADeviceSimulator
+from oca.oca_timing import (
+    DEFAULT_TIMING_LOG,
+    TIMING_ENV_VAR,
+    OCATimingRecorder,
+    _percentile,
+    load_records,
+    summarize,
+)
+
+
+@pytest.fixture
+def simulator():
+    sim = OCADeviceSimulator(seed=1).start()
+    yield sim
+    sim.stop()
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    rec = OCATimingRecorder(str(tmp_path / "timing.jsonl"))
+    yield rec
+    rec.close()
+
+
+def _device(sim, recorder, **kwargs):
+    return OCADevice(target=sim.name, wrapper_factory=sim.wrapper_factory, timing_recorder=recorder, **kwargs)
+
+
+def test_one_record_per_call_with_phases(simulator, recorder):
+    dev = _device(simulator, recorder)
+    dev.get_mode()
+    dev.set_gain(-6)
+
+    records = load_records(recorder.path)
+    assert [r["command"] for r in records] == ["get_mode", "set_gain"]
+    for rec in records:
+        assert rec["ok"] is True
+        assert rec["target"] == simulator.name
+        assert {"wrapper_init", "cli", "cli.connect", "cli.round_trip"} <= set(rec["phases"])
+        assert rec["phases"]["cli"] <= rec["total_ms"]
+
+
+def test_nested_call_is_recorded_once(simulator, recorder):
+    dev = _device(simulator, recorder)
+    dev.get_firmware_version()
+
+    records = load_records(recorder.path)
+    assert [r["command"] for r in records] == ["get_firmware_version"]
+
+
+def test_concurrent_calls_on_one_device_are_recorded_separately(recorder):
+    # Both calls are inside run_cli_command at the same time.
+    barrier = threading.Barrier(2)
+
+    class _Wrapper:
+        def __init__(self, target_ip=None, port=None):
+            pass
+
+        def run_cli_command(self, **kwargs):
+            barrier.wait(5)
+            return {"value": kwargs["command"]}
+
+    dev = OCADevice(target="SubPro-000000", wrapper_factory=_Wrapper, timing_recorder=recorder)
+    threads = [threading.Thread(target=dev.get_mode), threading.Thread(target=dev.get_gain)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = load_records(recorder.path)
+    assert sorted(r["command"] for r in records) == ["get_gain", "get_mode"]
+    assert all(r["phases"]["cli"] <= r["total_ms"] for r in records)
+
+
+def test_default_log_is_outside_the_repo():
+    repo = os.path.dirname(_HERE)
+    assert not os.path.abspath(DEFAULT_TIMING_LOG).startswith(repo + os.sep)
+    if sys.platform != "win32":
+        assert "AppData" not in DEFAULT_TIMING_LOG
+
+
+def test_failed_call_is_recorded(simulator, recorder):
+    dev = _device(simulator, recorder)
+    simulator.inject_failure("mute get")
+    with pytest.raises(RuntimeError):
+        dev.get_mute()
+
+    (rec,) = load_records(recorder.path)
+    assert rec["ok"] is False
+    assert "Simulated OCA failure" in rec["error"]
+
+
+def test_service_log_phase(simulator, recorder):
+    dev = _device(simulator, recorder, workstation_id="WS1", service_host="127.0.0.1")
+    with patch("oca.oca_device.WorkstationLogger.send_log_to_service") as send:
+        dev.get_gain()
+    send.assert_called_once()
+    (rec,) = load_records(recorder.path)
+    assert "service_log" in rec["phases"]
+
+
+def test_timing_can_be_disabled(simulator, monkeypatch, tmp_path):
+    monkeypatch.setenv(TIMING_ENV_VAR, "off")
+    dev = OCADevice(target=simulator.name, wrapper_factory=simulator.wrapper_factory)
+    dev.get_mode()
+    assert load_records(str(tmp_path / "oca_timing.jsonl")) == []
+
+
+def test_records_survive_rotation(tmp_path):
+    # One recorder per record, like the short-lived workstation processes; files roll over on open.
+    for i in range(20):
+        rec = OCATimingRecorder(str(tmp_path / "timing.jsonl"), max_bytes=400, backup_count=5)
+        rec.record({"command": "get_mode", "ok": True, "total_ms": float(i), "phases": {}})
+        rec.close()
+
+    assert os.path.exists(rec.path + ".1")
+    totals = [r["total_ms"] for r in load_records(rec.path)]
+    assert totals == sorted(totals)
+    assert totals[-1] == 19.0
+
+
+def test_summary_percentiles():
+    records = [
+        {"command": "get_mode", "ok": True, "total_ms": float(ms), "phases": {"cli": ms / 2}}
+        for ms in range(1, 101)
+    ]
+    records.append({"command": "set_mode", "ok": False, "total_ms": 5.0, "phases": {}})
+
+    summary = summarize(records)
+    assert summary["get_mode"]["count"] == 100
+    assert summary["get_mode"]["p50_ms"] == 50.0
+    assert summary["get_mode"]["p95_ms"] == 95.0
+    assert summary["get_mode"]["max_ms"] == 100.0
+    assert summary["get_mode"]["phases_p50_ms"] == {"cli": 25.0}
+    assert summary["set_mode"]["errors"] == 1
+    assert _percentile([], 50) is None